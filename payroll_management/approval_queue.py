@@ -0,0 +1,99 @@
+# Copyright Sierra
+# Pending approval queues per approver / action, ordered by created_at
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .data.store import derived, peek_items, peek_row
+
+APPROVAL_ACTIONS = ("payroll_run", "reimbursement", "benefits_plan")
+PENDING_STATUS = "pending"
+
+# Stands for "any approver" / "any action" in a queue key. It is not None, so an
+# unassigned approval (approver_user_id None) keeps queues of its own
+ANY = object()
+
+# Queue key: (approver_user_id, action); every pending approval sits in exactly
+# three distinct queues: (approver, action), (approver, ANY) and (ANY, action)
+QueueKey = Tuple[Hashable, Hashable]
+
+
+class ApprovalQueues:
+    """
+    Pending approvals kept in per-approver and per-action queues of
+    (created_at, approval_id), kept current through Table.derived's on_change(key).
+
+    "What is waiting on me" is a slice of one queue and its length is the
+    pending count, so neither scans the approvals table; a status transition
+    moves one approval out of its three queues by bisection.
+    """
+
+    def __init__(self, table: Dict[str, Any]):
+        self._table = table
+        self._queues: Dict[QueueKey, List[Tuple[str, str]]] = {}
+        # approval_id -> (approver_user_id, action, created_at) while pending
+        self._pending: Dict[str, Tuple[Optional[str], Optional[str], str]] = {}
+        for key, row in peek_items(table):
+            entry = self._entry(row)
+            if entry is not None:
+                self._pending[key] = entry
+                for queue in self._keys(entry):
+                    self._queues.setdefault(queue, []).append((entry[2], key))
+        for queue in self._queues.values():
+            queue.sort()
+
+    @staticmethod
+    def _entry(row: Dict[str, Any]) -> Optional[Tuple[Optional[str], Optional[str], str]]:
+        if row.get("status") != PENDING_STATUS:
+            return None
+        return row.get("approver_user_id"), row.get("action"), row.get("created_at") or ""
+
+    @staticmethod
+    def _keys(entry: Tuple[Optional[str], Optional[str], str]) -> Tuple[QueueKey, ...]:
+        return (entry[0], entry[1]), (entry[0], ANY), (ANY, entry[1])
+
+    @staticmethod
+    def _key(approver_user_id: Optional[str], action: Optional[str]) -> QueueKey:
+        # None arguments of count()/pending() mean "any"
+        return (ANY if approver_user_id is None else approver_user_id, ANY if action is None else action)
+
+    def on_change(self, key: str) -> None:
+        row = peek_row(self._table, key)
+        entry = self._entry(row) if row is not None else None
+        previous = self._pending.get(key)
+        if previous == entry:
+            return
+        if previous is not None:
+            del self._pending[key]
+            for queue_key in self._keys(previous):
+                queue = self._queues[queue_key]
+                i = bisect_left(queue, (previous[2], key))
+                if i < len(queue) and queue[i] == (previous[2], key):
+                    del queue[i]
+        if entry is not None:
+            self._pending[key] = entry
+            for queue_key in self._keys(entry):
+                insort(self._queues.setdefault(queue_key, []), (entry[2], key))
+
+    def is_pending(self, approval_id: str) -> bool:
+        return approval_id in self._pending
+
+    def count(self, approver_user_id: Optional[str] = None, action: Optional[str] = None) -> int:
+        if approver_user_id is None and action is None:
+            return len(self._pending)
+        return len(self._queues.get(self._key(approver_user_id, action), ()))
+
+    def pending(
+        self, approver_user_id: Optional[str] = None, action: Optional[str] = None, offset: int = 0, limit: int = 50
+    ) -> List[str]:
+        """Pending approval_ids for the approver and/or action, oldest created_at first."""
+        if approver_user_id is None and action is None:
+            queue = sorted((created_at, key) for key, (_, _, created_at) in self._pending.items())
+        else:
+            queue = self._queues.get(self._key(approver_user_id, action), [])
+        return [key for _, key in queue[offset:offset + limit]]
+
+
+def approval_queues(data: Dict[str, Any]) -> ApprovalQueues:
+    """The ApprovalQueues for data["approvals"] (cached on store tables)."""
+    return derived(data.get("approvals", {}), "approval_queues", ApprovalQueues)
@@ -3,7 +3,14 @@
 
 import json
 import os
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, Tuple
+
+from .audit import AuditLog, AUDIT_COLUMNS
+from .snapshot import Snapshot, write_snapshot
+from .store import (
+    Row, Table, TableStore, PRIMARY_KEYS, foreign_key_columns, make_baseline, make_table, peek_values,
+)
 
 # List of all JSON files that make up the HR Payroll / Payment domain
 DATA_FILES = [
@@ -25,23 +32,92 @@ DATA_FILES = [
     "vendor_payments.json",
 ]
 
-def load_data(base_dir: str = None) -> Dict[str, Any]:
+# Binary snapshot compiled from the JSON files by build_snapshot() (see snapshot.py)
+SNAPSHOT_FILE = "tables.snapshot"
+
+# abspath(path) -> (file mtime, shared baseline); each file is parsed once per process
+_BASELINES: Dict[str, Tuple[float, Any]] = {}
+# abspath(snapshot) -> (snapshot mtime, open Snapshot)
+_SNAPSHOTS: Dict[str, Tuple[float, Snapshot]] = {}
+_BASELINES_LOCK = threading.Lock()
+
+
+def build_snapshot(base_dir: str = None) -> str:
+    """
+    Compile the JSON tables in `base_dir` into SNAPSHOT_FILE next to them.
+    Rebuild after editing or re-seeding the JSON; load_data() ignores stale tables.
+    """
+    if base_dir is None:
+        base_dir = os.path.dirname(__file__)
+    return write_snapshot(
+        os.path.join(base_dir, SNAPSHOT_FILE),
+        [(filename.replace(".json", ""), os.path.join(base_dir, filename)) for filename in DATA_FILES],
+    )
+
+
+def _snapshot(base_dir: str):
+    path = os.path.abspath(os.path.join(base_dir, SNAPSHOT_FILE))
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    cached = _SNAPSHOTS.get(path)
+    if cached is None or cached[0] != mtime:
+        try:
+            cached = _SNAPSHOTS[path] = (mtime, Snapshot(path))
+        except (OSError, ValueError):
+            return None
+    return cached[1]
+
+
+def _read_rows(table_name: str, path: str) -> Dict[str, Any]:
+    # Prefer the memory-mapped snapshot; fall back to the JSON file when it is missing or stale
+    snapshot = _snapshot(os.path.dirname(path))
+    if snapshot is not None and table_name in snapshot and snapshot.is_fresh(table_name, path):
+        return snapshot.rows(table_name)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _baseline(table_name: str, path: str) -> Any:
+    key = os.path.abspath(path)
+    mtime = os.path.getmtime(key)
+    with _BASELINES_LOCK:
+        cached = _BASELINES.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        baseline = make_baseline(table_name, _read_rows(table_name, key))
+        _BASELINES[key] = (mtime, baseline)
+        return baseline
+
+
+def _loader(table_name: str, path: str):
+    return lambda: make_table(table_name, baseline=_baseline(table_name, path))
+
+
+def load_data(base_dir: str = None, preload: bool = False) -> TableStore:
     """
     Load all seeded JSON data for the payroll_management domain.
 
+    Tables are loaded lazily: each JSON file is parsed and indexed the first
+    time a tool touches its table (once per process), from the binary
+    snapshot when build_snapshot() has compiled a fresh one. Every call returns
+    a fresh copy-on-write view over those shared rows, so environments can
+    mutate their data freely and TableStore.reset() undoes only what changed.
+
     Args:
         base_dir: optional override path. Defaults to this package directory.
+        preload: load every table now instead of on first access (benchmarks).
 
     Returns:
-        Dict mapping table_name (without .json) -> dict-of-records
+        TableStore mapping table_name (without .json) -> Table (dict-of-records
+        with foreign-key indexes, see store.py)
     """
     if base_dir is None:
         base_dir = os.path.dirname(__file__)
 
-    data = {}
-    for filename in DATA_FILES:
-        path = os.path.join(base_dir, filename)
-        table_name = filename.replace(".json", "")
-        with open(path, "r", encoding="utf-8") as f:
-            data[table_name] = json.load(f)
-    return data
+    data = TableStore(loaders={
+        filename.replace(".json", ""): _loader(filename.replace(".json", ""), os.path.join(base_dir, filename))
+        for filename in DATA_FILES
+    })
+    return data.preload() if preload else data
@@ -0,0 +1,408 @@
+# Copyright Sierra
+# payroll_management append-only, columnar audit log
+
+import json
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import ItemsView, KeysView, ValuesView
+from heapq import nsmallest
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+AUDIT_COLUMNS = (
+    "audit_id",
+    "user_id",
+    "table_name",
+    "action",
+    "record_id",
+    "field",
+    "old_value",
+    "new_value",
+    "timestamp",
+)
+
+# Columns with an inverted index (value -> ascending column positions)
+AUDIT_INDEXED_COLUMNS = ("user_id", "table_name", "record_id", "action")
+
+# Out-of-order timestamps up to this many are insorted; beyond it the time index is re-sorted
+_INSORT_LIMIT = 32
+
+
+class _Column:
+    """One audit column by position: the shared baseline part, then the log's own appends."""
+
+    __slots__ = ("base", "own", "split")
+
+    def __init__(self, base: List[Any], own: List[Any], split: int):
+        self.base, self.own, self.split = base, own, split
+
+    def __getitem__(self, i: int) -> Any:
+        return self.base[i] if i < self.split else self.own[i - self.split]
+
+
+class AuditLog(dict):
+    """
+    The audit_logs table, stored as preallocated column buffers.
+
+    Entries are only ever appended (SOP 18: audit logs cannot be altered or
+    deleted). Tools still see the familiar dict-of-records view
+    (audit_logs[audit_id] -> record dict), but each record dict is built on
+    access from the columns, so appends do not allocate per-entry dicts.
+    The underlying dict storage maps audit_id -> column position (for a log
+    built from a baseline, only of its own appends).
+
+    When `segment_path` is set, every `batch_size` new entries are flushed to
+    that newline-delimited JSON segment file; flush() can also be called directly.
+
+    query() answers compliance lookups from inverted indexes on user_id,
+    table_name, record_id and action plus a sorted timestamp index.
+
+    Entries present at construction are held read-only (columns, extras and
+    posting lists); later appends go to the log's own buffers past _base_size.
+    Built with `baseline=<another AuditLog>`, the log shares that (never
+    appended) log's read-only part instead of copying it, so construction is
+    O(1). reset() truncates back to the entries present at construction.
+    """
+
+    def __init__(
+        self,
+        rows: Optional[Dict[str, Dict[str, Any]]] = None,
+        segment_path: Optional[str] = None,
+        batch_size: int = 1024,
+        capacity: int = 1024,
+        baseline: Optional["AuditLog"] = None,
+    ):
+        super().__init__()
+        self.name = "audit_logs"
+        self.pk = "audit_id"
+        self.segment_path = segment_path
+        self.batch_size = batch_size
+        self._flushed = 0
+        # (timestamp, position) pairs; appends land in _time_pending until the next range query
+        self._time_pending: List[Tuple[str, int]] = []
+        self._index_slots = [(AUDIT_COLUMNS.index(col) - 1, col) for col in AUDIT_INDEXED_COLUMNS]
+
+        if baseline is not None:
+            # Audit ids below _base_size are looked up in the baseline's dict storage
+            self._base_ids: Optional[dict] = baseline if baseline._base_ids is None else baseline._base_ids
+            self._base_columns: List[List[Any]] = baseline._base_columns
+            self._base_extras: Dict[int, Dict[str, Any]] = baseline._base_extras
+            self._base_indexes: Dict[str, Dict[Any, List[int]]] = baseline._base_indexes
+            self._size = baseline._size
+            self._max_id = baseline._max_id
+            self._by_time: List[Tuple[str, int]] = baseline._time_index()
+        else:
+            self._base_ids = None
+            self._base_columns, self._base_extras = [], {}
+            self._base_indexes = {col: {} for col in AUDIT_INDEXED_COLUMNS}
+            self._base_size = 0
+            self._capacity = max(len(rows or ()), 1)
+            self._columns = [[None] * self._capacity for _ in AUDIT_COLUMNS]
+            self._extras = {}
+            self._indexes = {col: {} for col in AUDIT_INDEXED_COLUMNS}
+            self._size = 0
+            self._max_id = 0
+            self._by_time = []
+            for key, row in (rows or {}).items():
+                self[key] = row
+            self._time_index()
+            self._base_columns, self._base_extras, self._base_indexes = self._columns, self._extras, self._indexes
+
+        self._base_size = self._size
+        self._base_max_id = self._max_id
+        self._base_by_time = self._by_time
+        # Own buffers: position i is stored at i - _base_size
+        self._capacity = max(capacity, 1)
+        self._columns = [[None] * self._capacity for _ in AUDIT_COLUMNS]
+        self._extras = {}
+        # column -> value -> full posting list, for values appended to since the reset point
+        self._indexes = {col: {} for col in AUDIT_INDEXED_COLUMNS}
+        # Positions [0, _time_merged) are in _by_time; later ones are still pending
+        self._time_merged = self._size
+
+    def reset(self) -> None:
+        """Drop every entry appended since construction (or the last reset)."""
+        self._truncate(self._base_size, self._base_max_id)
+        self._by_time = self._base_by_time
+        self._time_merged = self._base_size
+        self._time_pending = []
+
+    def _truncate(self, n0: int, max_id: int) -> None:
+        # Undo appends back to `n0` entries (reset() and TableStore transaction rollback)
+        if n0 >= self._size:
+            return
+        base = self._base_size
+        ids = self._columns[0]
+        for i in range(n0, self._size):
+            dict.__delitem__(self, ids[i - base])
+            self._extras.pop(i, None)
+            for column in self._columns:
+                column[i - base] = None
+        # Own posting lists start as copies of the baseline's: back at the
+        # reset point they match it again and are dropped
+        for index in self._indexes.values():
+            if n0 <= base:
+                index.clear()
+                continue
+            for posting in index.values():
+                while posting and posting[-1] >= n0:
+                    posting.pop()
+        self._size = n0
+        self._max_id = max_id
+        self._flushed = min(self._flushed, n0)
+        self._time_pending = [entry for entry in self._time_pending if entry[1] < n0]
+        if self._time_merged > n0:
+            self._by_time = [entry for entry in self._by_time if entry[1] < n0]
+            self._time_merged = n0
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    # ---------- append path ----------
+
+    def _append(self, audit_id: str, values: Tuple[Any, ...]) -> None:
+        if audit_id in self:
+            raise ValueError(f"Audit log entries are append-only; {audit_id} already exists")
+        i = self._size
+        j = i - self._base_size
+        if j == self._capacity:
+            for column in self._columns:
+                column.extend([None] * self._capacity)
+            self._capacity *= 2
+        self._columns[0][j] = audit_id
+        for column, value in zip(self._columns[1:], values):
+            column[j] = value
+        dict.__setitem__(self, audit_id, i)
+        self._size = i + 1
+        for slot, col in self._index_slots:
+            value = values[slot]
+            if value is not None:
+                self._posting(col, value).append(i)
+        self._time_pending.append((values[-1] or "", i))
+        if audit_id.isdigit():
+            self._max_id = max(self._max_id, int(audit_id))
+        if self.segment_path and self._size - self._flushed >= self.batch_size:
+            self.flush()
+
+    def _posting(self, col: str, value: Any) -> List[int]:
+        # Own, appendable posting list for `value`, copied from the baseline's on first append
+        index = self._indexes[col]
+        posting = index.get(value)
+        if posting is None:
+            posting = index[value] = list(self._base_indexes[col].get(value, ()))
+        return posting
+
+    def _postings(self, col: str, value: Any) -> Sequence[int]:
+        posting = self._indexes[col].get(value)
+        return posting if posting is not None else self._base_indexes[col].get(value, ())
+
+    def _column(self, name: str) -> _Column:
+        c = AUDIT_COLUMNS.index(name)
+        return _Column(self._base_columns[c] if self._base_columns else [], self._columns[c], self._base_size)
+
+    def append(
+        self,
+        user_id: str,
+        table_name: str,
+        action: str,
+        record_id: Any,
+        field: Optional[str] = None,
+        old_value: Any = None,
+        new_value: Any = None,
+        timestamp: Optional[str] = None,
+    ) -> str:
+        """Append one entry under the next audit_id and return that id."""
+        audit_id = self.next_id()
+        self._append(audit_id, (user_id, table_name, action, record_id, field, old_value, new_value, timestamp))
+        return audit_id
+
+    def next_id(self) -> str:
+        return str(self._max_id + 1)
+
+    def flush(self, path: Optional[str] = None) -> int:
+        """Append entries written since the last flush to an NDJSON segment file."""
+        path = path or self.segment_path
+        if not path:
+            raise ValueError("No audit segment path configured")
+        count = self._size - self._flushed
+        if count:
+            with open(path, "a", encoding="utf-8") as f:
+                for i in range(self._flushed, self._size):
+                    f.write(json.dumps(self._row(i), ensure_ascii=False))
+                    f.write("\n")
+            self._flushed = self._size
+        return count
+
+    # ---------- lazy dict view ----------
+
+    def _row(self, i: int) -> Dict[str, Any]:
+        if i < self._base_size:
+            row = {name: column[i] for name, column in zip(AUDIT_COLUMNS, self._base_columns)}
+            extras = self._base_extras.get(i)
+        else:
+            j = i - self._base_size
+            row = {name: column[j] for name, column in zip(AUDIT_COLUMNS, self._columns)}
+            extras = self._extras.get(i)
+        if extras:
+            row.update(extras)
+        return row
+
+    def _position(self, audit_id: Any) -> Optional[int]:
+        i = dict.get(self, audit_id)
+        if i is None and self._base_ids is not None:
+            i = dict.get(self._base_ids, audit_id)
+        return i
+
+    def __setitem__(self, audit_id, row):
+        self._append(audit_id, tuple(row.get(name) for name in AUDIT_COLUMNS[1:]))
+        extras = {k: v for k, v in row.items() if k not in AUDIT_COLUMNS}
+        if extras:
+            self._extras[self._size - 1] = extras
+
+    def __getitem__(self, audit_id):
+        i = self._position(audit_id)
+        if i is None:
+            raise KeyError(audit_id)
+        return self._row(i)
+
+    def get(self, audit_id, default=None):
+        i = self._position(audit_id)
+        return default if i is None else self._row(i)
+
+    def __contains__(self, audit_id) -> bool:
+        return self._position(audit_id) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[str]:
+        # Overridden so dict(log) / {**log} go through __getitem__, not raw positions
+        if self._base_ids is None:
+            return dict.__iter__(self)
+        return chain(dict.__iter__(self._base_ids), dict.__iter__(self))
+
+    def keys(self):
+        return KeysView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def update(self, *args, **kwargs):
+        for audit_id, row in dict(*args, **kwargs).items():
+            self[audit_id] = row
+
+    def setdefault(self, audit_id, default=None):
+        if audit_id not in self:
+            self[audit_id] = default
+        return self[audit_id]
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self.items())
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("audit_logs is append-only")
+
+    __delitem__ = pop = popitem = clear = _read_only
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return dict(self.items()) == (dict(other.items()) if isinstance(other, AuditLog) else other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    # ---------- queries ----------
+
+    @property
+    def indexed_columns(self) -> Tuple[str, ...]:
+        return AUDIT_INDEXED_COLUMNS
+
+    def keys_where(self, column: str, value: Any) -> List[str]:
+        """Audit ids whose `column` equals `value` (index lookup on indexed columns)."""
+        ids = self._column("audit_id")
+        if column in self._indexes:
+            return [ids[i] for i in self._postings(column, value)]
+        values = self._column(column)
+        return [ids[i] for i in range(self._size) if values[i] == value]
+
+    def rows_where(self, column: str, value: Any) -> List[Dict[str, Any]]:
+        return [self[audit_id] for audit_id in self.keys_where(column, value)]
+
+    def _time_index(self) -> List[Tuple[str, int]]:
+        pending = self._time_pending
+        if pending:
+            if self._by_time is getattr(self, "_base_by_time", None):
+                # Shared with the baseline / reset point: copy before writing
+                self._by_time = list(self._by_time)
+            by_time = self._by_time
+            if len(pending) <= _INSORT_LIMIT:
+                for entry in pending:
+                    insort(by_time, entry)
+            else:
+                # Two sorted runs: timsort merges them in linear time
+                by_time.extend(sorted(pending))
+                by_time.sort()
+            self._time_pending = []
+            self._time_merged = self._size
+        return self._by_time
+
+    def query(
+        self,
+        user_id: Optional[str] = None,
+        table_name: Optional[str] = None,
+        record_id: Optional[str] = None,
+        action: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find audit entries matching every given filter, ordered by (timestamp, append order).
+
+        Args:
+            user_id, table_name, record_id, action: optional equality filters.
+            start, end: optional ISO timestamp bounds, both inclusive; `end` is a
+                prefix bound, so end="2025-10-01" covers that whole day.
+            offset, limit: page window over the ordered matches.
+
+        Returns:
+            (total number of matches, entries in the requested page)
+        """
+        end_key = end + "\uffff" if end is not None else None
+        stamps = self._column("timestamp")
+        filters = [
+            (col, value)
+            for col, value in (("user_id", user_id), ("table_name", table_name),
+                               ("record_id", record_id), ("action", action))
+            if value is not None
+        ]
+
+        if filters:
+            # Drive from the most selective posting list, check the rest column-wise
+            postings = sorted(((self._postings(col, value), col, value) for col, value in filters),
+                              key=lambda p: len(p[0]))
+            checks = [(self._column(col), value) for _, col, value in postings[1:]]
+            matches = [
+                i for i in postings[0][0]
+                if all(column[i] == value for column, value in checks)
+                and (start is None or (stamps[i] or "") >= start)
+                and (end_key is None or (stamps[i] or "") <= end_key)
+            ]
+            page = nsmallest(offset + limit, matches, key=lambda i: (stamps[i] or "", i))[offset:]
+            return len(matches), [self._row(i) for i in page]
+
+        by_time = self._time_index()
+        lo = bisect_left(by_time, (start,)) if start is not None else 0
+        hi = bisect_right(by_time, (end_key,)) if end_key is not None else len(by_time)
+        page = by_time[lo + offset:max(lo + offset, min(hi, lo + offset + limit))]
+        return max(hi - lo, 0), [self._row(i) for _, i in page]
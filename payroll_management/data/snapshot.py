@@ -0,0 +1,237 @@
+# Copyright Sierra
+# payroll_management binary table snapshot (column arrays + interned string pools)
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"PAYSNAP1"
+VERSION = 1
+_ALIGN = 8
+
+# Column codes below zero: -1 is a null value, -2 means the row has no such field
+_NULL = -1
+_ABSENT = -2
+_MISSING = object()
+
+
+def file_signature(path: str, with_hash: bool = True) -> Dict[str, Any]:
+    """mtime/size (and sha256 of the contents) used to detect a stale snapshot."""
+    stat = os.stat(path)
+    signature = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+    if with_hash:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        signature["sha256"] = digest.hexdigest()
+    return signature
+
+
+# ---------- writing ----------
+
+class _Writer:
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.offset = 0
+
+    def add(self, array: np.ndarray) -> Dict[str, Any]:
+        data = np.ascontiguousarray(array).tobytes()
+        ref = {"offset": self.offset, "dtype": array.dtype.str, "count": int(array.size)}
+        pad = -len(data) % _ALIGN
+        self.chunks.append(data + b"\0" * pad)
+        self.offset += len(data) + pad
+        return ref
+
+
+def _column_kind(values: Iterable[Any]) -> str:
+    types = {type(v) for v in values if v is not None and v is not _MISSING}
+    if not types or types == {str}:
+        return "str"
+    if types in ({bool}, {int}, {float}):
+        return types.pop().__name__
+    return "json"
+
+
+def _encode_table(rows: Dict[str, Dict[str, Any]], writer: _Writer) -> Dict[str, Any]:
+    pool: Dict[str, int] = {}
+
+    def code(value: Optional[str]) -> int:
+        if value is _MISSING:
+            return _ABSENT
+        if value is None:
+            return _NULL
+        return pool.setdefault(value, len(pool))
+
+    columns: Dict[str, None] = {}
+    for row in rows.values():
+        columns.update(dict.fromkeys(row))
+
+    keys = writer.add(np.fromiter((code(k) for k in rows), dtype=np.int32, count=len(rows)))
+    encoded = []
+    for column in columns:
+        values = [row.get(column, _MISSING) for row in rows.values()]
+        kind = _column_kind(values)
+        if kind in ("str", "json"):
+            if kind == "json":
+                values = [v if v is None or v is _MISSING else json.dumps(v) for v in values]
+            encoded.append({"name": column, "kind": kind,
+                            "codes": writer.add(np.array([code(v) for v in values], dtype=np.int32))})
+        elif kind == "bool":
+            flags = [_ABSENT if v is _MISSING else _NULL if v is None else int(v) for v in values]
+            encoded.append({"name": column, "kind": kind, "codes": writer.add(np.array(flags, dtype=np.int8))})
+        else:
+            dtype = np.int64 if kind == "int" else np.float64
+            state = [_ABSENT if v is _MISSING else _NULL if v is None else 0 for v in values]
+            numbers = [0 if s else v for v, s in zip(values, state)]
+            encoded.append({"name": column, "kind": kind,
+                            "values": writer.add(np.array(numbers, dtype=dtype)),
+                            "state": writer.add(np.array(state, dtype=np.int8))})
+
+    blob = [s.encode("utf-8") for s in pool]
+    offsets = np.zeros(len(blob) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in blob], out=offsets[1:])
+    return {
+        "rows": len(rows),
+        "keys": keys,
+        "pool": {"offsets": writer.add(offsets), "blob": writer.add(np.frombuffer(b"".join(blob), dtype=np.uint8))},
+        "columns": encoded,
+    }
+
+
+def write_snapshot(path: str, sources: Iterable[Tuple[str, str]]) -> str:
+    """
+    Compile JSON tables into one binary snapshot file.
+
+    Args:
+        path: snapshot file to (over)write.
+        sources: (table_name, json_path) pairs.
+
+    Returns:
+        The snapshot path.
+    """
+    writer = _Writer()
+    header: Dict[str, Any] = {"version": VERSION, "sources": {}, "tables": {}}
+    for table_name, json_path in sources:
+        signature = file_signature(json_path)
+        with open(json_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        header["sources"][table_name] = signature
+        header["tables"][table_name] = _encode_table(rows, writer)
+
+    head = json.dumps(header).encode("utf-8")
+    start = len(MAGIC) + 8 + len(head)
+    start += -start % _ALIGN
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(head)))
+        f.write(head)
+        f.write(b"\0" * (start - len(MAGIC) - 8 - len(head)))
+        for chunk in writer.chunks:
+            f.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+
+# ---------- reading ----------
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file. Tables are decoded on demand by rows().
+
+    The JSON files stay the source of truth: is_fresh() compares a JSON file's
+    mtime/size against the snapshot header, falling back to its sha256 when
+    they differ, so a stale table is never served.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a payroll_management snapshot")
+        (length,) = struct.unpack_from("<Q", self._map, len(MAGIC))
+        head_end = len(MAGIC) + 8 + length
+        self.header = json.loads(self._map[len(MAGIC) + 8:head_end].decode("utf-8"))
+        if self.header.get("version") != VERSION:
+            raise ValueError(f"{path} has unsupported snapshot version {self.header.get('version')}")
+        self._start = head_end + (-head_end % _ALIGN)
+
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self.header["tables"]
+
+    def is_fresh(self, table_name: str, json_path: str) -> bool:
+        recorded = self.header["sources"].get(table_name)
+        if recorded is None or not os.path.exists(json_path):
+            return False
+        current = file_signature(json_path, with_hash=False)
+        if current["size"] != recorded["size"]:
+            return False
+        if current["mtime_ns"] == recorded["mtime_ns"]:
+            return True
+        return file_signature(json_path)["sha256"] == recorded["sha256"]
+
+    def _array(self, ref: Dict[str, Any]) -> np.ndarray:
+        return np.frombuffer(self._map, dtype=np.dtype(ref["dtype"]), count=ref["count"],
+                             offset=self._start + ref["offset"])
+
+    def rows(self, table_name: str) -> Dict[str, Dict[str, Any]]:
+        """Decode one table back into the dict-of-records the JSON file holds."""
+        table = self.header["tables"][table_name]
+        offsets = self._array(table["pool"]["offsets"]).tolist()
+        blob = self._array(table["pool"]["blob"]).tobytes()
+        # Trailing entries make codes -2 / -1 index to "absent" / None directly
+        pool = np.empty(len(offsets) + 1, dtype=object)
+        pool[:-2] = [sys.intern(blob[a:b].decode("utf-8")) for a, b in zip(offsets, offsets[1:])]
+        pool[-2] = _MISSING
+        pool[-1] = None
+
+        names, columns, sparse = [], [], False
+        for column in table["columns"]:
+            kind = column["kind"]
+            if kind in ("str", "json"):
+                codes = self._array(column["codes"])
+                values = pool[codes].tolist()
+                if kind == "json":
+                    values = [v if v is None or v is _MISSING else json.loads(v) for v in values]
+                sparse = sparse or bool((codes == _ABSENT).any())
+            elif kind == "bool":
+                codes = self._array(column["codes"])
+                values = np.array([False, True, _MISSING, None], dtype=object)[codes].tolist()
+                sparse = sparse or bool((codes == _ABSENT).any())
+            else:
+                values = self._array(column["values"]).tolist()
+                state = self._array(column["state"])
+                for i in np.flatnonzero(state).tolist():
+                    values[i] = None if state[i] == _NULL else _MISSING
+                sparse = sparse or bool((state == _ABSENT).any())
+            names.append(column["name"])
+            columns.append(values)
+
+        keys = pool[self._array(table["keys"])].tolist()
+        if not columns:
+            return {key: {} for key in keys}
+        if sparse:
+            records = [{n: v for n, v in zip(names, values) if v is not _MISSING} for values in zip(*columns)]
+        else:
+            records = [dict(zip(names, values)) for values in zip(*columns)]
+        return dict(zip(keys, records))
+
+    def close(self) -> None:
+        self._map.close()
+
+
+if __name__ == "__main__":
+    # python snapshot.py [data_dir]  -> compiles every *.json table in data_dir
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.dirname(os.path.abspath(__file__))
+    names = sorted(f for f in os.listdir(data_dir) if f.endswith(".json"))
+    out = write_snapshot(os.path.join(data_dir, "tables.snapshot"),
+                         [(f[:-len(".json")], os.path.join(data_dir, f)) for f in names])
+    print(f"Wrote {out} ({len(names)} tables)")
@@ -0,0 +1,697 @@
+# Copyright Sierra
+# payroll_management in-memory table store with foreign-key indexes
+
+import os
+import threading
+from collections.abc import ItemsView, ValuesView
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+from .audit import AuditLog
+
+RELATIONSHIPS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "relationships.yaml")
+
+# Primary key column of every table (JSON key == this column's value)
+PRIMARY_KEYS = {
+    "users": "user_id",
+    "employees": "employee_id",
+    "timesheets": "timesheet_id",
+    "payroll_runs": "payroll_run_id",
+    "payroll_line_items": "line_item_id",
+    "deductions": "deduction_id",
+    "employee_deductions": "employee_deduction_id",
+    "payroll_corrections": "correction_id",
+    "benefits_plans": "plan_id",
+    "employee_benefits": "employee_benefit_id",
+    "expense_reimbursements": "reimbursement_id",
+    "leave_requests": "leave_request_id",
+    "approvals": "approval_id",
+    "audit_logs": "audit_id",
+    "vendors": "vendor_id",
+    "vendor_payments": "vendor_payment_id",
+}
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=None)
+def foreign_key_columns(path: str = RELATIONSHIPS_FILE) -> Dict[str, Tuple[str, ...]]:
+    """
+    Read relationships.yaml and return child_table -> FK columns to index.
+
+    Args:
+        path: optional override path to a relationships.yaml file.
+
+    Returns:
+        Dict mapping table_name -> tuple of child columns (in YAML order)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        rel = yaml.safe_load(f) or {}
+
+    columns: Dict[str, List[str]] = {}
+    for fk in rel.get("foreign_keys", []) or []:
+        cols = columns.setdefault(fk["child_table"], [])
+        if fk["child_column"] not in cols:
+            cols.append(fk["child_column"])
+    return {table: tuple(cols) for table, cols in columns.items()}
+
+
+class Row(dict):
+    """
+    A single table record owned by one Table.
+
+    Behaves exactly like the dict the tools already use, but reports field
+    writes back to its owning Table so secondary indexes stay in sync.
+    Copies (copy/deepcopy/pickle) are plain dicts detached from the table.
+    """
+
+    __slots__ = ("_table", "_key")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._table = None
+        self._key = None
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+    def _changed(self, field: str, old: Any, new: Any) -> None:
+        if self._table is not None and old is not new:
+            self._table._field_changed(self._key, field, old, new)
+
+    def __setitem__(self, field, value):
+        old = dict.get(self, field, _MISSING)
+        dict.__setitem__(self, field, value)
+        self._changed(field, old, value)
+
+    def __delitem__(self, field):
+        old = dict.pop(self, field)
+        self._changed(field, old, _MISSING)
+
+    def pop(self, field, *default):
+        if field not in self:
+            return dict.pop(self, field, *default)
+        old = dict.pop(self, field)
+        self._changed(field, old, _MISSING)
+        return old
+
+    def popitem(self):
+        field, old = dict.popitem(self)
+        self._changed(field, old, _MISSING)
+        return field, old
+
+    def setdefault(self, field, default=None):
+        if field not in self:
+            self[field] = default
+        return dict.__getitem__(self, field)
+
+    def update(self, *args, **kwargs):
+        for field, value in dict(*args, **kwargs).items():
+            self[field] = value
+
+    def clear(self):
+        for field in list(self):
+            del self[field]
+
+
+class TableBaseline:
+    """
+    Parsed contents of one table plus its foreign-key indexes, shared by every
+    Table built from it. Never mutated after construction: rows are plain dicts
+    and Tables copy a row (or an index bucket) before writing to it.
+    """
+
+    __slots__ = ("name", "rows", "indexes", "max_id")
+
+    def __init__(self, name: str, rows: Dict[str, Dict[str, Any]], indexed_columns: Iterable[str] = ()):
+        self.name = name
+        self.rows = {key: row if type(row) is dict else dict(row) for key, row in rows.items()}
+        self.indexes: Dict[str, Dict[Any, Dict[str, None]]] = {col: {} for col in indexed_columns}
+        for column, index in self.indexes.items():
+            for key, row in self.rows.items():
+                value = row.get(column)
+                if value is not None:
+                    index.setdefault(value, {})[key] = None
+        self.max_id = max((int(k) for k in self.rows if isinstance(k, str) and k.isdigit()), default=0)
+
+
+class Table(dict):
+    """
+    A dict-of-records table (key == primary id string) with secondary hash
+    indexes on its foreign-key columns.
+
+    Indexes are kept in sync on insert (table[key] = row), update
+    (table[key][field] = value) and delete (del table[key]).
+    Inserted dicts are copied into Row objects, so keep using table[key]
+    after an insert rather than the original dict.
+
+    The table also tracks its highest numeric key so next_id() is O(1).
+
+    Tables are copy-on-write overlays of a TableBaseline: rows start out as
+    the baseline's shared dicts and are copied into private Rows the first
+    time they are handed out (table[key], get, values, items), so callers can
+    mutate what they get. Index buckets are copied on first write the same way.
+    reset() restores only the rows and buckets touched since the last reset.
+    peek()/peek_values() read rows without copying, for read-only scans.
+
+    While a TableStore.transaction() is open, every row and field write is
+    also recorded in the store's undo journal.
+
+    derived() caches structures built from the table (ledgers, interval
+    trees, ...). Each is told about every changed key through its
+    on_change(key) method and is dropped by reset().
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rows: Optional[Dict[str, Dict[str, Any]]] = None,
+        indexed_columns: Iterable[str] = (),
+        baseline: Optional[TableBaseline] = None,
+    ):
+        super().__init__()
+        self.name = name
+        self.pk = PRIMARY_KEYS.get(name)
+        self._baseline = baseline if baseline is not None else TableBaseline(name, rows or {}, indexed_columns)
+        # Undo journal of the open TableStore transaction, if any
+        self._journal: Optional[List[Tuple[Any, ...]]] = None
+        dict.update(self, self._baseline.rows)
+        self._start()
+
+    def _start(self) -> None:
+        # Bookkeeping only: the rows are put back by __init__ or reset()
+        # column -> index (value -> ordered set of keys); shared with the baseline until written
+        self._indexes: Dict[str, Dict[Any, Dict[str, None]]] = dict(self._baseline.indexes)
+        self._owned: Dict[str, Set[Any]] = {}
+        self._touched: Dict[str, None] = {}
+        self._dropped_baseline_row = False
+        self._max_id: Optional[int] = self._baseline.max_id
+        # name -> derived structure kept current through on_change(key)
+        self._derived: Dict[str, Any] = {}
+
+    def reset(self) -> None:
+        """Discard every change since construction (or the last reset)."""
+        base = self._baseline.rows
+        for key in self._touched:
+            row = dict.get(self, key)
+            if type(row) is Row:
+                row._table = None
+                row._key = None
+        if self._dropped_baseline_row:
+            # Rebuild so baseline rows keep their original order
+            dict.clear(self)
+            dict.update(self, base)
+        else:
+            for key in self._touched:
+                if key in base:
+                    dict.__setitem__(self, key, base[key])
+                else:
+                    dict.pop(self, key, None)
+        self._start()
+
+    def __reduce__(self):
+        return (dict, (self.copy(),))
+
+    # ---------- primary-key sequence ----------
+
+    def _track_key(self, key: str) -> None:
+        if self._max_id is not None and isinstance(key, str) and key.isdigit():
+            self._max_id = max(self._max_id, int(key))
+
+    def _untrack_key(self, key: str) -> None:
+        # Deleting the current max reopens its id, as the old max-scan did;
+        # rescan lazily on the next allocation
+        if self._max_id is not None and isinstance(key, str) and key.isdigit() and int(key) == self._max_id:
+            self._max_id = None
+
+    def next_id(self) -> str:
+        """Next free primary id: str(max numeric key + 1), "1" when empty."""
+        if self._max_id is None:
+            self._max_id = max((int(k) for k in self if isinstance(k, str) and k.isdigit()), default=0)
+        return str(self._max_id + 1)
+
+    # ---------- copy-on-write ----------
+
+    def _own(self, key: str, row: Dict[str, Any]) -> Row:
+        # `row` is a shared baseline dict: give this table a private Row copy
+        own = Row(row)
+        own._table = self
+        own._key = key
+        dict.__setitem__(self, key, own)
+        self._touched[key] = None
+        return own
+
+    def _index_bucket(self, column: str, value: Any) -> Dict[str, None]:
+        owned = self._owned.get(column)
+        if owned is None:
+            owned = self._owned[column] = set()
+            self._indexes[column] = dict(self._indexes[column])
+        index = self._indexes[column]
+        bucket = index.get(value)
+        if value not in owned:
+            owned.add(value)
+            bucket = index[value] = dict(bucket) if bucket else {}
+        elif bucket is None:
+            bucket = index[value] = {}
+        return bucket
+
+    # ---------- index maintenance ----------
+
+    def _index_add(self, column: str, value: Any, key: str) -> None:
+        if value is None or value is _MISSING:
+            return
+        self._index_bucket(column, value)[key] = None
+
+    def _index_remove(self, column: str, value: Any, key: str) -> None:
+        if value is None or value is _MISSING or value not in self._indexes[column]:
+            return
+        bucket = self._index_bucket(column, value)
+        bucket.pop(key, None)
+        if not bucket:
+            del self._indexes[column][value]
+
+    def _attach(self, key: str, row: Dict[str, Any]) -> Row:
+        row = Row(row)
+        row._table = self
+        row._key = key
+        self._touched[key] = None
+        self._track_key(key)
+        for column in self._indexes:
+            self._index_add(column, dict.get(row, column), key)
+        return row
+
+    def _detach(self, key: str, row: Dict[str, Any], untrack: bool = True) -> None:
+        self._touched[key] = None
+        if untrack:
+            self._untrack_key(key)
+            if key in self._baseline.rows:
+                self._dropped_baseline_row = True
+        for column in self._indexes:
+            self._index_remove(column, dict.get(row, column), key)
+        if type(row) is Row:
+            row._table = None
+            row._key = None
+
+    def _field_changed(self, key: str, field: str, old: Any, new: Any) -> None:
+        if self._journal is not None:
+            self._journal.append(("field", self, key, field, old))
+        if field in self._indexes:
+            self._index_remove(field, old, key)
+            self._index_add(field, new, key)
+        self._notify(key)
+
+    def _notify(self, key: str) -> None:
+        for view in self._derived.values():
+            view.on_change(key)
+
+    def derived(self, name: str, build: Callable[["Table"], Any]) -> Any:
+        """The structure cached under `name`, built with build(self) on first use."""
+        view = self._derived.get(name)
+        if view is None:
+            view = self._derived[name] = build(self)
+        return view
+
+    # ---------- dict interface ----------
+
+    def __getitem__(self, key):
+        row = dict.__getitem__(self, key)
+        return row if type(row) is Row else self._own(key, row)
+
+    def get(self, key, default=None):
+        row = dict.get(self, key, _MISSING)
+        if row is _MISSING:
+            return default
+        return row if type(row) is Row else self._own(key, row)
+
+    def __iter__(self):
+        # Overridden so dict(table) / {**table} go through __getitem__ (private copies)
+        return dict.__iter__(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def _log_row(self, key: str) -> None:
+        if self._journal is not None:
+            old = dict.get(self, key, _MISSING)
+            self._journal.append(("row", self, key, old if old is _MISSING else dict(old)))
+
+    def __setitem__(self, key, row):
+        self._log_row(key)
+        if dict.__contains__(self, key):
+            self._detach(key, dict.__getitem__(self, key), untrack=False)
+        dict.__setitem__(self, key, self._attach(key, row))
+        self._notify(key)
+
+    def __delitem__(self, key):
+        self._log_row(key)
+        row = dict.pop(self, key)
+        self._detach(key, row)
+        self._notify(key)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        self._log_row(key)
+        row = dict.pop(self, key)
+        self._detach(key, row)
+        self._notify(key)
+        return row if type(row) is Row else dict(row)
+
+    def popitem(self):
+        if self._journal is not None and dict.__len__(self):
+            self._log_row(next(reversed(dict.keys(self))))
+        key, row = dict.popitem(self)
+        self._detach(key, row)
+        self._notify(key)
+        return key, row if type(row) is Row else dict(row)
+
+    def _undo(self, entry: Tuple[Any, ...]) -> None:
+        # Reverse one journal entry (journaling must be off)
+        kind, key = entry[0], entry[2]
+        if kind == "field":
+            field, old = entry[3], entry[4]
+            row = self[key]
+            if old is _MISSING:
+                row.pop(field, None)
+            else:
+                row[field] = old
+        elif entry[3] is _MISSING:
+            self.pop(key, None)
+        else:
+            self[key] = entry[3]
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        for key, row in dict(*args, **kwargs).items():
+            self[key] = row
+
+    def clear(self):
+        for key in list(self):
+            del self[key]
+
+    def copy(self) -> Dict[str, Dict[str, Any]]:
+        return {key: dict(row) for key, row in dict.items(self)}
+
+    # ---------- read-only access ----------
+
+    def peek(self, key: str, default: Any = None) -> Optional[Dict[str, Any]]:
+        """Row for `key` without copying it out of the baseline. Do not mutate the result."""
+        return dict.get(self, key, default)
+
+    def peek_values(self):
+        """All rows without copying them out of the baseline. Do not mutate the results."""
+        return dict.values(self)
+
+    def peek_items(self):
+        """(key, row) pairs without copying rows out of the baseline. Do not mutate the rows."""
+        return dict.items(self)
+
+    # ---------- index queries ----------
+
+    @property
+    def indexed_columns(self) -> Tuple[str, ...]:
+        return tuple(self._indexes)
+
+    def keys_where(self, column: str, value: Any) -> List[str]:
+        """Primary keys of rows whose `column` equals `value` (O(1) on indexed columns)."""
+        if column in self._indexes:
+            return list(self._indexes[column].get(value, ()))
+        return [key for key, row in dict.items(self) if row.get(column) == value]
+
+    def rows_where(self, column: str, value: Any) -> List[Row]:
+        """Rows whose `column` equals `value` (O(1) on indexed columns)."""
+        return [self[key] for key in self.keys_where(column, value)]
+
+
+def peek_values(table: Dict[str, Any]):
+    """Rows of any table for a read-only scan (no copy-on-write for store Tables)."""
+    peek = getattr(table, "peek_values", None)
+    return peek() if peek is not None else table.values()
+
+
+def peek_items(table: Dict[str, Any]):
+    """(key, row) pairs of any table for a read-only scan."""
+    peek = getattr(table, "peek_items", None)
+    return peek() if peek is not None else table.items()
+
+
+def peek_row(table: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """One row of any table for a read-only check, or None."""
+    return getattr(table, "peek", table.get)(key)
+
+
+def keys_where(table: Dict[str, Any], column: str, value: Any) -> List[str]:
+    """Keys of rows of any table whose `column` equals `value` (index lookup on store Tables)."""
+    lookup = getattr(table, "keys_where", None)
+    if lookup is not None:
+        return lookup(column, value)
+    return [key for key, row in table.items() if row.get(column) == value]
+
+
+def derived(table: Dict[str, Any], name: str, build: Callable[[Dict[str, Any]], Any]) -> Any:
+    """
+    Derived structure `name` over `table`: cached and kept current on store
+    Tables (see Table.derived), built fresh from plain dicts.
+    """
+    cached = getattr(table, "derived", None)
+    return cached(name, build) if cached is not None else build(table)
+
+
+def make_baseline(name: str, rows: Dict[str, Dict[str, Any]]):
+    """Build the shared, read-only baseline for table `name`."""
+    if name == "audit_logs":
+        return AuditLog(rows)
+    return TableBaseline(name, rows, foreign_key_columns().get(name, ()))
+
+
+def make_table(name: str, rows: Optional[Dict[str, Dict[str, Any]]] = None, baseline: Any = None):
+    """
+    Build the store table for `name`: AuditLog for audit_logs, an indexed Table otherwise.
+    Pass `baseline` (from make_baseline) to get a copy-on-write overlay of shared rows.
+    """
+    if name == "audit_logs":
+        return AuditLog(rows, baseline=baseline)
+    if baseline is not None:
+        return Table(name, baseline=baseline)
+    return Table(name, rows, foreign_key_columns().get(name, ()))
+
+
+class _Unloaded:
+    """Placeholder stored in a TableStore for a table that has not been parsed yet."""
+
+    __slots__ = ("load",)
+
+    def __init__(self, load: Callable[[], Any]):
+        self.load = load
+
+    def __repr__(self):
+        return "<not loaded>"
+
+
+class TableStore(dict):
+    """
+    Mapping of table_name -> Table for the payroll_management domain.
+
+    Drop-in replacement for the plain dict returned by load_data(): tools
+    keep using data["employees"][employee_id] and data.get("timesheets", {}).
+    reset() returns every table to its loaded state in time proportional to
+    the rows touched since the last reset.
+
+    Tables given in `loaders` (table_name -> zero-argument callable returning
+    the table) are built the first time they are accessed; preload() builds
+    them all up front. Loading is thread-safe.
+
+    transaction() makes a block of writes atomic: if it raises, every row,
+    field, audit entry and table assignment made inside it is undone, in time
+    proportional to the number of writes.
+    """
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None,
+        loaders: Optional[Dict[str, Callable[[], Any]]] = None,
+    ):
+        super().__init__()
+        self._journal: Optional[List[Tuple[Any, ...]]] = None
+        # Sequence/audit marks of tables loaded inside the open transaction
+        self._late_marks: List[Tuple[Any, ...]] = []
+        self._load_lock = threading.RLock()
+        for name, rows in (tables or {}).items():
+            self[name] = rows
+        for name, load in (loaders or {}).items():
+            dict.__setitem__(self, name, _Unloaded(load))
+        self._loaded = dict(dict.items(self))
+
+    # ---------- lazy loading ----------
+
+    def _resolve(self, name: str, table: Any) -> Any:
+        if type(table) is not _Unloaded:
+            return table
+        with self._load_lock:
+            table = dict.get(self, name)
+            if type(table) is _Unloaded:
+                pending = table
+                table = pending.load()
+                dict.__setitem__(self, name, table)
+                if self._loaded.get(name) is pending:
+                    self._loaded[name] = table
+                if self._journal is not None:
+                    if isinstance(table, Table):
+                        table._journal = self._journal
+                    mark = self._mark(table)
+                    self._journal.append(mark)
+                    self._late_marks.append(mark)
+        return table
+
+    def preload(self) -> "TableStore":
+        """Build every table that has not been loaded yet."""
+        for name, table in list(dict.items(self)):
+            self._resolve(name, table)
+        return self
+
+    @property
+    def loaded_tables(self) -> List[str]:
+        """Names of the tables that have been built so far."""
+        return [name for name, table in dict.items(self) if type(table) is not _Unloaded]
+
+    def __getitem__(self, name):
+        return self._resolve(name, dict.__getitem__(self, name))
+
+    def get(self, name, default=None):
+        table = dict.get(self, name, _MISSING)
+        return default if table is _MISSING else self._resolve(name, table)
+
+    def __iter__(self):
+        # Overridden so dict(store) / {**store} go through __getitem__ (loading tables)
+        return dict.__iter__(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = {} if default is None else default
+        return self[name]
+
+    def pop(self, name, *default):
+        if name not in self:
+            return dict.pop(self, name, *default)
+        table = self[name]
+        dict.pop(self, name)
+        return table
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, dict):
+            return dict(self.items()) == (dict(other.items()) if isinstance(other, TableStore) else other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __setitem__(self, name, rows):
+        if not isinstance(rows, (Table, AuditLog)):
+            rows = make_table(name, rows)
+        if self._journal is not None:
+            old = dict.get(self, name, _MISSING)
+            if old is not rows:
+                self._journal.append(("table", self, name, old))
+            if isinstance(rows, Table):
+                rows._journal = self._journal
+        dict.__setitem__(self, name, rows)
+
+    # ---------- transactions ----------
+
+    def _set_journal(self, journal: Optional[List[Tuple[Any, ...]]]) -> None:
+        for table in dict.values(self):
+            if isinstance(table, Table):
+                table._journal = journal
+
+    @staticmethod
+    def _mark(table: Any) -> Tuple[Any, ...]:
+        if isinstance(table, AuditLog):
+            return ("audit", table, table._size, table._max_id)
+        return ("seq", table, table._max_id)
+
+    def _undo(self, entry: Tuple[Any, ...]) -> None:
+        name, old = entry[2], entry[3]
+        if old is _MISSING:
+            dict.pop(self, name, None)
+        else:
+            dict.__setitem__(self, name, old)
+
+    def _rollback(self, mark: int) -> None:
+        journal = self._journal
+        self._set_journal(None)
+        entries = [journal.pop() for _ in range(len(journal) - mark)]
+        if mark == 0:
+            # Tables first loaded by a nested block that already rolled back
+            entries.extend(reversed(self._late_marks))
+        for entry in entries:
+            owner = entry[1]
+            if isinstance(owner, Table):
+                owner._journal = None
+            if entry[0] == "audit":
+                owner._truncate(entry[2], entry[3])
+            elif entry[0] == "seq":
+                owner._max_id = entry[2]
+            else:
+                owner._undo(entry)
+        self._set_journal(journal)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block of writes atomically; any exception rolls them all back.
+
+        Transactions nest: an inner block that raises is rolled back to where
+        it started, and its writes otherwise stay pending in the outer one.
+        """
+        outermost = self._journal is None
+        if outermost:
+            self._journal = []
+            self._set_journal(self._journal)
+        journal = self._journal
+        mark = len(journal)
+        for table in dict.values(self):
+            if type(table) is not _Unloaded:
+                journal.append(self._mark(table))
+        try:
+            yield self
+        except BaseException:
+            self._rollback(mark)
+            raise
+        finally:
+            if outermost:
+                self._set_journal(None)
+                self._journal = None
+                self._late_marks = []
+
+    def reset(self) -> None:
+        """Discard all changes since load (or the last reset)."""
+        dict.clear(self)
+        for name, table in self._loaded.items():
+            if type(table) is not _Unloaded:
+                table.reset()
+            dict.__setitem__(self, name, table)
+
+    def __reduce__(self):
+        return (dict, ({name: table.copy() for name, table in self.items()},))
@@ -0,0 +1,113 @@
+# Copyright Sierra
+# (group, date) sorted index for date-window listings (timesheets by employee/work_date)
+
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from .data.store import derived, peek_items, peek_row
+
+# Position of a row in the index: (group, date, key)
+Position = Tuple[str, str, str]
+
+
+class DateWindowIndex:
+    """
+    Rows of a store table sorted by (group, date, key), kept current through
+    Table.derived's on_change(key).
+
+    A date window for one group is two bisects over that group's sorted
+    (date, key) list, and every row has a stable position, so a listing can
+    resume strictly after the last row it returned (see encode_cursor) without
+    re-reading or counting the rows before it.
+
+    `extract(row)` returns (group, date) for rows that belong in the index, or
+    None to leave the row out. Dates are ISO strings (YYYY-MM-DD).
+    """
+
+    def __init__(self, table: Dict[str, Any], extract: Callable[[Dict[str, Any]], Optional[Tuple[str, str]]]):
+        self._table = table
+        self._extract = extract
+        self._groups: Dict[Hashable, List[Tuple[str, str]]] = {}
+        # key -> (group, date) currently indexed
+        self._entries: Dict[str, Tuple[str, str]] = {}
+        for key, row in peek_items(table):
+            entry = extract(row)
+            if entry is not None:
+                self._entries[key] = entry
+                self._groups.setdefault(entry[0], []).append((entry[1], key))
+        for dates in self._groups.values():
+            dates.sort()
+
+    def groups(self) -> List[Hashable]:
+        return sorted(group for group, dates in self._groups.items() if dates)
+
+    def window(
+        self,
+        groups: Iterable[Hashable],
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        after: Optional[Position] = None,
+    ) -> Iterator[Position]:
+        """
+        Positions in `groups` with start <= date <= end (either bound optional),
+        in (group, date, key) order, beginning strictly after `after`.
+        """
+        for group in sorted(groups):
+            if after is not None and group < after[0]:
+                continue
+            dates = self._groups.get(group)
+            if not dates:
+                continue
+            lo = bisect_left(dates, (start,)) if start else 0
+            # "\x00" sorts after the bare date and before the next day, so every key on `end` is included
+            hi = bisect_left(dates, (end + "\x00",)) if end else len(dates)
+            if after is not None and group == after[0]:
+                lo = max(lo, bisect_right(dates, (after[1], after[2])))
+            for date, key in dates[lo:hi]:
+                yield group, date, key
+
+    def on_change(self, key: str) -> None:
+        row = peek_row(self._table, key)
+        entry = self._extract(row) if row is not None else None
+        previous = self._entries.get(key)
+        if previous == entry:
+            return
+        if previous is not None:
+            del self._entries[key]
+            dates = self._groups[previous[0]]
+            i = bisect_left(dates, (previous[1], key))
+            if i < len(dates) and dates[i] == (previous[1], key):
+                del dates[i]
+        if entry is not None:
+            self._entries[key] = entry
+            insort(self._groups.setdefault(entry[0], []), (entry[1], key))
+
+
+def encode_cursor(position: Position) -> str:
+    """Opaque continuation token for the row at `position`."""
+    return base64.urlsafe_b64encode(json.dumps(list(position)).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Position:
+    """Inverse of encode_cursor. Raises ValueError on a malformed token."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError, AttributeError):
+        raise ValueError("Invalid cursor")
+    if not (isinstance(position, list) and len(position) == 3 and all(isinstance(p, str) for p in position)):
+        raise ValueError("Invalid cursor")
+    return tuple(position)
+
+
+def _work_date(row: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    if row.get("employee_id") and row.get("work_date"):
+        return row["employee_id"], row["work_date"]
+    return None
+
+
+def timesheet_dates(data: Dict[str, Any]) -> DateWindowIndex:
+    """(employee_id, work_date) index of data["timesheets"] (cached on store tables)."""
+    return derived(data.get("timesheets", {}), "work_dates", lambda table: DateWindowIndex(table, _work_date))
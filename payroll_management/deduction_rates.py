@@ -0,0 +1,154 @@
+# Copyright Sierra
+# Compiled effective-dated deduction rates (deductions x employee_deductions)
+
+from bisect import bisect_right
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from .data.store import derived, peek_items, peek_row
+
+OPEN_END = "9999-12-31"
+
+
+class Segment(NamedTuple):
+    """One deduction in effect for an employee over [start_date, end_date]."""
+    start_date: str
+    end_date: str
+    deduction_type: Optional[str]
+    method: Optional[str]
+    rate: float
+    employee_deduction_id: str
+
+
+def resolve(link: Dict[str, Any], master: Optional[Dict[str, Any]], key: str) -> Optional[Segment]:
+    """
+    The Segment an employee_deductions row contributes, or None when it or its
+    master deduction is inactive. The row's own method/rate override the master's.
+    """
+    master = master or {}
+    if not (link.get("active") and master.get("active")):
+        return None
+    rate = link.get("rate") if link.get("rate") is not None else master.get("rate")
+    return Segment(
+        link.get("start_date") or "",
+        link.get("end_date") or OPEN_END,
+        master.get("deduction_type"),
+        link.get("method") or master.get("method"),
+        float(rate or 0.0),
+        key,
+    )
+
+
+class _Schedule:
+    """Segments of one employee sorted by start_date, with per-period totals memoized."""
+
+    __slots__ = ("segments", "_starts", "_totals")
+
+    def __init__(self, segments: List[Segment]):
+        self.segments = sorted(segments)
+        self._starts = [s.start_date for s in self.segments]
+        self._totals: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+    def totals(self, period_start: str, period_end: str) -> Tuple[float, float]:
+        cached = self._totals.get((period_start, period_end))
+        if cached is None:
+            pct = fixed = 0.0
+            for segment in self.segments[:bisect_right(self._starts, period_end)]:
+                if segment.end_date >= period_start:
+                    if segment.method == "percent":
+                        pct += segment.rate
+                    else:
+                        fixed += segment.rate
+            cached = self._totals[(period_start, period_end)] = (pct, fixed)
+        return cached
+
+
+class EffectiveDeductions:
+    """
+    Per-employee effective-dated deduction schedules compiled from the
+    employee_deductions table and its master deductions.
+
+    Kept on the employee_deductions table (see store.Table.derived), with a
+    listener on the deductions table forwarding master changes. A change only
+    drops the schedules of the employees it touches; they are recompiled on
+    their next lookup. A schedule memoizes its (percent, fixed) totals per
+    period, so after the first employee of a run every lookup is a dict hit.
+    """
+
+    def __init__(self, links: Dict[str, Any], masters: Dict[str, Any]):
+        self._links = links
+        self._masters = masters
+        self._schedules: Dict[str, _Schedule] = {}
+        # employee_deduction_id -> (employee_id, deduction_id) currently compiled
+        self._owners: Dict[str, Tuple[Any, Any]] = {}
+        self._by_employee: Dict[Any, Set[str]] = {}
+        self._by_master: Dict[Any, Set[str]] = {}
+        for key, link in peek_items(links):
+            self._track(key, link)
+
+    def _track(self, key: str, link: Dict[str, Any]) -> None:
+        owner = (link.get("employee_id"), link.get("deduction_id"))
+        self._owners[key] = owner
+        self._by_employee.setdefault(owner[0], set()).add(key)
+        self._by_master.setdefault(owner[1], set()).add(key)
+
+    def _untrack(self, key: str) -> None:
+        owner = self._owners.pop(key, None)
+        if owner is not None:
+            self._by_employee[owner[0]].discard(key)
+            self._by_master[owner[1]].discard(key)
+            self._schedules.pop(owner[0], None)
+
+    def on_change(self, key: str) -> None:
+        """An employee_deductions row changed."""
+        self._untrack(key)
+        link = peek_row(self._links, key)
+        if link is not None:
+            self._track(key, link)
+            self._schedules.pop(link.get("employee_id"), None)
+
+    def master_changed(self, deduction_id: str) -> None:
+        """A deductions row changed: recompile every employee linked to it."""
+        for key in self._by_master.get(deduction_id, ()):
+            self._schedules.pop(self._owners[key][0], None)
+
+    def _schedule(self, employee_id: str) -> _Schedule:
+        schedule = self._schedules.get(employee_id)
+        if schedule is None:
+            segments = []
+            for key in self._by_employee.get(employee_id, ()):
+                link = peek_row(self._links, key)
+                segment = resolve(link, peek_row(self._masters, link.get("deduction_id")), key)
+                if segment is not None:
+                    segments.append(segment)
+            schedule = self._schedules[employee_id] = _Schedule(segments)
+        return schedule
+
+    def segments(self, employee_id: str) -> List[Segment]:
+        """The employee's active deductions, ordered by start_date."""
+        return list(self._schedule(employee_id).segments)
+
+    def rates(self, employee_id: str, period_start: str, period_end: str) -> Tuple[float, float]:
+        """(percent, fixed) totals of the deductions overlapping [period_start, period_end]."""
+        return self._schedule(employee_id).totals(period_start, period_end)
+
+
+class _MasterListener:
+    """Forwards deductions-table changes to the EffectiveDeductions compiled over it."""
+
+    def __init__(self, compiled: EffectiveDeductions):
+        self.compiled = compiled
+
+    def on_change(self, key: str) -> None:
+        self.compiled.master_changed(key)
+
+
+def effective_deductions(data: Dict[str, Any]) -> EffectiveDeductions:
+    """The EffectiveDeductions for data (cached on store tables)."""
+    masters = data.get("deductions", {})
+    compiled = derived(
+        data.get("employee_deductions", {}), "effective_deductions",
+        lambda table: EffectiveDeductions(table, masters)
+    )
+    listener = derived(masters, "effective_deductions", lambda table: _MasterListener(compiled))
+    listener.compiled = compiled
+    return compiled
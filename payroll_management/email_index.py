@@ -0,0 +1,60 @@
+# Copyright Sierra
+# Case-insensitive users.email -> user_id index
+
+from typing import Any, Dict, Optional, Set
+
+from .data.store import derived, peek_items, peek_row
+
+
+def normalize_email(email: Any) -> str:
+    """The index key of an email: surrounding whitespace dropped, casefolded."""
+    return str(email or "").strip().casefold()
+
+
+class EmailIndex:
+    """
+    Normalized email -> user_ids over the users table, kept current through
+    Table.derived's on_change(key), so registrations, email edits and status
+    changes are reflected without rescanning users.
+
+    Inactive and suspended accounts stay indexed: their email remains taken.
+    Several user_ids per email are tolerated so data loaded with duplicates
+    still indexes; the tools never create one.
+    """
+
+    def __init__(self, users: Dict[str, Any]):
+        self._users = users
+        self._ids: Dict[str, Set[str]] = {}
+        self._emails: Dict[str, str] = {}
+        for key, row in peek_items(users):
+            self._add(key, row)
+
+    def _add(self, key: str, row: Dict[str, Any]) -> None:
+        email = normalize_email(row.get("email"))
+        if email:
+            self._emails[key] = email
+            self._ids.setdefault(email, set()).add(key)
+
+    def on_change(self, key: str) -> None:
+        previous = self._emails.pop(key, None)
+        if previous is not None:
+            ids = self._ids[previous]
+            ids.discard(key)
+            if not ids:
+                del self._ids[previous]
+        row = peek_row(self._users, key)
+        if row is not None:
+            self._add(key, row)
+
+    def find(self, email: str) -> Optional[str]:
+        """The user_id registered with `email` (any letter case), or None."""
+        ids = self._ids.get(normalize_email(email))
+        return min(ids, key=lambda k: (len(k), k)) if ids else None
+
+    def taken(self, email: str) -> bool:
+        return normalize_email(email) in self._ids
+
+
+def email_index(data: Dict[str, Any]) -> EmailIndex:
+    """The EmailIndex for data["users"] (cached on store tables)."""
+    return derived(data.get("users", {}), "email_index", EmailIndex)
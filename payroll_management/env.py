@@ -6,13 +6,7 @@ from tau_bench.envs.user import UserStrategy
 
 from tau_bench.envs.payroll_management.data import load_data
 from tau_bench.envs.payroll_management.rules import RULES
-from tau_bench.envs.payroll_management.tools import (
-    ALL_TOOLS_INTERFACE_1,
-    ALL_TOOLS_INTERFACE_2,
-    ALL_TOOLS_INTERFACE_3,
-    ALL_TOOLS_INTERFACE_4,
-    ALL_TOOLS_INTERFACE_5,
-)
+from tau_bench.envs.payroll_management.tools.registry import TOOL_INTERFACES, tool_registry
 from tau_bench.envs.payroll_management.hrpolicy import HR_POLICY
 
 
@@ -42,10 +36,12 @@ class MockPayrollManagementDomainEnv(Env):
         self.data = load_data()
         self.rules = RULES
         self.policy = HR_POLICY
-        self.tools = {
-            "interface_1": ALL_TOOLS_INTERFACE_1,
-            "interface_2": ALL_TOOLS_INTERFACE_2,
-            "interface_3": ALL_TOOLS_INTERFACE_3,
-            "interface_4": ALL_TOOLS_INTERFACE_4,
-            "interface_5": ALL_TOOLS_INTERFACE_5,
-        }
+        self.tools = dict(TOOL_INTERFACES)
+        # Name -> class dispatch and per-interface schemas, computed once per process
+        self.registry = tool_registry()
+        self.tools_map = self.registry.tools
+
+    def reset(self, *args, **kwargs):
+        # Undo the previous episode's writes in place instead of re-reading the JSON files
+        self.data.reset()
+        return super().reset(*args, **kwargs)
@@ -0,0 +1,229 @@
+# Copyright Sierra
+# Interval index for overlap checks (payroll run periods, timesheet clock spans)
+
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import accumulate
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .data.store import derived, peek_items, peek_row
+
+
+class IntervalIndex:
+    """
+    Intervals (start, end, key) sorted by start, with a running maximum of end.
+
+    Because the running max is non-decreasing, "does anything overlap
+    [start, end]?" is two bisects: the intervals starting before `end` form a
+    prefix, and one of them reaches `start` exactly when the prefix's max end
+    does. Listing the overlaps scans only that prefix's tail. This gives the
+    query bounds of an augmented interval tree while appends (the common case:
+    new periods and clock-ins come last) stay cheap; the running max is only
+    recomputed from the first position changed since the last query.
+
+    Bounds can be any mutually comparable values (ISO date strings, epoch
+    seconds). `closed=True` treats intervals as [start, end] (payroll periods);
+    `closed=False` as [start, end), so back-to-back spans do not overlap.
+    """
+
+    __slots__ = ("closed", "_entries", "_starts", "_max_end", "_dirty")
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any, Hashable]] = (), closed: bool = True):
+        self.closed = closed
+        # (start, key, end), sorted
+        self._entries: List[Tuple[Any, Hashable, Any]] = sorted((s, k, e) for s, e, k in intervals)
+        self._starts: List[Any] = [entry[0] for entry in self._entries]
+        self._max_end: List[Any] = []
+        self._dirty = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, start: Any, end: Any, key: Hashable) -> None:
+        i = bisect_right(self._entries, (start, key, end))
+        self._entries.insert(i, (start, key, end))
+        self._starts.insert(i, start)
+        self._dirty = min(self._dirty, i)
+
+    def add_many(self, intervals: Iterable[Tuple[Any, Any, Hashable]]) -> None:
+        """Bulk insert (e.g. a batch clock import): one sort instead of one insert per interval."""
+        new = sorted((s, k, e) for s, e, k in intervals)
+        if not new:
+            return
+        first = bisect_left(self._entries, new[0])
+        self._entries.extend(new)
+        self._entries.sort()
+        self._starts = [entry[0] for entry in self._entries]
+        self._dirty = min(self._dirty, first)
+
+    def remove(self, start: Any, end: Any, key: Hashable) -> None:
+        i = bisect_left(self._entries, (start, key, end))
+        if i < len(self._entries) and self._entries[i] == (start, key, end):
+            del self._entries[i]
+            del self._starts[i]
+            self._dirty = min(self._dirty, i)
+
+    def _prefix(self, end: Any) -> int:
+        # Number of intervals starting before (or at, when closed) `end`
+        return bisect_right(self._starts, end) if self.closed else bisect_left(self._starts, end)
+
+    def _max_ends(self) -> List[Any]:
+        if self._dirty < len(self._entries) or len(self._max_end) != len(self._entries):
+            self._dirty = min(self._dirty, len(self._max_end))
+            head = self._max_end[:self._dirty]
+            tail = (entry[2] for entry in self._entries[self._dirty:])
+            if head:
+                self._max_end = head + list(accumulate(tail, max, initial=head[-1]))[1:]
+            else:
+                self._max_end = list(accumulate(tail, max))
+            self._dirty = len(self._entries)
+        return self._max_end
+
+    def _reaches(self, end: Any, start: Any) -> bool:
+        return end >= start if self.closed else end > start
+
+    def overlaps(self, start: Any, end: Any) -> bool:
+        """True if any interval overlaps [start, end] (or [start, end) when not closed)."""
+        hi = self._prefix(end)
+        return hi > 0 and self._reaches(self._max_ends()[hi - 1], start)
+
+    def overlapping(self, start: Any, end: Any) -> List[Hashable]:
+        """Keys of intervals overlapping the query, in start order."""
+        hi = self._prefix(end)
+        if hi == 0:
+            return []
+        max_end = self._max_ends()
+        # First position whose running max reaches `start`; nothing before it can overlap
+        lo = bisect_left(max_end, start, 0, hi) if self.closed else bisect_right(max_end, start, 0, hi)
+        return [key for _, key, e in self._entries[lo:hi] if self._reaches(e, start)]
+
+
+class GroupedIntervalIndex:
+    """
+    One IntervalIndex per group (e.g. payroll run status, employee_id) over a
+    store table, kept current through Table.derived's on_change(key).
+
+    `extract(row)` returns (group, start, end) for rows that belong in the
+    index, or None to leave the row out.
+
+    Inside `with index.bulk():` newly inserted rows are buffered and added per
+    group with one IntervalIndex.add_many when the block ends.
+    """
+
+    def __init__(
+        self,
+        table: Dict[str, Any],
+        extract: Callable[[Dict[str, Any]], Optional[Tuple[Hashable, Any, Any]]],
+        closed: bool = True,
+    ):
+        self._table = table
+        self._extract = extract
+        self._closed = closed
+        self._groups: Dict[Hashable, IntervalIndex] = {}
+        # key -> (group, start, end) currently indexed
+        self._entries: Dict[str, Tuple[Hashable, Any, Any]] = {}
+        pending: Dict[Hashable, List[Tuple[Any, Any, str]]] = {}
+        for key, row in peek_items(table):
+            entry = extract(row)
+            if entry is not None:
+                self._entries[key] = entry
+                pending.setdefault(entry[0], []).append((entry[1], entry[2], key))
+        for group, intervals in pending.items():
+            self._groups[group] = IntervalIndex(intervals, closed=closed)
+        self._batch: Optional[Dict[Hashable, List[Tuple[Any, Any, str]]]] = None
+
+    def group(self, group: Hashable) -> Optional[IntervalIndex]:
+        return self._groups.get(group)
+
+    def groups(self) -> List[Hashable]:
+        return [group for group, index in self._groups.items() if len(index)]
+
+    def overlapping(self, groups: Iterable[Hashable], start: Any, end: Any) -> List[str]:
+        """Keys in any of `groups` overlapping [start, end]."""
+        keys: List[str] = []
+        for group in groups:
+            index = self._groups.get(group)
+            if index is not None:
+                keys.extend(index.overlapping(start, end))
+        return keys
+
+    @contextmanager
+    def bulk(self):
+        """Buffer inserts (e.g. a batch clock import); queries inside the block do not see them."""
+        outermost = self._batch is None
+        if outermost:
+            self._batch = {}
+        try:
+            yield self
+        finally:
+            if outermost:
+                batch, self._batch = self._batch, None
+                for group, intervals in batch.items():
+                    index = self._groups.get(group)
+                    if index is None:
+                        self._groups[group] = IntervalIndex(intervals, closed=self._closed)
+                    else:
+                        index.add_many(intervals)
+
+    def on_change(self, key: str) -> None:
+        row = peek_row(self._table, key)
+        entry = self._extract(row) if row is not None else None
+        previous = self._entries.get(key)
+        if previous == entry:
+            return
+        if previous is not None:
+            del self._entries[key]
+            self._remove(key, previous)
+        if entry is not None:
+            self._entries[key] = entry
+            if self._batch is not None:
+                self._batch.setdefault(entry[0], []).append((entry[1], entry[2], key))
+                return
+            group = self._groups.get(entry[0])
+            if group is None:
+                group = self._groups[entry[0]] = IntervalIndex(closed=self._closed)
+            group.add(entry[1], entry[2], key)
+
+    def _remove(self, key: str, entry: Tuple[Hashable, Any, Any]) -> None:
+        buffered = self._batch.get(entry[0]) if self._batch is not None else None
+        if buffered and (entry[1], entry[2], key) in buffered:
+            buffered.remove((entry[1], entry[2], key))
+        else:
+            self._groups[entry[0]].remove(entry[1], entry[2], key)
+
+
+def epoch_seconds(timestamp: str) -> float:
+    """Seconds since the epoch for an ISO timestamp (naive timestamps are taken as UTC)."""
+    moment = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def _run_period(row: Dict[str, Any]) -> Optional[Tuple[Hashable, Any, Any]]:
+    if row.get("period_start") and row.get("period_end"):
+        return row.get("status"), row["period_start"], row["period_end"]
+    return None
+
+
+def payroll_run_index(data: Dict[str, Any]) -> GroupedIntervalIndex:
+    """[period_start, period_end] of every payroll run, grouped by status (cached on store tables)."""
+    return derived(data.get("payroll_runs", {}), "run_periods", lambda table: GroupedIntervalIndex(table, _run_period))
+
+
+def _clock_span(row: Dict[str, Any]) -> Optional[Tuple[Hashable, Any, Any]]:
+    # Rejected timesheets are never paid, so they cannot double-pay
+    if row.get("status") == "rejected" or not (row.get("clock_in") and row.get("clock_out")):
+        return None
+    try:
+        return row.get("employee_id"), epoch_seconds(row["clock_in"]), epoch_seconds(row["clock_out"])
+    except ValueError:
+        return None
+
+
+def timesheet_index(data: Dict[str, Any]) -> GroupedIntervalIndex:
+    """[clock_in, clock_out) of every live timesheet as epoch seconds, per employee (cached on store tables)."""
+    return derived(
+        data.get("timesheets", {}), "clock_spans", lambda table: GroupedIntervalIndex(table, _clock_span, closed=False)
+    )
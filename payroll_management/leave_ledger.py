@@ -0,0 +1,137 @@
+# Copyright Sierra
+# Effective-dated leave balance ledger (SOP 14)
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
+
+from .data.store import derived, peek_items, peek_row
+
+LEAVE_TYPES = ("annual", "sick", "fmla", "personal", "bereavement", "jury_duty")
+
+# Days granted per calendar year; "annual" accrues monthly, the rest are granted on Jan 1
+ANNUAL_ALLOWANCE = {"annual": 15, "sick": 10, "fmla": 60, "personal": 3, "bereavement": 5, "jury_duty": 10}
+MONTHLY_ACCRUAL = ("annual",)
+
+# leave_requests.status values that consume (active) or reserve (pending) balance
+CONSUMING_STATUS = "active"
+RESERVING_STATUS = "pending"
+
+
+def requested_days(start_date: str, end_date: str) -> int:
+    """Calendar days in [start_date, end_date], inclusive."""
+    return (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+
+
+def accrued(leave_type: str, as_of: str, hire_date: Optional[str] = None) -> float:
+    """Allowance earned in as_of's calendar year up to as_of, prorated from hire_date."""
+    allowance = ANNUAL_ALLOWANCE[leave_type]
+    year, month = int(as_of[:4]), int(as_of[5:7])
+    first_month = 1
+    if hire_date and hire_date[:4] == as_of[:4]:
+        if hire_date > as_of:
+            return 0.0
+        first_month = int(hire_date[5:7])
+    elif hire_date and hire_date[:4] > as_of[:4]:
+        return 0.0
+    months = month - first_month + 1 if leave_type in MONTHLY_ACCRUAL else 13 - first_month
+    return round(allowance * months / 12.0, 2)
+
+
+class _Account:
+    """Requests of one (employee_id, leave_type), sorted by start_date, with cached prefix sums."""
+
+    __slots__ = ("entries", "_dates", "_used", "_pending")
+
+    def __init__(self):
+        # (start_date, leave_request_id, days, status)
+        self.entries: List[Tuple[str, str, int, str]] = []
+        self._dates: Optional[List[str]] = None
+
+    def add(self, entry: Tuple[str, str, int, str]) -> None:
+        insort(self.entries, entry)
+        self._dates = None
+
+    def remove(self, entry: Tuple[str, str, int, str]) -> None:
+        i = bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            del self.entries[i]
+            self._dates = None
+
+    def _cache(self) -> None:
+        self._dates = [e[0] for e in self.entries]
+        self._used = [0, *accumulate(e[2] if e[3] == CONSUMING_STATUS else 0 for e in self.entries)]
+        self._pending = [0, *accumulate(e[2] if e[3] == RESERVING_STATUS else 0 for e in self.entries)]
+
+    def totals(self, start: str, end: str) -> Tuple[int, int]:
+        """(used, pending) days of requests starting in [start, end]."""
+        if self._dates is None:
+            self._cache()
+        lo = bisect_left(self._dates, start)
+        hi = bisect_right(self._dates, end)
+        return self._used[hi] - self._used[lo], self._pending[hi] - self._pending[lo]
+
+
+class LeaveLedger:
+    """
+    Per-employee, per-leave_type ledger over the leave_requests table.
+
+    Built once per table (see store.Table.derived) and updated per changed
+    request, so balance lookups never rescan leave_requests: each account
+    keeps its requests sorted by start_date with prefix sums of used and
+    pending days, recomputed only after that account changes.
+    """
+
+    def __init__(self, table: Dict[str, Any]):
+        self._table = table
+        self._accounts: Dict[Tuple[str, str], _Account] = {}
+        # leave_request_id -> (account key, entry) currently in the ledger
+        self._entries: Dict[str, Tuple[Tuple[str, str], Tuple[str, str, int, str]]] = {}
+        for key, row in peek_items(table):
+            self._add(key, row)
+
+    def _add(self, key: str, row: Dict[str, Any]) -> None:
+        start, end = row.get("start_date"), row.get("end_date")
+        if not (row.get("employee_id") and row.get("leave_type") and start and end):
+            return
+        days = row.get("requested_days")
+        if days is None:
+            days = requested_days(start, end)
+        account = (row["employee_id"], row["leave_type"])
+        entry = (start, key, days, row.get("status"))
+        self._accounts.setdefault(account, _Account()).add(entry)
+        self._entries[key] = (account, entry)
+
+    def on_change(self, key: str) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._accounts[previous[0]].remove(previous[1])
+        row = peek_row(self._table, key)
+        if row is not None:
+            self._add(key, row)
+
+    def balance(self, employee_id: str, leave_type: str, as_of: str, hire_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Balance of one leave type for as_of's calendar year.
+
+        available = accrued - used (active requests) - pending (pending requests),
+        counting every request that starts in that year.
+        """
+        year = as_of[:4]
+        account = self._accounts.get((employee_id, leave_type))
+        used, pending = account.totals(f"{year}-01-01", f"{year}-12-31") if account else (0, 0)
+        earned = accrued(leave_type, as_of, hire_date)
+        return {
+            "leave_type": leave_type,
+            "allowance": ANNUAL_ALLOWANCE[leave_type],
+            "accrued": earned,
+            "used": used,
+            "pending": pending,
+            "available": round(earned - used - pending, 2),
+        }
+
+
+def leave_ledger(data: Dict[str, Any]) -> LeaveLedger:
+    """The LeaveLedger for data["leave_requests"] (cached on store tables)."""
+    return derived(data.get("leave_requests", {}), "leave_ledger", LeaveLedger)
@@ -0,0 +1,165 @@
+# Copyright Sierra
+# Dirty tracking of payroll line items (SOP 6 / SOP 9 incremental recompute)
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from .data.store import derived, keys_where, peek_items, peek_row
+from .deduction_rates import OPEN_END
+from .intervals import payroll_run_index
+
+# Runs whose line items are recomputed; other statuses are frozen
+RECOMPUTED_STATUS = "draft"
+
+
+class LineItemTracker:
+    """
+    Which (payroll_run_id, employee_id) line items are stale.
+
+    A run is tracked once its line items were fully generated (generated());
+    from then on listeners on timesheets, employees, employee_deductions,
+    deductions and payroll_corrections mark the employees whose inputs changed,
+    limited to draft runs whose period the change falls in. take() hands the
+    dirty employees of a run to an incremental recompute.
+
+    Line items written outside writing() (another tool, a transaction
+    rollback) make the tracker forget the run, so the next recompute of it is
+    a full one. Kept on the payroll_line_items table (see store.Table.derived).
+    """
+
+    def __init__(self, data: Dict[str, Any], line_items: Dict[str, Any]):
+        self._data = data
+        self._line_items = line_items
+        # payroll_run_id -> pay_frequency filter of its last full generation
+        self._generated: Dict[str, Optional[str]] = {}
+        self._dirty: Dict[str, Set[str]] = {}
+        self._writing = False
+
+    def is_tracked(self, payroll_run_id: str, pay_frequency: Optional[str] = None) -> bool:
+        return payroll_run_id in self._generated and self._generated[payroll_run_id] == pay_frequency
+
+    def generated(self, payroll_run_id: str, pay_frequency: Optional[str] = None) -> None:
+        """All line items of the run were just recomputed: start tracking it clean."""
+        self._generated[payroll_run_id] = pay_frequency
+        self._dirty.pop(payroll_run_id, None)
+
+    def take(self, payroll_run_id: str) -> Set[str]:
+        """Dirty employee_ids of a tracked run; they count as clean afterwards."""
+        return self._dirty.pop(payroll_run_id, set())
+
+    def dirty(self, payroll_run_id: str) -> Set[str]:
+        return set(self._dirty.get(payroll_run_id, ()))
+
+    def clean(self, payroll_run_id: str, employee_ids: Iterable[str]) -> None:
+        """These employees' line items of the run were just recomputed."""
+        dirty = self._dirty.get(payroll_run_id)
+        if dirty:
+            dirty.difference_update(employee_ids)
+
+    @contextmanager
+    def writing(self):
+        """Line items written inside the block are the recompute's own and keep the run tracked."""
+        self._writing = True
+        try:
+            yield self
+        finally:
+            self._writing = False
+
+    # ---------- marking ----------
+
+    def mark(self, payroll_run_ids: Iterable[str], employee_id: Optional[str]) -> None:
+        if employee_id is None:
+            return
+        for payroll_run_id in payroll_run_ids:
+            if payroll_run_id in self._generated:
+                self._dirty.setdefault(payroll_run_id, set()).add(employee_id)
+
+    def mark_period(self, employee_id: Optional[str], start: str, end: str) -> None:
+        """Mark the employee in every tracked draft run overlapping [start, end]."""
+        if self._generated and employee_id is not None:
+            runs = payroll_run_index(self._data).overlapping([RECOMPUTED_STATUS], start, end)
+            self.mark(runs, employee_id)
+
+    def mark_all(self, employee_id: Optional[str]) -> None:
+        """Mark the employee in every tracked run (e.g. a salary change)."""
+        self.mark(list(self._generated), employee_id)
+
+    def mark_deduction(self, deduction_id: Optional[str]) -> None:
+        """A master deduction changed: mark every employee linked to it over the link's dates."""
+        links = self._data.get("employee_deductions", {})
+        for key in keys_where(links, "deduction_id", deduction_id):
+            self.mark_period(*_deduction_span(peek_row(links, key)))
+
+    def on_change(self, key: str) -> None:
+        """A payroll_line_items row changed."""
+        if self._writing:
+            return
+        row = peek_row(self._line_items, key)
+        if row is None:
+            self._generated.clear()
+            self._dirty.clear()
+        else:
+            self._generated.pop(row.get("payroll_run_id"), None)
+            self._dirty.pop(row.get("payroll_run_id"), None)
+
+
+class _Listener:
+    """
+    Forwards changes of one input table to the LineItemTracker. `span(row)`
+    returns what the row affects; both the old and the new span are marked.
+    """
+
+    def __init__(self, table: Dict[str, Any], span, mark):
+        self.tracker: Optional[LineItemTracker] = None
+        self._table = table
+        self._span = span
+        self._mark = mark
+        self._spans: Dict[str, Any] = {key: span(row) for key, row in peek_items(table)}
+
+    def on_change(self, key: str) -> None:
+        row = peek_row(self._table, key)
+        new = self._span(row) if row is not None else None
+        old = self._spans.pop(key, None)
+        if new is not None:
+            self._spans[key] = new
+        for span in {old, new} - {None}:
+            self._mark(self.tracker, span)
+
+
+def _work_day(row: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    if row.get("work_date"):
+        return row.get("employee_id"), row["work_date"]
+    return None
+
+
+def _deduction_span(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    return row.get("employee_id"), row.get("start_date") or "", row.get("end_date") or OPEN_END
+
+
+def _correction(row: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    if row.get("payroll_run_id"):
+        return row["payroll_run_id"], row.get("employee_id")
+    return None
+
+
+# input table -> (span of a row, how a span is marked)
+_LISTENERS = {
+    "timesheets": (_work_day, lambda tracker, s: tracker.mark_period(s[0], s[1], s[1])),
+    "employee_deductions": (_deduction_span, lambda tracker, s: tracker.mark_period(*s)),
+    "payroll_corrections": (_correction, lambda tracker, s: tracker.mark([s[0]], s[1])),
+    "employees": (lambda row: row.get("employee_id"), LineItemTracker.mark_all),
+    "deductions": (lambda row: row.get("deduction_id"), LineItemTracker.mark_deduction),
+}
+
+
+def line_item_tracker(data: Dict[str, Any]) -> LineItemTracker:
+    """The LineItemTracker for data, with its input-table listeners (cached on store tables)."""
+    line_items = data.get("payroll_line_items", {})
+    tracker = derived(line_items, "line_item_tracker", lambda table: LineItemTracker(data, table))
+    if getattr(line_items, "derived", None) is None:
+        # Plain dicts: nothing is cached, so there is nothing to keep current
+        return tracker
+    for name, (span, mark) in _LISTENERS.items():
+        listener = derived(data.get(name, {}), "line_item_tracker", lambda table: _Listener(table, span, mark))
+        listener.tracker = tracker
+    return tracker
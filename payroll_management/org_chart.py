@@ -0,0 +1,105 @@
+# Copyright Sierra
+# Management-chain closure over employees.manager_user_id
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .data.store import derived, peek_items, peek_row
+
+
+class OrgChart:
+    """
+    Transitive closure of the reporting hierarchy, keyed by user_id.
+
+    Each user's employees row names their manager (manager_user_id); a user
+    managing themselves, or with no manager, is a root. For every user the
+    chart keeps the chain of managers up to the root (nearest first) and the
+    set of everyone below them, kept current through Table.derived's
+    on_change(key). "Is A in B's reporting chain" is then one set lookup and
+    "everyone under A" is a set already built. Moving a manager link rewrites
+    the closure of the moved subtree only.
+
+    A link that would close a cycle is not followed: that user is kept as a
+    root until their row changes again (the tools refuse such links).
+    """
+
+    def __init__(self, employees: Dict[str, Any]):
+        self._employees = employees
+        # employee_id -> user_id of the rows seen
+        self._users: Dict[str, Optional[str]] = {}
+        self._parent: Dict[str, Optional[str]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._chain: Dict[str, Tuple[str, ...]] = {}
+        self._above: Dict[str, Set[str]] = {}
+        self._below: Dict[str, Set[str]] = {}
+        for key, _ in peek_items(employees):
+            self.on_change(key)
+
+    def _node(self, user_id: str) -> None:
+        if user_id not in self._parent:
+            self._parent[user_id] = None
+            self._children[user_id] = set()
+            self._chain[user_id] = ()
+            self._above[user_id] = set()
+            self._below[user_id] = set()
+
+    def _reparent(self, user_id: str, manager: Optional[str]) -> None:
+        self._node(user_id)
+        if manager == user_id or (manager is not None and manager in self._below[user_id]):
+            manager = None
+        old = self._parent[user_id]
+        if manager == old:
+            return
+        if manager is not None:
+            self._node(manager)
+        moved = self._below[user_id] | {user_id}
+        old_above, old_depth = self._above[user_id], len(self._chain[user_id])
+        for above in old_above:
+            self._below[above] -= moved
+        if old is not None:
+            self._children[old].discard(user_id)
+
+        self._parent[user_id] = manager
+        if manager is None:
+            new_chain: Tuple[str, ...] = ()
+        else:
+            self._children[manager].add(user_id)
+            new_chain = (manager,) + self._chain[manager]
+        new_above = set(new_chain)
+        for above in new_above:
+            self._below[above] |= moved
+        for member in moved:
+            chain = self._chain[member]
+            self._chain[member] = chain[:len(chain) - old_depth] + new_chain
+            self._above[member] = (self._above[member] - old_above) | new_above
+
+    def on_change(self, key: str) -> None:
+        row = peek_row(self._employees, key)
+        user_id = row.get("user_id") if row is not None else None
+        previous = self._users.get(key)
+        if previous is not None and previous != user_id:
+            del self._users[key]
+            self._reparent(previous, None)
+        if user_id is not None:
+            self._users[key] = user_id
+            self._reparent(user_id, row.get("manager_user_id"))
+
+    def manager(self, user_id: str) -> Optional[str]:
+        return self._parent.get(user_id)
+
+    def chain(self, user_id: str) -> Tuple[str, ...]:
+        """The user's managers, nearest first, up to the root."""
+        return self._chain.get(user_id, ())
+
+    def is_above(self, manager_user_id: str, user_id: str) -> bool:
+        """Whether manager_user_id is in user_id's reporting chain (a direct or indirect manager)."""
+        return manager_user_id in self._above.get(user_id, ())
+
+    def reports(self, user_id: str, direct: bool = False) -> List[str]:
+        """user_ids reporting to user_id, directly or (by default) anywhere below them, sorted."""
+        members = self._children if direct else self._below
+        return sorted(members.get(user_id, ()), key=lambda u: (len(u), u))
+
+
+def org_chart(data: Dict[str, Any]) -> OrgChart:
+    """The OrgChart for data["employees"] (cached on store tables)."""
+    return derived(data.get("employees", {}), "org_chart", OrgChart)
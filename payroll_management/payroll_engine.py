@@ -0,0 +1,214 @@
+# Copyright Sierra
+# Columnar payroll line-item engine (SOP 6)
+
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .data.store import keys_where, peek_row, peek_values
+from .date_index import timesheet_dates
+from .deduction_rates import effective_deductions
+
+PERIODS_PER_YEAR = {"weekly": 52, "biweekly": 26, "semimonthly": 24, "monthly": 12}
+# Calendar days (min, max) a run may span and still pay one full period of each pay group
+PERIOD_DAYS = {"weekly": (7, 7), "biweekly": (14, 14), "semimonthly": (13, 16), "monthly": (28, 31)}
+STANDARD_HOURS_PER_YEAR = 2080.0
+STANDARD_HOURS_PER_WEEK = 40.0
+OVERTIME_MULTIPLIER = 1.5
+
+# payroll_corrections.field_changed values that override a computed line-item amount
+CORRECTABLE_FIELDS = ("gross_pay", "total_deductions", "net_pay")
+
+
+def _money(values: np.ndarray) -> np.ndarray:
+    # ROUND_HALF_UP to cents, matching the seeder's to_money()
+    return np.floor(values * 100.0 + 0.5) / 100.0
+
+
+def _payable_employees(
+    data: Dict[str, Any], period_start: str, period_end: str, pay_frequency: Optional[str],
+    employee_ids: Optional[Iterable[str]] = None
+) -> List[Dict[str, Any]]:
+    employees = data.get("employees", {})
+    if employee_ids is None:
+        candidates = peek_values(employees)
+    else:
+        candidates = (e for e in (peek_row(employees, i) for i in sorted(employee_ids)) if e is not None)
+    return [
+        e for e in candidates
+        if e.get("employment_status") == "active"
+        and (e.get("hire_date") or "") <= period_end
+        and (pay_frequency is None or e.get("pay_frequency") == pay_frequency)
+    ]
+
+
+def _approved_sheets(
+    data: Dict[str, Any], position: Dict[str, int], period_start: str, period_end: str
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(employee position, work_date, total_hours) of the approved timesheets in [period_start, period_end]."""
+    sheets = data.get("timesheets", {})
+    if not sheets:
+        return np.zeros(0, dtype=np.int64), np.array([], dtype=str), np.zeros(0)
+    if len(position) * 64 < len(sheets):
+        # A few employees (incremental recompute): read their windows from the work_date index
+        found = [
+            (position[t["employee_id"]], t.get("work_date"), t.get("total_hours") or 0.0)
+            for t in (peek_row(sheets, key) for _, _, key in timesheet_dates(data).window(position, period_start, period_end))
+            if t.get("status") == "approved"
+        ]
+        if not found:
+            return np.zeros(0, dtype=np.int64), np.array([], dtype=str), np.zeros(0)
+        emp_idx, work_dates, totals = zip(*found)
+        return np.asarray(emp_idx, dtype=np.int64), np.array(work_dates), np.asarray(totals, dtype=float)
+    emp_ids, work_dates, statuses, totals = zip(*(
+        (t.get("employee_id"), t.get("work_date") or "", t.get("status"), t.get("total_hours") or 0.0)
+        for t in peek_values(sheets)
+    ))
+    emp_idx = np.fromiter((position.get(e, -1) for e in emp_ids), dtype=np.int64, count=len(emp_ids))
+    work_date = np.array(work_dates)
+    mask = (
+        (emp_idx >= 0)
+        & (np.array(statuses, dtype=object) == "approved")
+        & (work_date >= period_start)
+        & (work_date <= period_end)
+    )
+    return emp_idx[mask], work_date[mask], np.asarray(totals, dtype=float)[mask]
+
+
+def approved_hours(
+    data: Dict[str, Any], position: Dict[str, int], period_start: str, period_end: str
+) -> np.ndarray:
+    """Sum of approved timesheet hours in [period_start, period_end] per employee position."""
+    emp_idx, _, totals = _approved_sheets(data, position, period_start, period_end)
+    return np.bincount(emp_idx, weights=totals, minlength=len(position))
+
+
+def overtime_hours(
+    data: Dict[str, Any], position: Dict[str, int], period_start: str, period_end: str
+) -> np.ndarray:
+    """
+    Approved hours beyond 40 in each ISO week (Monday to Sunday) of the period,
+    summed per employee position. A week cut by the period bounds only counts
+    its days inside the period.
+    """
+    emp_idx, work_date, totals = _approved_sheets(data, position, period_start, period_end)
+    if not len(emp_idx):
+        return np.zeros(len(position))
+    # Days since 1970-01-01, a Thursday: +3 starts every bucket on a Monday
+    week = (work_date.astype("datetime64[D]").astype(np.int64) + 3) // 7
+    week -= week.min()
+    weeks = int(week.max()) + 1
+    per_week = np.bincount(emp_idx * weeks + week, weights=totals, minlength=len(position) * weeks)
+    return np.maximum(per_week.reshape(len(position), weeks) - STANDARD_HOURS_PER_WEEK, 0.0).sum(axis=1)
+
+
+def _deduction_rates(
+    data: Dict[str, Any], position: Dict[str, int], period_start: str, period_end: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Effective (percent, fixed) deduction totals per employee position.
+
+    An employee_deductions row applies when it and its master deduction are
+    active and its [start_date, end_date] overlaps the period; its own
+    method/rate override the master's (see deduction_rates.py).
+    """
+    n = len(position)
+    pct, fixed = np.zeros(n), np.zeros(n)
+    if not data.get("employee_deductions"):
+        return pct, fixed
+    compiled = effective_deductions(data)
+    for employee_id, i in position.items():
+        pct[i], fixed[i] = compiled.rates(employee_id, period_start, period_end)
+    return pct, fixed
+
+
+def _corrections(
+    data: Dict[str, Any], payroll_run_id: Optional[str], ids: List[str], subset: bool
+) -> Dict[str, List[Dict[str, Any]]]:
+    """payroll_corrections of the run per employee_id, in correction_id order."""
+    table = data.get("payroll_corrections", {})
+    if not table or payroll_run_id is None:
+        return {}
+    if subset:
+        keys = [k for employee_id in ids for k in keys_where(table, "employee_id", employee_id)]
+    else:
+        keys = keys_where(table, "payroll_run_id", payroll_run_id)
+    found: Dict[str, List[Dict[str, Any]]] = {}
+    for key in sorted(keys, key=int):
+        row = peek_row(table, key)
+        if row.get("payroll_run_id") == payroll_run_id and row.get("field_changed") in CORRECTABLE_FIELDS:
+            found.setdefault(row.get("employee_id"), []).append(row)
+    return found
+
+
+def apply_corrections(amounts: Dict[str, float], corrections: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Overlay payroll_corrections (in order) on computed amounts. A corrected
+    gross_pay or total_deductions re-derives net_pay; a corrected net_pay is kept as is.
+    """
+    for correction in corrections:
+        field = correction["field_changed"]
+        amounts[field] = round(float(correction["new_value"]), 2)
+        if field != "net_pay":
+            amounts["net_pay"] = round(amounts["gross_pay"] - amounts["total_deductions"], 2)
+    return amounts
+
+
+def compute_line_items(
+    data: Dict[str, Any], run: Dict[str, Any], pay_frequency: Optional[str] = None,
+    employee_ids: Optional[Iterable[str]] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Compute gross/deductions/net for every payable employee of a payroll run in one pass.
+
+    gross_pay = base_pay + overtime_hours * (salary_base / 2080) * 1.5
+    where base_pay is salary_base / periods_per_year(pay_frequency) when the
+    run spans one period of the employee's pay group (PERIOD_DAYS), and
+    salary_base * run_days / 365 otherwise, and overtime_hours are the approved
+    hours beyond 40 in each ISO week of the period (see overtime_hours).
+    total_deductions = percent deductions of gross + fixed deductions (capped at gross).
+    The run's payroll_corrections are then applied on top (see apply_corrections).
+
+    Args:
+        data: domain tables.
+        run: the payroll_runs row (period_start/period_end are used).
+        pay_frequency: optional pay group filter; all active employees when omitted.
+        employee_ids: optional subset to recompute (e.g. the dirty employees of a run).
+
+    Returns:
+        Dict mapping employee_id -> {"gross_pay", "total_deductions", "net_pay"}
+    """
+    period_start, period_end = run["period_start"], run["period_end"]
+    employees = _payable_employees(data, period_start, period_end, pay_frequency, employee_ids)
+    if not employees:
+        return {}
+
+    ids = [e["employee_id"] for e in employees]
+    position = {employee_id: i for i, employee_id in enumerate(ids)}
+    salary = np.fromiter((float(e.get("salary_base") or 0.0) for e in employees), dtype=float, count=len(ids))
+    frequencies = [e.get("pay_frequency") if e.get("pay_frequency") in PERIODS_PER_YEAR else "monthly"
+                   for e in employees]
+    periods = np.fromiter((PERIODS_PER_YEAR[f] for f in frequencies), dtype=float, count=len(ids))
+
+    period_days = (date.fromisoformat(period_end) - date.fromisoformat(period_start)).days + 1
+    full_period = np.fromiter(
+        (PERIOD_DAYS[f][0] <= period_days <= PERIOD_DAYS[f][1] for f in frequencies), dtype=bool, count=len(ids)
+    )
+    base = np.where(full_period, salary / periods, salary * period_days / 365.0)
+
+    overtime = overtime_hours(data, position, period_start, period_end)
+    pct, fixed = _deduction_rates(data, position, period_start, period_end)
+    hourly = salary / STANDARD_HOURS_PER_YEAR
+
+    gross = _money(base + overtime * hourly * OVERTIME_MULTIPLIER)
+    deductions = _money(np.minimum(gross * pct / 100.0 + fixed, gross))
+    net = _money(gross - deductions)
+
+    corrections = _corrections(data, run.get("payroll_run_id"), ids, employee_ids is not None)
+    return {
+        employee_id: apply_corrections(
+            {"gross_pay": g, "total_deductions": d, "net_pay": n}, corrections.get(employee_id, ())
+        )
+        for employee_id, g, d, n in zip(ids, gross.tolist(), deductions.tolist(), net.tolist())
+    }
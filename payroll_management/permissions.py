@@ -0,0 +1,95 @@
+# Copyright Sierra
+# Role -> action matrix and memoized per-user capabilities for acting_user_id checks
+
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Tuple
+
+from .data.store import derived, peek_row
+
+# Role -> actions it may perform (SOP roles & responsibilities); every role is listed
+ROLE_ACTIONS: Dict[str, Tuple[str, ...]] = {
+    "employee": (),
+    # Team actions only reach employees below the manager in the reporting chain (org_chart.py)
+    "manager": ("manage_team",),
+    "payroll_administrator": (
+        "initiate_payroll_run", "generate_line_items", "pay_payroll_run", "read_payroll_reports",
+        "read_timesheets", "read_leave_balances",
+    ),
+    "finance_officer": (
+        "approve_payroll_run", "approve_correction", "pay_payroll_run", "read_payroll_reports",
+        "read_timesheets", "read_audit_trail",
+    ),
+    "hr_director": (
+        "read_payroll_reports", "read_timesheets", "submit_timesheet_for_others", "request_leave_for_others",
+        "read_leave_balances", "oversee_approvals", "read_audit_trail", "manage_access", "manage_employees",
+    ),
+    "it_administrator": ("read_audit_trail", "manage_access"),
+    "compliance_officer": ("read_timesheets", "oversee_approvals", "read_audit_trail"),
+}
+
+
+def _action_roles() -> Dict[str, Tuple[str, ...]]:
+    compiled: Dict[str, Tuple[str, ...]] = {}
+    for role, actions in ROLE_ACTIONS.items():
+        for action in actions:
+            compiled[action] = compiled.get(action, ()) + (role,)
+    return compiled
+
+
+# Action -> roles allowed to perform it, in ROLE_ACTIONS order
+ACTION_ROLES = _action_roles()
+
+
+class Grant(NamedTuple):
+    """What one user currently holds: status, roles and the actions those roles allow."""
+    status: Optional[str]
+    roles: FrozenSet[str]
+    actions: FrozenSet[str]
+
+
+def user_roles(row: Dict[str, Any]) -> Tuple[str, ...]:
+    """A user's primary role followed by any roles granted with add_rbac_role."""
+    roles = [row["role"]] if row.get("role") else []
+    return tuple(roles + [r for r in row.get("additional_roles") or () if r not in roles])
+
+
+class Permissions:
+    """
+    Per-user Grants over the users table, built on first use and dropped by
+    Table.derived's on_change(key) whenever that user's row changes (role
+    grants, suspension, (re)activation, deactivation, rollback).
+
+    An authorization check is then one dict lookup plus one set membership
+    test instead of re-reading the user's row and role on every tool call.
+    """
+
+    def __init__(self, users: Dict[str, Any]):
+        self._users = users
+        self._grants: Dict[str, Optional[Grant]] = {}
+
+    def on_change(self, key: str) -> None:
+        self._grants.pop(key, None)
+
+    def grant(self, user_id: str) -> Optional[Grant]:
+        """The user's Grant, or None when there is no such user."""
+        try:
+            return self._grants[user_id]
+        except KeyError:
+            pass
+        row = peek_row(self._users, user_id)
+        grant = None
+        if row is not None:
+            roles = user_roles(row)
+            actions = frozenset(a for role in roles for a in ROLE_ACTIONS.get(role, ()))
+            grant = Grant(row.get("status"), frozenset(roles), actions)
+        self._grants[user_id] = grant
+        return grant
+
+    def can(self, user_id: str, action: str) -> bool:
+        """Whether the user is active and one of their roles allows `action`."""
+        grant = self.grant(user_id)
+        return grant is not None and grant.status == "active" and action in grant.actions
+
+
+def permissions(data: Dict[str, Any]) -> Permissions:
+    """The Permissions for data["users"] (cached on store tables)."""
+    return derived(data.get("users", {}), "permissions", Permissions)
@@ -0,0 +1,231 @@
+# Copyright Sierra
+# Columnar payroll reporting and chunked CSV/NDJSON export (SOP 17)
+
+import csv
+import io
+import json
+from typing import IO, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .data.store import keys_where, peek_row
+from .deduction_rates import effective_deductions
+from .intervals import payroll_run_index
+from .payroll_engine import approved_hours
+
+EXPORT_FORMATS = ("csv", "ndjson")
+
+# report_type -> (dimensions it can be grouped by, default grouping)
+REPORT_TYPES: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "payroll_period_summary": (
+        ("payroll_run_id", "period_start", "period_end", "status", "department", "employee_id"),
+        ("payroll_run_id", "period_start", "period_end", "department"),
+    ),
+    "deduction_summary": (
+        ("payroll_run_id", "department", "employee_id", "deduction_type", "method"),
+        ("deduction_type", "method"),
+    ),
+}
+
+# report_type -> (name of the fact-row count, summed measures); a distinct "employees" count is always added
+_MEASURES = {
+    "payroll_period_summary": ("line_items", ("approved_hours", "gross_pay", "total_deductions", "net_pay")),
+    "deduction_summary": ("deductions", ("amount",)),
+}
+
+
+class Report:
+    """
+    A grouped report held as columns (one NumPy array or list per column).
+
+    Rows are only materialized a slice at a time by rows()/chunks(), so an
+    export can be streamed to a file or paged out without building the whole
+    CSV/NDJSON text.
+    """
+
+    def __init__(self, columns: Sequence[str], values: Dict[str, Sequence[Any]]):
+        self.columns = list(columns)
+        self._values = values
+        self._size = len(values[self.columns[0]]) if self.columns else 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def rows(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+        """Rows [start, stop) as tuples of plain Python values."""
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return iter(())
+        sliced = [self._values[c][start:stop] for c in self.columns]
+        return zip(*(s.tolist() if isinstance(s, np.ndarray) else s for s in sliced))
+
+    def chunks(self, fmt: str = "csv", chunk_rows: int = 1000, first_chunk: int = 0) -> Iterator[str]:
+        """
+        The report rendered `chunk_rows` rows at a time. CSV output carries the
+        header in chunk 0 only, so the chunks concatenate into one file.
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid format. Must be one of {list(EXPORT_FORMATS)}")
+        start = first_chunk * chunk_rows
+        while start < self._size or (start == 0 and fmt == "csv"):
+            yield self._render(fmt, start, start + chunk_rows, header=start == 0)
+            start += chunk_rows
+
+    def _render(self, fmt: str, start: int, stop: int, header: bool) -> str:
+        out = io.StringIO()
+        if fmt == "csv":
+            writer = csv.writer(out, lineterminator="\n")
+            if header:
+                writer.writerow(self.columns)
+            writer.writerows(self.rows(start, stop))
+        else:
+            for row in self.rows(start, stop):
+                out.write(json.dumps(dict(zip(self.columns, row))))
+                out.write("\n")
+        return out.getvalue()
+
+    def write(self, stream: IO[str], fmt: str = "csv", chunk_rows: int = 1000) -> int:
+        """Stream the whole report to a text file object; returns the number of rows written."""
+        for chunk in self.chunks(fmt, chunk_rows):
+            stream.write(chunk)
+        return self._size
+
+
+def group_by(
+    keys: Dict[str, np.ndarray], measures: Dict[str, np.ndarray], employee_ids: np.ndarray, count: str = "rows"
+) -> Dict[str, np.ndarray]:
+    """
+    Columnar GROUP BY over fact columns of equal length.
+
+    Every key column is dictionary-encoded with np.unique, the code tuples are
+    deduplicated once, and each measure is summed with one np.bincount. Adds
+    "employees" (distinct employee_ids) and `count` (fact rows) per group.
+    Groups come out sorted by their key values.
+    """
+    n = len(employee_ids)
+    if n == 0:
+        return {name: np.array([], dtype=object) for name in [*keys, "employees", count, *measures]}
+    if keys:
+        uniques, codes = zip(*(np.unique(column, return_inverse=True) for column in keys.values()))
+        groups, inverse = np.unique(np.stack(codes, axis=1), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        out = {name: unique[groups[:, i]] for i, (name, unique) in enumerate(zip(keys, uniques))}
+    else:
+        inverse = np.zeros(n, dtype=np.int64)
+        out = {}
+    size = int(inverse.max()) + 1
+
+    _, employee_codes = np.unique(employee_ids, return_inverse=True)
+    pairs = np.unique(np.stack([inverse, employee_codes.reshape(-1)], axis=1), axis=0)
+    out["employees"] = np.bincount(pairs[:, 0], minlength=size)
+    out[count] = np.bincount(inverse, minlength=size)
+    for name, values in measures.items():
+        out[name] = np.round(np.bincount(inverse, weights=values, minlength=size), 2)
+    return out
+
+
+def _line_items(
+    data: Dict[str, Any], period_start: str, period_end: str,
+    department: Optional[str], employee_id: Optional[str]
+) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]], List[Optional[str]]]]:
+    """(run, line items, departments) for each run overlapping the window, in run id order."""
+    index = payroll_run_index(data)
+    runs = data.get("payroll_runs", {})
+    line_items = data.get("payroll_line_items", {})
+    employees = data.get("employees", {})
+    for run_id in sorted(index.overlapping(index.groups(), period_start, period_end), key=int):
+        run = peek_row(runs, run_id)
+        if employee_id is not None:
+            keys = [k for k in keys_where(line_items, "employee_id", employee_id)
+                    if peek_row(line_items, k).get("payroll_run_id") == run_id]
+        else:
+            keys = keys_where(line_items, "payroll_run_id", run_id)
+        items, departments = [], []
+        for key in sorted(keys, key=int):
+            item = peek_row(line_items, key)
+            dept = (peek_row(employees, item.get("employee_id")) or {}).get("department")
+            if department is None or dept == department:
+                items.append(item)
+                departments.append(dept)
+        if items:
+            yield run, items, departments
+
+
+def _payroll_facts(data, period_start, period_end, department, employee_id):
+    columns: Dict[str, list] = {c: [] for c in REPORT_TYPES["payroll_period_summary"][0]}
+    measures: Dict[str, list] = {m: [] for m in _MEASURES["payroll_period_summary"][1]}
+    for run, items, departments in _line_items(data, period_start, period_end, department, employee_id):
+        ids = [item.get("employee_id") for item in items]
+        position = {e: i for i, e in enumerate(dict.fromkeys(ids))}
+        hours = approved_hours(data, position, run["period_start"], run["period_end"])
+        columns["payroll_run_id"] += [run["payroll_run_id"]] * len(items)
+        columns["period_start"] += [run["period_start"]] * len(items)
+        columns["period_end"] += [run["period_end"]] * len(items)
+        columns["status"] += [run.get("status")] * len(items)
+        columns["department"] += departments
+        columns["employee_id"] += ids
+        measures["approved_hours"] += [hours[position[e]] for e in ids]
+        for field in ("gross_pay", "total_deductions", "net_pay"):
+            measures[field] += [float(item.get(field) or 0.0) for item in items]
+    return columns, measures
+
+
+def _deduction_facts(data, period_start, period_end, department, employee_id):
+    # Per-deduction amounts are derived from each line item's gross_pay (before the cap at gross)
+    columns: Dict[str, list] = {c: [] for c in REPORT_TYPES["deduction_summary"][0]}
+    amounts: List[float] = []
+    compiled = effective_deductions(data)
+    for run, items, departments in _line_items(data, period_start, period_end, department, employee_id):
+        for item, dept in zip(items, departments):
+            gross = float(item.get("gross_pay") or 0.0)
+            for segment in compiled.segments(item.get("employee_id")):
+                if segment.start_date > run["period_end"] or segment.end_date < run["period_start"]:
+                    continue
+                columns["payroll_run_id"].append(run["payroll_run_id"])
+                columns["department"].append(dept)
+                columns["employee_id"].append(item.get("employee_id"))
+                columns["deduction_type"].append(segment.deduction_type)
+                columns["method"].append(segment.method)
+                amounts.append(gross * segment.rate / 100.0 if segment.method == "percent" else segment.rate)
+    return columns, {"amount": amounts}
+
+
+def _key_column(values: List[Any]) -> np.ndarray:
+    # Numeric ids group (and so sort) as integers; None sorts with the strings as ""
+    if values and all(isinstance(v, str) and v.isdigit() for v in values):
+        return np.array([int(v) for v in values], dtype=np.int64)
+    return np.array(["" if v is None else v for v in values], dtype=object)
+
+
+_FACTS = {"payroll_period_summary": _payroll_facts, "deduction_summary": _deduction_facts}
+
+
+def build_report(
+    data: Dict[str, Any], report_type: str, period_start: str, period_end: str,
+    group: Optional[Sequence[str]] = None, department: Optional[str] = None, employee_id: Optional[str] = None
+) -> Report:
+    """
+    Aggregate one SOP 17 report over the payroll runs overlapping [period_start, period_end].
+
+    Args:
+        report_type: payroll_period_summary or deduction_summary.
+        group: dimensions to group by (see REPORT_TYPES); the report's default when omitted.
+        department, employee_id: optional filters.
+    """
+    if report_type not in REPORT_TYPES:
+        raise ValueError(f"Invalid report_type. Must be one of {list(REPORT_TYPES)}")
+    dimensions, default = REPORT_TYPES[report_type]
+    group = list(default if group is None else group)
+    unknown = [g for g in group if g not in dimensions]
+    if unknown or len(set(group)) != len(group):
+        raise ValueError(f"group_by must be distinct values from {list(dimensions)}")
+
+    columns, measures = _FACTS[report_type](data, period_start, period_end, department, employee_id)
+    keys = {g: _key_column(columns[g]) for g in group}
+    employees = np.array(columns["employee_id"], dtype=object)
+    count = _MEASURES[report_type][0]
+    values = group_by(keys, {m: np.asarray(v, dtype=float) for m, v in measures.items()}, employees, count)
+    for g in group:
+        if values[g].dtype.kind == "i":
+            values[g] = values[g].astype(str).astype(object)
+    return Report(group + ["employees", count, *measures], values)
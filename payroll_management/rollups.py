@@ -0,0 +1,116 @@
+# Copyright Sierra
+# Per-(payroll_run_id, department) payroll totals, maintained incrementally
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .data.store import derived, peek_items, peek_row
+
+ROLLUP_FIELDS = ("gross_pay", "total_deductions", "net_pay")
+
+
+def _cents(value: Any) -> int:
+    return int(round(float(value or 0.0) * 100))
+
+
+class DepartmentRollups:
+    """
+    Gross/deductions/net totals of payroll_line_items per (payroll_run_id, department).
+
+    Kept on the payroll_line_items table (see store.Table.derived), with a
+    listener on the employees table for department moves. Each line item's
+    contribution is remembered, so a created, updated, corrected or deleted
+    line item adjusts one rollup by its difference, and an employee changing
+    department moves only that employee's line items. Sums are held in
+    integer cents, so totals never drift however often they are adjusted.
+    """
+
+    def __init__(self, line_items: Dict[str, Any], employees: Dict[str, Any]):
+        self._line_items = line_items
+        self._employees = employees
+        # payroll_run_id -> department -> [line_items, gross, deductions, net] (amounts in cents)
+        self._totals: Dict[str, Dict[Optional[str], List[int]]] = {}
+        # line_item_id -> (payroll_run_id, employee_id, amounts in cents) currently counted
+        self._items: Dict[str, Tuple[str, str, Tuple[int, ...]]] = {}
+        self._by_employee: Dict[str, Set[str]] = {}
+        self._departments: Dict[str, Optional[str]] = {key: row.get("department") for key, row in peek_items(employees)}
+        for key, row in peek_items(line_items):
+            self._add(key, row)
+
+    def _apply(self, run_id: str, department: Optional[str], amounts: Tuple[int, ...], sign: int) -> None:
+        run = self._totals.setdefault(run_id, {})
+        totals = run.setdefault(department, [0, 0, 0, 0])
+        totals[0] += sign
+        for i, amount in enumerate(amounts, 1):
+            totals[i] += sign * amount
+        if totals[0] == 0:
+            del run[department]
+            if not run:
+                del self._totals[run_id]
+
+    def _add(self, key: str, row: Dict[str, Any]) -> None:
+        run_id, employee_id = row.get("payroll_run_id"), row.get("employee_id")
+        if run_id is None:
+            return
+        amounts = tuple(_cents(row.get(field)) for field in ROLLUP_FIELDS)
+        self._items[key] = (run_id, employee_id, amounts)
+        self._by_employee.setdefault(employee_id, set()).add(key)
+        self._apply(run_id, self._departments.get(employee_id), amounts, 1)
+
+    def on_change(self, key: str) -> None:
+        """A payroll_line_items row changed."""
+        previous = self._items.pop(key, None)
+        if previous is not None:
+            run_id, employee_id, amounts = previous
+            self._by_employee[employee_id].discard(key)
+            self._apply(run_id, self._departments.get(employee_id), amounts, -1)
+        row = peek_row(self._line_items, key)
+        if row is not None:
+            self._add(key, row)
+
+    def employee_changed(self, employee_id: str) -> None:
+        """An employees row changed: move its line items if the department did."""
+        row = peek_row(self._employees, employee_id)
+        department = row.get("department") if row is not None else None
+        previous = self._departments.get(employee_id)
+        if department == previous:
+            return
+        self._departments[employee_id] = department
+        for key in self._by_employee.get(employee_id, ()):
+            run_id, _, amounts = self._items[key]
+            self._apply(run_id, previous, amounts, -1)
+            self._apply(run_id, department, amounts, 1)
+
+    def rollup(self, payroll_run_id: str, department: Optional[str]) -> Dict[str, Any]:
+        """Totals of one (run, department); zeros when it has no line items."""
+        totals = self._totals.get(payroll_run_id, {}).get(department, (0, 0, 0, 0))
+        return {
+            "payroll_run_id": payroll_run_id,
+            "department": department,
+            "line_items": totals[0],
+            **{field: totals[i] / 100.0 for i, field in enumerate(ROLLUP_FIELDS, 1)},
+        }
+
+    def departments(self, payroll_run_id: str) -> List[Optional[str]]:
+        """Departments with line items in the run (employees without one last, as None)."""
+        return sorted(self._totals.get(payroll_run_id, ()), key=lambda d: (d is None, d or ""))
+
+
+class _EmployeeListener:
+    """Forwards employees-table changes to the DepartmentRollups built over it."""
+
+    def __init__(self, rollups: DepartmentRollups):
+        self.rollups = rollups
+
+    def on_change(self, key: str) -> None:
+        self.rollups.employee_changed(key)
+
+
+def department_rollups(data: Dict[str, Any]) -> DepartmentRollups:
+    """The DepartmentRollups for data (cached on store tables)."""
+    employees = data.get("employees", {})
+    rollups = derived(
+        data.get("payroll_line_items", {}), "department_rollups", lambda table: DepartmentRollups(table, employees)
+    )
+    listener = derived(employees, "department_rollups", lambda table: _EmployeeListener(rollups))
+    listener.rollups = rollups
+    return rollups
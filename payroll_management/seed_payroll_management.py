@@ -8,17 +8,32 @@ Seeding script for payroll_management domain.
 - Each table has the same number of rows (N), configurable below.
 - Deterministic via fixed random seed.
 
+Scale mode (--scale) generates production-sized datasets for load testing:
+- Row counts per table (--rows employees=100000,timesheets=10000000).
+- Rows are built in fixed-size shards, each seeded from (RANDOM_SEED, table,
+  shard), on a process pool; output is identical for any --workers value.
+- Each table is streamed to disk shard by shard (one row per line), so peak
+  memory is bounded by the in-flight shards, not the table size.
+- FKs stay valid (children point at parents round-robin) and approvers are
+  drawn from the same role pools as the default mode.
+
 Run:
   pip install Faker
   python3 seed_payroll_management.py
+  python3 seed_payroll_management.py --scale --rows employees=100000,timesheets=10000000 --out-dir /tmp/payroll
 
 Output:
   ./data/*.json (dict-of-objects where key == primary id string)
 """
 
+import argparse
 import json
+import multiprocessing
 import os
 import random
+import sys
+import zlib
+from collections import deque
 from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 
@@ -52,6 +67,23 @@ AUDIT_ACTION = ["create", "read", "update", "delete", "approve", "reject", "logi
 VENDOR_STATUS = ["active", "inactive", "blocked"]
 PAYMENT_STATUS = ["submitted", "approved", "rejected", "paid", "failed"]
 
+TABLE_NAMES = [
+    "users", "employees", "timesheets", "payroll_runs", "payroll_line_items",
+    "deductions", "employee_deductions", "payroll_corrections", "benefits_plans",
+    "employee_benefits", "expense_reimbursements", "leave_requests", "approvals",
+    "audit_logs", "vendors", "vendor_payments",
+]
+
+parser = argparse.ArgumentParser(description="Seed the payroll_management JSON tables.")
+parser.add_argument("--scale", action="store_true", help="sharded, parallel, streaming generation")
+parser.add_argument("--rows", default="", help="per-table row counts, e.g. employees=100000,timesheets=10000000")
+parser.add_argument("--default-rows", type=int, default=N, help="rows for tables not listed in --rows (scale mode)")
+parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (scale mode)")
+parser.add_argument("--shard-size", type=int, default=50_000, help="rows per shard (scale mode)")
+parser.add_argument("--out-dir", default=OUT_DIR, help="output directory")
+ARGS = parser.parse_args() if __name__ == "__main__" else parser.parse_args([])
+OUT_DIR = ARGS.out_dir
+
 # ---------------------- SETUP ----------------------
 
 random.seed(RANDOM_SEED)
@@ -80,6 +112,358 @@ def pick(seq):
 def cycle_pick(seq, idx):
     return seq[idx % len(seq)]
 
+def role_distribution_for(n: int):
+    # Ensure enough of each elevated role exists for valid approvals
+    roles = (
+        ["employee"] * max(8, n // 2) +
+        ["manager"] * max(4, n // 6) +
+        ["payroll_administrator"] * max(3, n // 10) +
+        ["finance_officer"] * max(3, n // 10) +
+        ["hr_director"] * max(2, n // 12) +
+        ["it_administrator"] * max(2, n // 12) +
+        ["compliance_officer"] * max(2, n // 12)
+    )
+    # Truncate/expand to exactly n
+    while len(roles) < n:
+        roles.append("employee")
+    return roles[:n]
+
+# ---------------------- SCALE MODE ----------------------
+# Each row is a function of (row index, shard rng, shard faker, context), so any shard
+# can be built independently. Day offsets wrap so timestamps stay within the calendar.
+
+SCALE_CTX = {}  # counts + role pools; set in the parent before the pool forks
+_SCALE_FAKE = None
+
+def _ref(i: int, table: str) -> str:
+    # Round-robin parent id for child row i
+    return id_str(((i - 1) % SCALE_CTX["counts"][table]) + 1)
+
+def _pool_pick(rng, role, fallback=None):
+    pool = SCALE_CTX["pools"].get(role)
+    return rng.choice(pool) if pool else fallback
+
+def _scale_salary(emp_i: int) -> float:
+    # Deterministic per employee, so employee_benefits can be built in another shard
+    return to_money(random.Random(RANDOM_SEED * 1_000_003 + emp_i).randint(60000, 140000))
+
+def _scale_deduction(ded_i: int):
+    method = cycle_pick(CALC_METHOD, ded_i + 7)
+    rate = 10.0 + (ded_i % 5) if method == "percent" else 25.0 + (ded_i % 20)
+    return method, float(rate)
+
+def _scale_row(table: str, i: int, rng, fk):
+    rid = id_str(i)
+    day = i % 365
+    if table == "users":
+        created_at = ts_offset(hours=i % 8760)
+        return {
+            "user_id": rid,
+            "email": f"user{i}.{fk.user_name()}@{fk.free_email_domain()}",
+            "full_name": fk.name(),
+            "role": SCALE_CTX["roles"][i - 1],
+            "status": "active",
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "employees":
+        created_at = ts_offset(days=(i // 2) % 365)
+        return {
+            "employee_id": rid,
+            "user_id": rid,
+            "manager_user_id": _pool_pick(rng, "manager"),
+            "department": rng.choice(["Engineering", "HR", "Finance", "Operations", "Sales", "Support"]),
+            "hire_date": (datetime(2024, 1, 1) + timedelta(days=(i * 3) % 600)).date().isoformat(),
+            "employment_status": rng.choice(["active", "on_leave", "terminated"]) if i % 11 == 0 else "active",
+            "salary_base": _scale_salary(i),
+            "pay_frequency": rng.choice(PAY_FREQ),
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 3),
+        }
+    if table == "timesheets":
+        # k-th sheet of each employee lands on the k-th day, so no two overlap
+        work_day = datetime(2025, 8, 1) + timedelta(days=(i - 1) // SCALE_CTX["counts"]["employees"])
+        created_at = (work_day + timedelta(hours=18)).isoformat()
+        return {
+            "timesheet_id": rid,
+            "employee_id": _ref(i, "employees"),
+            "work_date": work_day.date().isoformat(),
+            "clock_in": (work_day + timedelta(hours=9)).isoformat(),
+            "clock_out": (work_day + timedelta(hours=17)).isoformat(),
+            "total_hours": 8.0,
+            "status": cycle_pick(TIMESHEET_STATUS, i),
+            "approver_user_id": _pool_pick(rng, "payroll_administrator"),
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "payroll_runs":
+        period_start = (datetime(2025, 8, 1) + timedelta(days=((i - 1) * 14) % 3640)).date()
+        status = cycle_pick(PAYROLL_RUN_STATUS, i)
+        created_at = ts_offset(days=40 + day)
+        return {
+            "payroll_run_id": rid,
+            "period_start": period_start.isoformat(),
+            "period_end": (period_start + timedelta(days=13)).isoformat(),
+            "status": status,
+            "initiated_by_user_id": _pool_pick(rng, "payroll_administrator", id_str(1)),
+            "approved_by_user_id": _pool_pick(rng, "finance_officer") if status in ("approved", "paid") else None,
+            "processed_at": FIXED_PROCESSED_TS.isoformat() if status in ("approved", "paid") else None,
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 2),
+        }
+    if table == "payroll_line_items":
+        gross = to_money(rng.randint(1500, 6000))
+        deductions_total = to_money(gross * rng.uniform(0.1, 0.3))
+        created_at = ts_offset(days=41 + day)
+        return {
+            "line_item_id": rid,
+            "payroll_run_id": _ref(i, "payroll_runs"),
+            "employee_id": _ref(i, "employees"),
+            "gross_pay": gross,
+            "total_deductions": deductions_total,
+            "net_pay": to_money(gross - deductions_total),
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "deductions":
+        dtype = cycle_pick(DEDUCTION_TYPE, i)
+        method, rate = _scale_deduction(i)
+        created_at = ts_offset(days=10 + day)
+        return {
+            "deduction_id": rid,
+            "name": f"{dtype.upper()}_{rid}",
+            "deduction_type": dtype,
+            "method": method,
+            "rate": rate,
+            "active": True if i % 9 != 0 else False,
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "employee_deductions":
+        did = _ref(i, "deductions")
+        method, rate = _scale_deduction(int(did))
+        end_date = None if i % 8 else (datetime(2026, 1, 1) + timedelta(days=day)).date().isoformat()
+        created_at = ts_offset(days=15 + day)
+        return {
+            "employee_deduction_id": rid,
+            "employee_id": _ref(i, "employees"),
+            "deduction_id": did,
+            "method": method,
+            "rate": rate,
+            "start_date": (datetime(2025, 1, 1) + timedelta(days=(i * 5) % 365)).date().isoformat(),
+            "end_date": end_date,
+            "active": True if not end_date else False,
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "payroll_corrections":
+        field_changed = rng.choice(["gross_pay", "total_deductions", "net_pay"])
+        old_value = str(round(rng.uniform(1000, 6000), 2))
+        created_at = ts_offset(days=45 + day)
+        return {
+            "correction_id": rid,
+            "payroll_run_id": _ref(i, "payroll_runs"),
+            "employee_id": _ref(i, "employees"),
+            "reason": f"Adjustment for {field_changed}",
+            "field_changed": field_changed,
+            "old_value": old_value,
+            "new_value": str(round(float(old_value) * rng.uniform(0.95, 1.05), 2)),
+            "approved_by_user_id": _pool_pick(rng, "finance_officer"),
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 2),
+        }
+    if table == "benefits_plans":
+        ptype = cycle_pick(BENEFIT_PLAN_TYPE, i)
+        end_date = None if i % 7 else datetime(2026, 12, 31).date().isoformat()
+        created_at = ts_offset(days=5 + day)
+        return {
+            "plan_id": rid,
+            "name": f"{ptype.capitalize()} Plan {rid}",
+            "plan_type": ptype,
+            "status": "active" if not end_date else "inactive",
+            "start_date": datetime(2025, 1, 1).date().isoformat(),
+            "end_date": end_date,
+            "employer_contribution_pct": float(round(rng.uniform(2.0, 6.0), 3)),
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "employee_benefits":
+        emp_id = _ref(i, "employees")
+        contribution_pct = float(round(rng.uniform(0.0, 10.0), 3))
+        created_at = ts_offset(days=20 + day)
+        return {
+            "employee_benefit_id": rid,
+            "employee_id": emp_id,
+            "plan_id": _ref(i, "benefits_plans"),
+            "status": cycle_pick(LIFECYCLE_STATUS, i),
+            "contribution_pct": contribution_pct,
+            "contribution_amount": float(to_money(contribution_pct / 100.0 * _scale_salary(int(emp_id)) / 12.0)),
+            "beneficiary": fk.name() if rng.random() < 0.6 else "",
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "expense_reimbursements":
+        status = cycle_pick(REIMBURSEMENT_STATUS, i)
+        created_at = ts_offset(days=22 + day)
+        return {
+            "reimbursement_id": rid,
+            "employee_id": _ref(i, "employees"),
+            "amount": to_money(rng.uniform(20, 500)),
+            "description": f"Reimbursement for {fk.word()}",
+            "status": status,
+            "approved_by_user_id": _pool_pick(rng, "finance_officer") if status in ("approved", "paid") else None,
+            "payment_date": (datetime(2025, 9, 20) + timedelta(days=day)).date().isoformat() if status == "paid" else None,
+            "receipt_file_path": f"/receipts/{rid}.pdf" if rng.random() < 0.8 else "",
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "leave_requests":
+        start = datetime(2025, 10, 1) + timedelta(days=day)
+        end = start + timedelta(days=rng.randint(1, 5))
+        requested_days = (end - start).days + 1
+        status = cycle_pick(LIFECYCLE_STATUS, i + 3)
+        created_at = ts_offset(days=25 + day)
+        return {
+            "leave_request_id": rid,
+            "employee_id": _ref(i, "employees"),
+            "leave_type": cycle_pick(LEAVE_TYPE, i),
+            "start_date": start.date().isoformat(),
+            "end_date": end.date().isoformat(),
+            "requested_days": requested_days,
+            "status": status,
+            "remaining_balance": max(0, 15 - requested_days - (i % 5)),
+            "approved_by_user_id": _pool_pick(rng, "manager") if status != "pending" else None,
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "approvals":
+        action = cycle_pick(["payroll_run", "reimbursement", "benefits_plan"], i)
+        if action == "payroll_run":
+            approver = _pool_pick(rng, "finance_officer") or _pool_pick(rng, "payroll_administrator", id_str(1))
+        elif action == "reimbursement":
+            approver = _pool_pick(rng, "finance_officer", id_str(1))
+        else:
+            approver = _pool_pick(rng, "hr_director") or _pool_pick(rng, "finance_officer", id_str(1))
+        status = cycle_pick(APPROVAL_STATUS, i)
+        created_at = ts_offset(days=27 + day)
+        return {
+            "approval_id": rid,
+            "action": action,
+            "requested_by_user_id": _ref(i, "users"),
+            "approver_user_id": approver,
+            "status": status,
+            "notes": f"{action} approval {status}",
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "vendors":
+        created_at = ts_offset(days=8 + day)
+        return {
+            "vendor_id": rid,
+            "name": f"{fk.company()}",
+            "tin": f"{rng.randint(10_000_000, 99_999_999)}",
+            "bank_account": f"ACCT-{rng.randint(10000000, 99999999)}",
+            "status": cycle_pick(VENDOR_STATUS, i),
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "vendor_payments":
+        status = cycle_pick(PAYMENT_STATUS, i)
+        created_at = ts_offset(days=12 + day)
+        return {
+            "vendor_payment_id": rid,
+            "vendor_id": _ref(i, "vendors"),
+            "invoice_no": f"INV-{2025}{i:03d}",
+            "amount": to_money(rng.uniform(200, 20000)),
+            "status": status,
+            "approved_by_user_id": _pool_pick(rng, "finance_officer") if status in ("approved", "paid") else None,
+            "paid_at": FIXED_PROCESSED_TS.date().isoformat() if status == "paid" else None,
+            "created_at": created_at,
+            "updated_at": ensure_updated_after(created_at, 1),
+        }
+    if table == "audit_logs":
+        action = cycle_pick(AUDIT_ACTION, i)
+        return {
+            "audit_id": rid,
+            "user_id": _ref(i, "users"),
+            "table_name": rng.choice([
+                "payroll_runs", "payroll_line_items", "employee_deductions",
+                "expense_reimbursements", "leave_requests", "vendor_payments",
+                "benefits_plans", "employee_benefits", "timesheets"
+            ]),
+            "action": action,
+            "record_id": _ref(i, "users"),
+            "field": None if action in ("create", "delete") else "status",
+            "old_value": None if action in ("create", "delete") else "pending",
+            "new_value": None if action in ("create", "delete") else cycle_pick(["approved", "paid", "draft"], i),
+            "timestamp": ts_offset(days=50 + day),
+        }
+    raise ValueError(f"Unknown table {table}")
+
+def _scale_shard(task):
+    """Build rows [start, stop) of one table; returns them as JSON object members, one per line."""
+    global _SCALE_FAKE
+    table, shard, start, stop = task
+    seed = (RANDOM_SEED * 1_000_003 + zlib.crc32(table.encode()) * 7_919 + shard) % (2 ** 63)
+    rng = random.Random(seed)
+    if _SCALE_FAKE is None:
+        _SCALE_FAKE = Faker()
+    _SCALE_FAKE.seed_instance(seed)
+    return ",\n".join(
+        f"  {json.dumps(id_str(i))}: {json.dumps(_scale_row(table, i, rng, _SCALE_FAKE), ensure_ascii=False)}"
+        for i in range(start, stop)
+    )
+
+def seed_scale(counts, out_dir, workers, shard_size):
+    """Stream every table to out_dir/<table>.json in deterministic shards."""
+    # Employees are tied 1:1 to users (employee i -> user i), as in the default mode
+    counts["users"] = max(counts["users"], counts["employees"])
+    roles = role_distribution_for(counts["users"])
+    random.Random(RANDOM_SEED).shuffle(roles)
+    pools = {}
+    for i, role in enumerate(roles, start=1):
+        pools.setdefault(role, []).append(id_str(i))
+    SCALE_CTX.update(counts=counts, roles=roles, pools=pools)
+
+    # Forked workers inherit SCALE_CTX; without fork, build shards in this process
+    use_pool = workers > 1 and "fork" in multiprocessing.get_all_start_methods()
+    pool = multiprocessing.get_context("fork").Pool(workers) if use_pool else None
+    try:
+        for table in TABLE_NAMES:
+            tasks = [
+                (table, shard, start, min(start + shard_size, counts[table] + 1))
+                for shard, start in enumerate(range(1, counts[table] + 1, shard_size))
+            ]
+            path = os.path.join(out_dir, f"{table}.json")
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write("{")
+                # Keep at most 2 shards per worker in flight, written back in shard order
+                pending = deque()
+                for n, task in enumerate(tasks):
+                    pending.append(pool.apply_async(_scale_shard, (task,)) if pool else task)
+                    while pending and (len(pending) > 2 * workers or n == len(tasks) - 1):
+                        head = pending.popleft()
+                        chunk = head.get() if pool else _scale_shard(head)
+                        f.write(("\n" if f.tell() == 1 else ",\n") + chunk)
+                f.write("\n}\n")
+            os.replace(path + ".tmp", path)
+            print(f"  {table}: {counts[table]} rows")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+if ARGS.scale:
+    row_counts = {table: ARGS.default_rows for table in TABLE_NAMES}
+    for item in filter(None, ARGS.rows.split(",")):
+        table, _, count = item.partition("=")
+        if table.strip() not in row_counts:
+            parser.error(f"unknown table in --rows: {table}")
+        row_counts[table.strip()] = int(count)
+    seed_scale(row_counts, OUT_DIR, max(1, ARGS.workers), max(1, ARGS.shard_size))
+    print(f"✅ Seeded {len(TABLE_NAMES)} tables to: {OUT_DIR}")
+    sys.exit(0)
+
 # ---------------------- TABLE CONTAINERS ----------------------
 
 users = {}
@@ -100,20 +484,7 @@ vendors = {}
 vendor_payments = {}
 
 # ---------------------- USERS ----------------------
-# Ensure enough of each elevated role exists for valid approvals
-role_distribution = (
-    ["employee"] * max(8, N // 2) +
-    ["manager"] * max(4, N // 6) +
-    ["payroll_administrator"] * max(3, N // 10) +
-    ["finance_officer"] * max(3, N // 10) +
-    ["hr_director"] * max(2, N // 12) +
-    ["it_administrator"] * max(2, N // 12) +
-    ["compliance_officer"] * max(2, N // 12)
-)
-# Truncate/expand to exactly N
-while len(role_distribution) < N:
-    role_distribution.append("employee")
-role_distribution = role_distribution[:N]
+role_distribution = role_distribution_for(N)
 random.shuffle(role_distribution)
 
 for i in range(1, N + 1):
@@ -4,7 +4,10 @@ import sys
 import importlib.util
 
 def load_by_path(module_name: str, file_path: str):
-    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    # Load as a package so data/__init__.py can import its sibling modules
+    spec = importlib.util.spec_from_file_location(
+        module_name, file_path, submodule_search_locations=[os.path.dirname(file_path)]
+    )
     if spec is None or spec.loader is None:
         raise ImportError(f"Cannot load module {module_name} from {file_path}")
     mod = importlib.util.module_from_spec(spec)
@@ -0,0 +1,10 @@
+# Shared fixtures for the payroll_management tests (run inside a tau-bench checkout)
+import pytest
+
+from tau_bench.envs.payroll_management.data import load_data
+
+
+@pytest.fixture
+def data():
+    """A fresh TableStore over the shipped JSON data."""
+    return load_data()
@@ -0,0 +1,57 @@
+import pytest
+
+from tau_bench.envs.payroll_management.approval_queue import APPROVAL_ACTIONS, approval_queues
+
+
+def brute(data, approver_user_id=None, action=None):
+    return [
+        a["approval_id"] for a in sorted(data["approvals"].values(), key=lambda a: (a["created_at"], a["approval_id"]))
+        if a["status"] == "pending"
+        and approver_user_id in (None, a["approver_user_id"])
+        and action in (None, a["action"])
+    ]
+
+
+def assert_matches_scan(data):
+    queues = approval_queues(data)
+    approvers = {a["approver_user_id"] for a in data["approvals"].values()} | {None}
+    for approver_user_id in approvers:
+        for action in APPROVAL_ACTIONS + (None,):
+            expected = brute(data, approver_user_id, action)
+            assert queues.pending(approver_user_id, action, limit=10**6) == expected
+            assert queues.count(approver_user_id, action) == len(expected)
+
+
+def add_unassigned(data, action):
+    key = str(max(map(int, data["approvals"])) + 1)
+    data["approvals"][key] = {
+        "approval_id": key, "action": action, "requested_by_user_id": "1", "approver_user_id": None,
+        "status": "pending", "notes": None, "created_at": "2025-09-01T00:00:00", "updated_at": "2025-09-01T00:00:00",
+    }
+    return key
+
+
+@pytest.mark.parametrize("action", APPROVAL_ACTIONS)
+def test_unassigned_approval_is_counted_once(data, action):
+    queues = approval_queues(data)
+    before = queues.count(action=action)
+    key = add_unassigned(data, action)
+    assert queues.count(action=action) == before + 1
+    assert queues.pending(action=action, limit=10**6).count(key) == 1
+    assert_matches_scan(data)
+
+    data["approvals"][key] = dict(data["approvals"][key], status="approved")
+    assert queues.count(action=action) == before
+    assert_matches_scan(data)
+
+
+def test_rollback_and_reset_restore_the_queues(data):
+    approval_queues(data)
+    with pytest.raises(KeyError):
+        with data.transaction():
+            add_unassigned(data, "payroll_run")
+            raise KeyError("rollback")
+    assert_matches_scan(data)
+    add_unassigned(data, "reimbursement")
+    data.reset()
+    assert_matches_scan(data)
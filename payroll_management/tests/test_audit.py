@@ -0,0 +1,72 @@
+from tau_bench.envs.payroll_management.data.audit import AuditLog
+from tau_bench.envs.payroll_management.tools.common import write_audit
+from tau_bench.envs.payroll_management.tools.interface_4 import GenPayrollLineItems
+
+
+def brute(logs, **filters):
+    return sorted(
+        (row["timestamp"] or "", int(key)) for key, row in logs.items()
+        if all(row[col] == value for col, value in filters.items())
+    )
+
+
+def indexed(logs, **filters):
+    total, rows = logs.query(limit=10 ** 6, **filters)
+    assert total == len(rows)
+    return [(row["timestamp"] or "", int(row["audit_id"])) for row in rows]
+
+
+def test_query_matches_scan(data):
+    logs = data["audit_logs"]
+    for filters in ({}, {"user_id": "7"}, {"table_name": "payroll_runs"}, {"action": "update", "user_id": "2"}):
+        assert indexed(logs, **filters) == brute(logs, **filters)
+
+
+def test_nested_rollback_then_reset_drops_postings(data):
+    GenPayrollLineItems.invoke(data, payroll_run_id="4", acting_user_id="7")
+    try:
+        with data.transaction():
+            write_audit(data, "7", "payroll_runs", "update", "4")
+            raise KeyError
+    except KeyError:
+        pass
+    data.reset()
+    logs = data["audit_logs"]
+    assert all(row is not None for row in logs.query(user_id="7", limit=10 ** 6)[1])
+    assert indexed(logs, user_id="7") == brute(logs, user_id="7")
+    assert indexed(logs, table_name="payroll_line_items") == brute(logs, table_name="payroll_line_items")
+
+
+def test_rollback_inside_transaction_keeps_earlier_appends(data):
+    logs = data["audit_logs"]
+    with data.transaction():
+        write_audit(data, "7", "payroll_runs", "update", "1")
+        try:
+            with data.transaction():
+                write_audit(data, "7", "payroll_runs", "update", "2")
+                raise KeyError
+        except KeyError:
+            pass
+    assert [row["record_id"] for row in logs.query(user_id="7", table_name="payroll_runs")[1]][-1:] == ["1"]
+    assert indexed(logs, user_id="7") == brute(logs, user_id="7")
+
+
+def test_overlay_shares_the_baseline_and_resets_to_it(data):
+    rows = dict(data["audit_logs"].items())
+    rows["1"] = dict(rows["1"], note="extra field")
+    baseline = AuditLog(rows)
+    logs = AuditLog(baseline=baseline)
+    assert logs._base_columns is baseline._base_columns and logs._base_indexes is baseline._base_indexes
+
+    for step in range(1500):
+        logs.append(str(step % 3 + 5), "payroll_runs", "update", str(step % 7), timestamp=f"2025-09-{step % 28 + 1:02d}")
+    logs["9999"] = dict(rows["2"], audit_id="9999", user_id="7", note="appended")
+    assert len(logs) == len(rows) + 1501 and "9999" in logs and logs["1"]["note"] == "extra field"
+    assert list(logs)[:len(rows)] == list(rows)
+    for filters in ({"user_id": "7"}, {"table_name": "payroll_runs", "record_id": "3"}):
+        assert indexed(logs, **filters) == brute(logs, **filters)
+    assert dict(baseline.items()) == rows
+
+    logs.reset()
+    assert dict(logs.items()) == rows and "9999" not in logs and logs.next_id() == baseline.next_id()
+    assert indexed(logs, user_id="7") == brute(logs, user_id="7")
@@ -0,0 +1,27 @@
+import json
+
+import pytest
+
+from tau_bench.envs.payroll_management.tools.interface_3 import OnboardEmployee
+
+HR_DIRECTOR = "12"
+
+
+@pytest.fixture
+def new_user(data):
+    key = data["users"].next_id()
+    data["users"][key] = {"user_id": key, "email": f"new{key}@example.org", "role": "employee", "status": "active"}
+    return key
+
+
+def test_basic_format_hire_date_is_stored_canonical(data, new_user):
+    employee = json.loads(OnboardEmployee.invoke(data, user_id=new_user, department="Sales", hire_date="20251101",
+                                                 acting_user_id=HR_DIRECTOR))
+    assert employee["hire_date"] == data["employees"][employee["employee_id"]]["hire_date"] == "2025-11-01"
+
+
+@pytest.mark.parametrize("hire_date", ["20250901", "2025-02-30", "2025/11/01", ""])
+def test_past_or_malformed_hire_date_is_rejected(data, new_user, hire_date):
+    with pytest.raises(ValueError, match="hire_date"):
+        OnboardEmployee.invoke(data, user_id=new_user, department="Sales", hire_date=hire_date,
+                               acting_user_id=HR_DIRECTOR)
@@ -0,0 +1,251 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from tau_bench.envs.payroll_management.date_index import timesheet_dates
+from tau_bench.envs.payroll_management.deduction_rates import effective_deductions, resolve
+from tau_bench.envs.payroll_management.email_index import email_index, normalize_email
+from tau_bench.envs.payroll_management.intervals import epoch_seconds, payroll_run_index, timesheet_index
+from tau_bench.envs.payroll_management.leave_ledger import LEAVE_TYPES, leave_ledger, requested_days
+from tau_bench.envs.payroll_management.org_chart import org_chart
+from tau_bench.envs.payroll_management.permissions import ROLE_ACTIONS, permissions, user_roles
+from tau_bench.envs.payroll_management.rollups import ROLLUP_FIELDS, department_rollups
+
+# Every derived structure is built before the writes, so the checks exercise its on_change upkeep
+ROOT = "16"
+DATE_WINDOWS = [(None, None), ("2025-08-01", "2025-09-30"), ("2025-09-15", "2025-09-15"), ("2026-01-01", None)]
+
+
+def day(rng):
+    return (date(2025, 7, 1) + timedelta(days=rng.randrange(240))).isoformat()
+
+
+def pick(rng, table):
+    return rng.choice(sorted(table, key=int))
+
+
+def edit(data, rng, steps=40):
+    """A deterministic mix of inserts, updates and deletes on every indexed table."""
+    employees = sorted(data["employees"], key=int)
+    for _ in range(steps):
+        timesheets = data["timesheets"]
+        work_date = day(rng)
+        key = timesheets.next_id()
+        timesheets[key] = {
+            "timesheet_id": key, "employee_id": rng.choice(employees + ["999"]), "work_date": work_date,
+            "clock_in": f"{work_date}T09:00:00", "clock_out": f"{work_date}T{rng.randrange(10, 23)}:00:00",
+            "total_hours": 8.0, "status": rng.choice(["submitted", "approved", "rejected"]),
+        }
+        sheet = timesheets[pick(rng, timesheets)]
+        sheet["status"] = rng.choice(["submitted", "approved", "rejected"])
+        timesheets[pick(rng, timesheets)]["work_date"] = day(rng)
+        del timesheets[pick(rng, timesheets)]
+
+        runs = data["payroll_runs"]
+        start = day(rng)
+        key = runs.next_id()
+        runs[key] = {"payroll_run_id": key, "period_start": start, "period_end": max(start, day(rng)), "status": "draft"}
+        runs[pick(rng, runs)]["status"] = rng.choice(["draft", "approved", "paid", "failed"])
+
+        users = data["users"]
+        user = users[pick(rng, users)]
+        user["email"] = rng.choice([(user.get("email") or "").upper(), f" user{rng.randrange(50)}@example.org ", None])
+        user["status"] = rng.choice(["active", "inactive", "suspended"])
+        user["additional_roles"] = rng.sample(list(ROLE_ACTIONS), 2)
+        key = users.next_id()
+        users[key] = {"user_id": key, "email": f"new{key}@Example.org", "role": rng.choice(list(ROLE_ACTIONS)),
+                      "status": "active"}
+
+        employee = data["employees"][rng.choice([e for e in employees if e != ROOT])]
+        # Re-pointing at the root (or nowhere) can never close a cycle
+        employee["manager_user_id"] = rng.choice([ROOT, None, employee.get("manager_user_id")])
+        employee["department"] = rng.choice(["Sales", "Finance", "Engineering", None])
+
+        leave = data["leave_requests"]
+        start = day(rng)
+        key = leave.next_id()
+        leave[key] = {"leave_request_id": key, "employee_id": rng.choice(employees), "leave_type": rng.choice(LEAVE_TYPES),
+                      "start_date": start, "end_date": start, "status": "pending"}
+        leave[pick(rng, leave)]["status"] = rng.choice(["active", "pending", "inactive"])
+        if rng.random() < 0.3:
+            del leave[pick(rng, leave)]
+
+        links = data["employee_deductions"]
+        link = links[pick(rng, links)]
+        link["active"] = rng.random() < 0.7
+        link["rate"] = rng.choice([None, 5.0, 120.0])
+        link["end_date"] = rng.choice([None, day(rng)])
+        masters = data["deductions"]
+        masters[pick(rng, masters)]["active"] = rng.random() < 0.7
+
+        items = data["payroll_line_items"]
+        items[pick(rng, items)]["gross_pay"] = rng.randrange(100000) / 100.0
+        if rng.random() < 0.3:
+            del items[pick(rng, items)]
+
+
+def in_window(value, start, end):
+    return (start is None or value >= start) and (end is None or value <= end)
+
+
+def check_date_index(data):
+    index = timesheet_dates(data)
+    sheets = data["timesheets"]
+    for employee_id in set(data["employees"]) | {"999"}:
+        for start, end in DATE_WINDOWS:
+            expected = sorted(
+                (employee_id, t["work_date"], key) for key, t in sheets.peek_items()
+                if t.get("employee_id") == employee_id and t.get("work_date") and in_window(t["work_date"], start, end)
+            )
+            assert list(index.window([employee_id], start, end)) == expected
+
+
+def check_timesheet_index(data):
+    index = timesheet_index(data)
+    spans = {
+        key: (t["employee_id"], epoch_seconds(t["clock_in"]), epoch_seconds(t["clock_out"]))
+        for key, t in data["timesheets"].peek_items()
+        if t.get("status") != "rejected" and t.get("clock_in") and t.get("clock_out")
+    }
+    for employee_id in set(data["employees"]) | {"999"}:
+        for start, end in DATE_WINDOWS[1:3]:
+            lo, hi = epoch_seconds(f"{start}T00:00:00"), epoch_seconds(f"{end}T23:59:59")
+            expected = sorted(k for k, (e, a, b) in spans.items() if e == employee_id and a < hi and b > lo)
+            assert sorted(index.overlapping([employee_id], lo, hi)) == expected
+
+
+def check_payroll_run_index(data):
+    index = payroll_run_index(data)
+    runs = data["payroll_runs"]
+    for status in ("draft", "approved", "paid", "failed"):
+        for start, end in DATE_WINDOWS[1:3]:
+            expected = sorted(
+                key for key, r in runs.peek_items()
+                if r.get("status") == status and r["period_start"] <= end and r["period_end"] >= start
+            )
+            assert sorted(index.overlapping([status], start, end)) == expected
+
+
+def check_email_index(data):
+    index = email_index(data)
+    by_email = {}
+    for key, user in data["users"].peek_items():
+        if normalize_email(user.get("email")):
+            by_email.setdefault(normalize_email(user["email"]), []).append(key)
+    for email, keys in by_email.items():
+        assert index.find(email.upper()) == min(keys, key=lambda k: (len(k), k))
+    assert not index.taken("nobody@example.org")
+
+
+def check_org_chart(data):
+    chart = org_chart(data)
+    manager_of = {}
+    for e in data["employees"].peek_values():
+        manager = e.get("manager_user_id")
+        manager_of[e["user_id"]] = None if manager == e["user_id"] else manager
+    chains = {}
+    for user_id in manager_of:
+        chain, manager = [], manager_of.get(user_id)
+        while manager is not None:
+            chain.append(manager)
+            manager = manager_of.get(manager)
+        chains[user_id] = tuple(chain)
+        assert chart.chain(user_id) == chains[user_id]
+    for user_id in manager_of:
+        below = sorted((u for u in manager_of if user_id in chains[u]), key=lambda u: (len(u), u))
+        assert chart.reports(user_id) == below
+        direct = sorted((u for u, m in manager_of.items() if m == user_id), key=lambda u: (len(u), u))
+        assert chart.reports(user_id, direct=True) == direct
+
+
+def check_permissions(data):
+    granted = permissions(data)
+    actions = {a for role in ROLE_ACTIONS.values() for a in role}
+    for key, user in data["users"].peek_items():
+        allowed = {a for role in user_roles(user) for a in ROLE_ACTIONS.get(role, ())}
+        for action in actions:
+            assert granted.can(key, action) == (user.get("status") == "active" and action in allowed)
+
+
+def check_leave_ledger(data):
+    ledger = leave_ledger(data)
+    requests = list(data["leave_requests"].peek_values())
+    for employee_id in {r["employee_id"] for r in requests}:
+        for leave_type in LEAVE_TYPES:
+            for as_of in ("2025-12-31", "2026-06-30"):
+                totals = {"active": 0, "pending": 0}
+                for r in requests:
+                    if (r["employee_id"], r["leave_type"], r["start_date"][:4]) == (employee_id, leave_type, as_of[:4]) \
+                            and r.get("status") in totals:
+                        days = r.get("requested_days")
+                        totals[r["status"]] += requested_days(r["start_date"], r["end_date"]) if days is None else days
+                balance = ledger.balance(employee_id, leave_type, as_of)
+                assert (balance["used"], balance["pending"]) == (totals["active"], totals["pending"])
+
+
+def check_deduction_rates(data):
+    compiled = effective_deductions(data)
+    masters = data["deductions"]
+    links = list(data["employee_deductions"].peek_items())
+    for employee_id in data["employees"]:
+        for start, end in DATE_WINDOWS[1:3]:
+            pct = fixed = 0.0
+            for key, link in links:
+                segment = resolve(link, masters.peek(link.get("deduction_id")), key) if link["employee_id"] == employee_id else None
+                if segment is not None and segment.start_date <= end and segment.end_date >= start:
+                    if segment.method == "percent":
+                        pct += segment.rate
+                    else:
+                        fixed += segment.rate
+            assert compiled.rates(employee_id, start, end) == pytest.approx((pct, fixed))
+
+
+def check_rollups(data):
+    rollups = department_rollups(data)
+    employees = data["employees"]
+    expected = {}
+    for item in data["payroll_line_items"].peek_values():
+        department = (employees.peek(item["employee_id"]) or {}).get("department")
+        totals = expected.setdefault(item["payroll_run_id"], {}).setdefault(department, [0] + [0.0] * len(ROLLUP_FIELDS))
+        totals[0] += 1
+        for i, field in enumerate(ROLLUP_FIELDS, 1):
+            totals[i] += item.get(field) or 0.0
+    for run_id, departments in expected.items():
+        assert set(rollups.departments(run_id)) == set(departments)
+        for department, totals in departments.items():
+            rollup = rollups.rollup(run_id, department)
+            assert rollup["line_items"] == totals[0]
+            assert [rollup[field] for field in ROLLUP_FIELDS] == pytest.approx(totals[1:], abs=0.005)
+
+
+CHECKS = [check_date_index, check_timesheet_index, check_payroll_run_index, check_email_index, check_org_chart,
+          check_permissions, check_leave_ledger, check_deduction_rates, check_rollups]
+
+
+def run_scenario(data, scenario):
+    if scenario == "writes":
+        edit(data, random.Random(1))
+    elif scenario == "rollback":
+        with pytest.raises(KeyError):
+            with data.transaction():
+                edit(data, random.Random(1))
+                raise KeyError("rollback")
+    elif scenario == "nested":
+        with data.transaction():
+            edit(data, random.Random(1))
+            with pytest.raises(KeyError):
+                with data.transaction():
+                    edit(data, random.Random(2))
+                    raise KeyError("inner")
+    else:
+        edit(data, random.Random(1))
+        data.reset()
+
+
+@pytest.mark.parametrize("scenario", ["writes", "rollback", "nested", "reset"])
+@pytest.mark.parametrize("check", CHECKS, ids=lambda check: check.__name__[len("check_"):])
+def test_derived_structure_matches_scan(data, check, scenario):
+    check(data)
+    run_scenario(data, scenario)
+    check(data)
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from tau_bench.envs.payroll_management.leave_ledger import LEAVE_TYPES
+from tau_bench.envs.payroll_management.tools.interface_4 import ComputeLeaveBalance, RequestLeave
+
+# Employee 11 reports to manager 2, who reports to manager 1; manager 4 runs another team
+EMPLOYEE, DIRECT_MANAGER, SKIP_MANAGER, OTHER_MANAGER = "11", "2", "1", "4"
+
+
+@pytest.mark.parametrize("manager", [DIRECT_MANAGER, SKIP_MANAGER])
+def test_managers_in_the_chain_read_balances(data, manager):
+    out = json.loads(ComputeLeaveBalance.invoke(data, employee_id=EMPLOYEE, acting_user_id=manager))
+    assert [b["leave_type"] for b in out["balances"]] == list(LEAVE_TYPES)
+
+
+def test_managers_outside_the_chain_are_refused(data):
+    with pytest.raises(ValueError, match="may not view leave"):
+        ComputeLeaveBalance.invoke(data, employee_id=EMPLOYEE, acting_user_id=OTHER_MANAGER)
+    with pytest.raises(ValueError, match="may not request leave"):
+        RequestLeave.invoke(data, employee_id=EMPLOYEE, leave_type="annual", start_date="2025-11-03",
+                            end_date="2025-11-04", acting_user_id=OTHER_MANAGER)
+
+
+def test_manager_in_the_chain_requests_leave(data):
+    out = json.loads(RequestLeave.invoke(data, employee_id=EMPLOYEE, leave_type="annual", start_date="2025-11-03",
+                                         end_date="2025-11-04", acting_user_id=SKIP_MANAGER))
+    assert out["employee_id"] == EMPLOYEE
+
+
+@pytest.mark.parametrize("as_of_date", ["2025-1-5", "yesterday", "2025-13-01"])
+def test_malformed_as_of_date_is_rejected(data, as_of_date):
+    with pytest.raises(ValueError, match="as_of_date must be YYYY-MM-DD"):
+        ComputeLeaveBalance.invoke(data, employee_id=EMPLOYEE, acting_user_id=EMPLOYEE, as_of_date=as_of_date)
+
+
+def pending_annual(data, as_of_date):
+    out = json.loads(ComputeLeaveBalance.invoke(data, employee_id=EMPLOYEE, acting_user_id=EMPLOYEE,
+                                                leave_type="annual", as_of_date=as_of_date))
+    return out["as_of_date"], out["balances"][0]["pending"]
+
+
+def test_basic_format_dates_are_stored_canonical(data):
+    _, before = pending_annual(data, "2025-12-31")
+    out = json.loads(RequestLeave.invoke(data, employee_id=EMPLOYEE, leave_type="annual", start_date="20251103",
+                                         end_date="2025-11-04", acting_user_id=EMPLOYEE))
+    stored = data["leave_requests"][out["leave_request_id"]]
+    assert (stored["start_date"], stored["end_date"], stored["requested_days"]) == ("2025-11-03", "2025-11-04", 2)
+    assert pending_annual(data, "20251231") == ("2025-12-31", before + 2)
@@ -0,0 +1,52 @@
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from tau_bench.envs.payroll_management import data as data_package
+from tau_bench.envs.payroll_management.data import DATA_FILES, load_data
+
+DATA_DIR = os.path.dirname(data_package.__file__)
+NAMES = [filename[:-len(".json")] for filename in DATA_FILES]
+THREADS = 8
+
+
+def test_concurrent_loads_parse_each_table_once(tmp_path, monkeypatch):
+    # A directory no earlier test has loaded, so every baseline is built under contention here
+    for filename in DATA_FILES:
+        shutil.copy(os.path.join(DATA_DIR, filename), tmp_path / filename)
+    reads, read_rows = Counter(), data_package._read_rows
+
+    def counted(table_name, path):
+        reads[table_name] += 1
+        time.sleep(0.002)  # widen the window a racing second parse would slip into
+        return read_rows(table_name, path)
+
+    monkeypatch.setattr(data_package, "_read_rows", counted)
+    shared = load_data(str(tmp_path))
+    barrier = threading.Barrier(THREADS)
+
+    def work(i):
+        own = load_data(str(tmp_path), preload=i % 2 == 0)
+        barrier.wait()
+        order = NAMES[i:] + NAMES[:i]
+        return {name: shared[name] for name in order}, {name: own[name].copy() for name in order}
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(work, range(THREADS)))
+
+    assert reads == Counter(NAMES)
+    baselines = {key: entry[1] for key, entry in data_package._BASELINES.items()
+                 if os.path.dirname(key) == str(tmp_path)}
+    assert len(baselines) == len(DATA_FILES)
+    for name in NAMES:
+        assert len({id(tables[name]) for tables, _ in results}) == 1
+        baseline = baselines[str(tmp_path / f"{name}.json")]
+        table = shared[name]
+        assert (table._base_columns is baseline._base_columns) if name == "audit_logs" else table._baseline is baseline
+        with open(tmp_path / f"{name}.json", encoding="utf-8") as f:
+            expected = json.load(f)
+        assert all(rows[name] == expected for _, rows in results)
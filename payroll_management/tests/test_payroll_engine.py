@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from tau_bench.envs.payroll_management.payroll_engine import approved_hours, compute_line_items, overtime_hours
+from tau_bench.envs.payroll_management.tools.interface_4 import GenPayrollLineItems, StartPayrollRun
+
+ADMIN = "7"
+
+
+def employee_of(data, pay_frequency):
+    return next(e for e in data["employees"].values()
+                if e["pay_frequency"] == pay_frequency and e["employment_status"] == "active")
+
+
+def add_hours(data, employee_id, days):
+    for work_date, hours in days:
+        key = str(max(map(int, data["timesheets"])) + 1)
+        data["timesheets"][key] = {
+            "timesheet_id": key, "employee_id": employee_id, "work_date": work_date,
+            "total_hours": hours, "status": "approved",
+        }
+
+
+def line_items(data, run_id):
+    return {li["employee_id"]: li for li in data["payroll_line_items"].values() if li["payroll_run_id"] == run_id}
+
+
+def test_overtime_is_counted_per_iso_week(data):
+    employee = employee_of(data, "biweekly")
+    # 60 hours in the week of Mon 2027-01-04, 20 in the next: 80 in total, 20 of them overtime
+    add_hours(data, employee["employee_id"], [(f"2027-01-0{d}", 12.0) for d in range(4, 9)])
+    add_hours(data, employee["employee_id"], [("2027-01-11", 10.0), ("2027-01-12", 10.0)])
+    run = {"payroll_run_id": None, "period_start": "2027-01-04", "period_end": "2027-01-17"}
+
+    assert overtime_hours(data, {employee["employee_id"]: 0}, run["period_start"], run["period_end"]).tolist() == [20.0]
+    salary = employee["salary_base"]
+    expected = round(salary / 26 + 20 * salary / 2080 * 1.5, 2)
+    assert compute_line_items(data, run, employee_ids=[employee["employee_id"]])[employee["employee_id"]]["gross_pay"] == expected
+
+
+def test_week_split_by_the_period_counts_its_days_inside(data):
+    employee = employee_of(data, "weekly")
+    # Thu-Sun of one ISO week and Mon-Wed of the next, 12 hours a day, in one 7-day run
+    add_hours(data, employee["employee_id"], [(f"2027-01-{d:02d}", 12.0) for d in range(7, 14)])
+    assert overtime_hours(data, {employee["employee_id"]: 0}, "2027-01-07", "2027-01-13").tolist() == [8.0]
+
+
+@pytest.mark.parametrize("period_end, days", [("2027-01-14", 14), ("2027-02-15", 46)])
+def test_base_pay_is_prorated_off_cycle(data, period_end, days):
+    employee = employee_of(data, "monthly")
+    run = {"payroll_run_id": None, "period_start": "2027-01-01", "period_end": period_end}
+    gross = compute_line_items(data, run, employee_ids=[employee["employee_id"]])[employee["employee_id"]]["gross_pay"]
+    assert gross == round(employee["salary_base"] * days / 365, 2)
+
+
+def test_base_pay_is_one_period_on_cycle(data):
+    employee = employee_of(data, "monthly")
+    run = {"payroll_run_id": None, "period_start": "2027-02-01", "period_end": "2027-02-28"}
+    gross = compute_line_items(data, run, employee_ids=[employee["employee_id"]])[employee["employee_id"]]["gross_pay"]
+    assert gross == round(employee["salary_base"] / 12, 2)
+
+
+@pytest.mark.parametrize("only_changed", [False, True])
+def test_regeneration_drops_employees_no_longer_payable(data, only_changed):
+    run_id = json.loads(StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31",
+                                               acting_user_id=ADMIN))["payroll_run_id"]
+    GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN)
+    employee_id = employee_of(data, "weekly")["employee_id"]
+    assert employee_id in line_items(data, run_id)
+
+    data["employees"][employee_id] = dict(data["employees"][employee_id], employment_status="terminated")
+    summary = json.loads(GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN,
+                                                    only_changed=only_changed))
+    assert summary["deleted"] == 1
+    assert employee_id not in line_items(data, run_id)
+    assert all(data["employees"][e]["employment_status"] == "active" for e in line_items(data, run_id))
+
+
+def test_pay_group_filter_keeps_other_groups_line_items(data):
+    run_id = json.loads(StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31",
+                                               acting_user_id=ADMIN))["payroll_run_id"]
+    GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN)
+    before = set(line_items(data, run_id))
+    summary = json.loads(GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN,
+                                                    pay_frequency="weekly"))
+    assert summary["deleted"] == 0
+    assert set(line_items(data, run_id)) == before
+
+
+def amounts(data, run_id):
+    return {e: (li["gross_pay"], li["total_deductions"], li["net_pay"]) for e, li in line_items(data, run_id).items()}
+
+
+def test_index_path_matches_scan(data):
+    ids = sorted(data["employees"], key=int)
+    for employee_id in ids:
+        add_hours(data, employee_id, [(f"2027-01-{d:02d}", 9.0 + int(employee_id) % 5) for d in range(4, 16)])
+    everyone = {employee_id: i for i, employee_id in enumerate(ids)}
+    for start, end in [("2027-01-04", "2027-01-17"), ("2027-01-06", "2027-01-12")]:
+        hours = approved_hours(data, everyone, start, end)
+        overtime = overtime_hours(data, everyone, start, end)
+        for employee_id, i in everyone.items():
+            # One employee reads the work_date index, all of them scan the table
+            assert approved_hours(data, {employee_id: 0}, start, end).tolist() == [hours[i]]
+            assert overtime_hours(data, {employee_id: 0}, start, end).tolist() == [overtime[i]]
+
+
+def edit_inputs(data):
+    add_hours(data, employee_of(data, "weekly")["employee_id"], [(f"2027-01-{d:02d}", 11.0) for d in range(4, 9)])
+    salaried = employee_of(data, "monthly")
+    data["employees"][salaried["employee_id"]]["salary_base"] = salaried["salary_base"] + 1200.0
+    leaver = employee_of(data, "biweekly")["employee_id"]
+    data["employees"][leaver] = dict(data["employees"][leaver], employment_status="terminated")
+    link = next(iter(data["employee_deductions"].values()))
+    link["rate"] = (link.get("rate") or 0.0) + 1.0
+
+
+@pytest.mark.parametrize("scenario", ["writes", "rollback"])
+def test_incremental_generation_matches_full(data, scenario):
+    run_id = json.loads(StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31",
+                                               acting_user_id=ADMIN))["payroll_run_id"]
+    GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN)
+    if scenario == "rollback":
+        with pytest.raises(KeyError):
+            with data.transaction():
+                edit_inputs(data)
+                raise KeyError("rollback")
+    else:
+        edit_inputs(data)
+
+    summary = json.loads(GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN, only_changed=True))
+    assert summary["incremental"]
+    incremental = amounts(data, run_id)
+    GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN)
+    assert incremental == amounts(data, run_id)
+    run = data["payroll_runs"][run_id]
+    assert incremental == {e: (r["gross_pay"], r["total_deductions"], r["net_pay"])
+                           for e, r in compute_line_items(data, run).items()}
+
+
+def test_reset_forgets_generated_runs(data):
+    run_id = json.loads(StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31",
+                                               acting_user_id=ADMIN))["payroll_run_id"]
+    GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN)
+    data.reset()
+    run_id = json.loads(StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31",
+                                               acting_user_id=ADMIN))["payroll_run_id"]
+    summary = json.loads(GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN, only_changed=True))
+    assert not summary["incremental"]
+    assert summary["created"] == len(line_items(data, run_id)) == summary["employees"]
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from tau_bench.envs.payroll_management.tools.interface_4 import (
+    ApprovePayrollRun, GenPayrollLineItems, PayPayrollRun, RunPayroll, StartPayrollRun,
+)
+
+ADMIN, OFFICER, OTHER_OFFICER = "7", "8", "13"
+
+
+def paid_employees(data, run_ids):
+    return sorted(li["employee_id"] for li in data["payroll_line_items"].values() if li["payroll_run_id"] in run_ids)
+
+
+def test_approver_cannot_pay(data):
+    run = json.loads(StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31", acting_user_id=ADMIN))
+    GenPayrollLineItems.invoke(data, payroll_run_id=run["payroll_run_id"], acting_user_id=ADMIN)
+    ApprovePayrollRun.invoke(data, payroll_run_id=run["payroll_run_id"], approved_by_user_id=OFFICER)
+    with pytest.raises(ValueError, match="Segregation of duties"):
+        PayPayrollRun.invoke(data, payroll_run_id=run["payroll_run_id"], acting_user_id=OFFICER)
+    assert data["payroll_runs"][run["payroll_run_id"]]["status"] == "approved"
+    PayPayrollRun.invoke(data, payroll_run_id=run["payroll_run_id"], acting_user_id=OTHER_OFFICER)
+    assert data["payroll_runs"][run["payroll_run_id"]]["status"] == "paid"
+
+
+@pytest.mark.parametrize("through", ["draft", "approved", "paid"])
+def test_duplicate_period_is_rejected_in_every_mode(data, through):
+    runs_before = dict(data["payroll_runs"])
+    period = {"period_start": "2027-01-01", "period_end": "2027-01-31"}
+    for periods in ([period, dict(period)], [period, dict(period, pay_frequency="monthly")]):
+        with pytest.raises(ValueError, match="overlap"):
+            RunPayroll.invoke(data, periods=periods, initiated_by_user_id=ADMIN,
+                              approved_by_user_id=OFFICER, through=through)
+    assert dict(data["payroll_runs"]) == runs_before
+
+
+@pytest.mark.parametrize("through", ["draft", "approved", "paid"])
+def test_pay_groups_share_a_period(data, through):
+    periods = [
+        {"period_start": "2027-01-01", "period_end": "2027-01-31", "pay_frequency": "monthly"},
+        {"period_start": "2027-01-01", "period_end": "2027-01-31", "pay_frequency": "semimonthly"},
+    ]
+    out = json.loads(RunPayroll.invoke(data, periods=periods, initiated_by_user_id=ADMIN,
+                                       approved_by_user_id=OFFICER, through=through))["runs"]
+    assert [r["status"] for r in out] == [through, through]
+    ids = [r["payroll_run_id"] for r in out]
+    paid = paid_employees(data, ids)
+    assert len(paid) == len(set(paid))
+    for run_id, frequency in zip(ids, ("monthly", "semimonthly")):
+        assert all(data["employees"][e]["pay_frequency"] == frequency for e in paid_employees(data, [run_id]))
+
+
+def test_batch_is_checked_against_existing_runs(data):
+    StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31", acting_user_id=ADMIN,
+                           pay_frequency="monthly")
+    with pytest.raises(ValueError, match="overlaps existing"):
+        RunPayroll.invoke(data, periods=[{"period_start": "2027-01-15", "period_end": "2027-02-14"}],
+                          initiated_by_user_id=ADMIN, approved_by_user_id=OFFICER)
+    RunPayroll.invoke(data, periods=[{"period_start": "2027-01-01", "period_end": "2027-01-31", "pay_frequency": "weekly"}],
+                      initiated_by_user_id=ADMIN, approved_by_user_id=OFFICER, through="draft")
+
+
+def test_draft_needs_no_approver(data):
+    periods = [{"period_start": "2027-01-01", "period_end": "2027-01-31"}]
+    out = json.loads(RunPayroll.invoke(data, periods=periods, initiated_by_user_id=ADMIN, through="draft"))["runs"]
+    assert data["payroll_runs"][out[0]["payroll_run_id"]]["status"] == "draft"
+    for through in ("approved", "paid"):
+        with pytest.raises(ValueError, match="approved_by_user_id is required unless through='draft'"):
+            RunPayroll.invoke(data, periods=[{"period_start": "2027-02-01", "period_end": "2027-02-28"}],
+                              initiated_by_user_id=ADMIN, through=through)
+
+
+@pytest.mark.parametrize("period_start, period_end", [("20270101", "2027-01-31"), ("2027-01-01", "20270131")])
+def test_basic_format_dates_are_stored_canonical(data, period_start, period_end):
+    run = json.loads(StartPayrollRun.invoke(data, period_start=period_start, period_end=period_end, acting_user_id=ADMIN))
+    assert (run["period_start"], run["period_end"]) == ("2027-01-01", "2027-01-31")
+    with pytest.raises(ValueError, match="overlaps existing"):
+        StartPayrollRun.invoke(data, period_start="2027-01-20", period_end="20270215", acting_user_id=ADMIN)
+    out = json.loads(RunPayroll.invoke(data, periods=[{"period_start": "20270201", "period_end": "20270228"}],
+                                       initiated_by_user_id=ADMIN, approved_by_user_id=OFFICER, through="draft"))
+    assert (out["runs"][0]["period_start"], out["runs"][0]["period_end"]) == ("2027-02-01", "2027-02-28")
+
+
+@pytest.mark.parametrize("period_end", ["2027-02-30", "2027/01/31", "2027-1-31", ""])
+def test_malformed_period_is_rejected(data, period_end):
+    with pytest.raises(ValueError, match="YYYY-MM-DD"):
+        StartPayrollRun.invoke(data, period_start="2027-01-01", period_end=period_end, acting_user_id=ADMIN)
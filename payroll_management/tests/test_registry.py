@@ -0,0 +1,30 @@
+import pytest
+
+from tau_bench.envs.payroll_management.tools.registry import TOOL_INTERFACES, ToolRegistry, tool_registry
+
+
+def test_registering_does_not_modify_tools():
+    tools = [tool for interface in TOOL_INTERFACES.values() for tool in interface]
+    before = [tool.__dict__["invoke"] for tool in tools]
+    ToolRegistry(TOOL_INTERFACES)
+    assert [tool.__dict__["invoke"] for tool in tools] == before
+    assert dict(tool_registry().tools) == {tool.get_info()["function"]["name"]: tool for tool in tools}
+
+
+def test_unvalidated_tool_is_refused():
+    class Unchecked:
+        @staticmethod
+        def invoke(data):
+            return "{}"
+
+        @staticmethod
+        def get_info():
+            return {"type": "function", "function": {"name": "unchecked", "parameters": {}}}
+
+    with pytest.raises(ValueError, match="@validated"):
+        ToolRegistry({"interface_1": [Unchecked]})
+
+
+def test_tool_classes_check_their_arguments(data):
+    with pytest.raises(ValueError, match="Unexpected argument"):
+        tool_registry().tool("list_timesheets").invoke(data, acting_user_id="1", bogus=1)
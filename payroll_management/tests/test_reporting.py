@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+
+import pytest
+
+from tau_bench.envs.payroll_management.deduction_rates import resolve
+from tau_bench.envs.payroll_management.reporting import _MEASURES, REPORT_TYPES
+from tau_bench.envs.payroll_management.tools.interface_4 import (ExportPayrollReport, GenPayrollLineItems,
+                                                                  StartPayrollRun)
+
+ADMIN, OFFICER = "7", "8"
+WINDOW = ("2025-08-01", "2027-01-31")
+FILTERS = [{}, {"department": "Engineering"}, {"employee_id": "11"}]
+
+
+@pytest.fixture
+def payroll(data):
+    """The seed runs plus a generated January 2027 run with timesheets and a second, ending deduction."""
+    for employee_id in sorted(data["employees"], key=int)[::3]:
+        key = data["timesheets"].next_id()
+        data["timesheets"][key] = {"timesheet_id": key, "employee_id": employee_id, "work_date": "2027-01-05",
+                                   "total_hours": 7.5 + int(employee_id) % 4, "status": "approved"}
+        key = data["employee_deductions"].next_id()
+        data["employee_deductions"][key] = {"employee_deduction_id": key, "employee_id": employee_id,
+                                            "deduction_id": "1", "method": "fixed", "rate": 40.0,
+                                            "start_date": "2026-01-01", "end_date": "2027-01-10", "active": True}
+    run_id = json.loads(StartPayrollRun.invoke(data, period_start="2027-01-01", period_end="2027-01-31",
+                                               acting_user_id=ADMIN))["payroll_run_id"]
+    GenPayrollLineItems.invoke(data, payroll_run_id=run_id, acting_user_id=ADMIN)
+    return data
+
+
+def facts(data, report_type, department=None, employee_id=None):
+    """The report's fact rows, by scanning every table."""
+    start, end = WINDOW
+    employees, sheets = data["employees"], list(data["timesheets"].values())
+    for run in sorted(data["payroll_runs"].values(), key=lambda r: int(r["payroll_run_id"])):
+        if run["period_start"] > end or run["period_end"] < start:
+            continue
+        for item in sorted(data["payroll_line_items"].values(), key=lambda li: int(li["line_item_id"])):
+            dept = (employees.get(item["employee_id"]) or {}).get("department")
+            if item["payroll_run_id"] != run["payroll_run_id"] or department not in (None, dept) \
+                    or employee_id not in (None, item["employee_id"]):
+                continue
+            row = dict(run, department=dept, employee_id=item["employee_id"])
+            if report_type == "payroll_period_summary":
+                hours = sum(t.get("total_hours") or 0.0 for t in sheets
+                            if t["employee_id"] == item["employee_id"] and t.get("status") == "approved"
+                            and run["period_start"] <= t["work_date"] <= run["period_end"])
+                yield row, dict({f: item.get(f) or 0.0 for f in ("gross_pay", "total_deductions", "net_pay")},
+                                approved_hours=hours)
+                continue
+            for key, link in data["employee_deductions"].items():
+                segment = resolve(link, data["deductions"].get(link["deduction_id"]), key) \
+                    if link["employee_id"] == item["employee_id"] else None
+                if segment is None or segment.start_date > run["period_end"] or segment.end_date < run["period_start"]:
+                    continue
+                gross = item.get("gross_pay") or 0.0
+                amount = gross * segment.rate / 100.0 if segment.method == "percent" else segment.rate
+                yield dict(row, deduction_type=segment.deduction_type, method=segment.method), {"amount": amount}
+
+
+def brute_force(data, report_type, group, **filters):
+    count, measures = _MEASURES[report_type]
+    groups = {}
+    for row, values in facts(data, report_type, **filters):
+        key = tuple("" if row[g] is None else str(row[g]) for g in group)
+        totals = groups.setdefault(key, {"employees": set(), count: 0, **{m: 0.0 for m in measures}})
+        totals["employees"].add(row["employee_id"])
+        totals[count] += 1
+        for m in measures:
+            totals[m] += values[m]
+    return {key: dict(totals, employees=len(totals["employees"])) for key, totals in groups.items()}
+
+
+def export(data, report_type, fmt, group, **filters):
+    """Every chunk of the export, concatenated and parsed back into rows."""
+    text, chunk = "", 0
+    while chunk is not None:
+        out = json.loads(ExportPayrollReport.invoke(data, report_type=report_type, period_start=WINDOW[0],
+                                                    period_end=WINDOW[1], acting_user_id=OFFICER, format=fmt,
+                                                    group_by=group, chunk=chunk, chunk_rows=3, **filters))
+        text, chunk = text + out["content"], out["next_chunk"]
+    if fmt == "csv":
+        return list(csv.DictReader(io.StringIO(text)))
+    return [json.loads(line) for line in text.splitlines()]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+@pytest.mark.parametrize("filters", FILTERS, ids=["all", "department", "employee"])
+@pytest.mark.parametrize("report_type, grouping", [(t, g) for t in REPORT_TYPES for g in ("default", "all")])
+def test_export_chunks_match_brute_force(payroll, report_type, grouping, filters, fmt):
+    dimensions, default = REPORT_TYPES[report_type]
+    group = list(default if grouping == "default" else dimensions)
+    expected = brute_force(payroll, report_type, group, **filters)
+    assert expected
+
+    rows = export(payroll, report_type, fmt, group, **filters)
+    count, measures = _MEASURES[report_type]
+    got = {tuple(str(row[g]) for g in group): row for row in rows}
+    assert len(got) == len(rows)
+    assert set(got) == set(expected)
+    for key, row in got.items():
+        assert (int(row["employees"]), int(row[count])) == (expected[key]["employees"], expected[key][count])
+        assert [float(row[m]) for m in measures] == pytest.approx([expected[key][m] for m in measures], abs=0.01)
+
+
+def test_basic_format_window_matches_canonical(payroll):
+    args = dict(report_type="payroll_period_summary", acting_user_id=OFFICER, format="ndjson")
+    canonical = json.loads(ExportPayrollReport.invoke(payroll, period_start=WINDOW[0], period_end=WINDOW[1], **args))
+    basic = json.loads(ExportPayrollReport.invoke(payroll, period_start=WINDOW[0].replace("-", ""),
+                                                  period_end=WINDOW[1].replace("-", ""), **args))
+    assert basic == canonical
@@ -0,0 +1,64 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from tau_bench.envs.payroll_management import data as data_package
+from tau_bench.envs.payroll_management.data import DATA_FILES, build_snapshot, load_data
+from tau_bench.envs.payroll_management.data.snapshot import Snapshot
+
+DATA_DIR = os.path.dirname(data_package.__file__)
+
+
+def read_json(base_dir, name):
+    with open(os.path.join(base_dir, name + ".json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    for filename in DATA_FILES:
+        shutil.copy(os.path.join(DATA_DIR, filename), tmp_path / filename)
+    build_snapshot(str(tmp_path))
+    return str(tmp_path)
+
+
+def test_snapshot_rows_match_the_json(snapshot_dir):
+    snapshot = Snapshot(os.path.join(snapshot_dir, "tables.snapshot"))
+    try:
+        for filename in DATA_FILES:
+            name = filename[:-len(".json")]
+            assert snapshot.is_fresh(name, os.path.join(snapshot_dir, filename))
+            assert snapshot.rows(name) == read_json(snapshot_dir, name)
+    finally:
+        snapshot.close()
+
+
+def test_stale_table_is_read_from_the_json(snapshot_dir):
+    employees = read_json(snapshot_dir, "employees")
+    employees["1"]["department"] = "Edited"
+    with open(os.path.join(snapshot_dir, "employees.json"), "w", encoding="utf-8") as f:
+        json.dump(employees, f)
+
+    data = load_data(snapshot_dir)
+    assert data["employees"].copy() == employees
+    assert data["employees"].keys_where("department", "Edited") == ["1"]
+    assert data["timesheets"].copy() == read_json(snapshot_dir, "timesheets")
+
+
+def test_snapshot_backed_store_rolls_back_and_resets(snapshot_dir):
+    data = load_data(snapshot_dir)
+    expected = read_json(snapshot_dir, "payroll_line_items")
+    with pytest.raises(KeyError):
+        with data.transaction():
+            data["payroll_line_items"]["1"]["gross_pay"] = 0.0
+            del data["payroll_line_items"]["2"]
+            raise KeyError("rollback")
+    assert data["payroll_line_items"].copy() == expected
+
+    data["payroll_line_items"]["1"]["payroll_run_id"] = "999"
+    assert data["payroll_line_items"].keys_where("payroll_run_id", "999") == ["1"]
+    data.reset()
+    assert data["payroll_line_items"].copy() == expected
+    assert data["payroll_line_items"].keys_where("payroll_run_id", "999") == []
@@ -0,0 +1,116 @@
+import random
+
+import pytest
+
+from tau_bench.envs.payroll_management.data import load_data
+
+TABLES = ["timesheets", "payroll_line_items", "employee_deductions", "approvals", "leave_requests", "employees"]
+
+
+def brute(table, column, value):
+    return sorted(key for key, row in table.peek_items() if row.get(column) == value)
+
+
+def values_of(table, column):
+    return {row.get(column) for row in table.peek_values()} - {None}
+
+
+def assert_indexes_match_scan(table, extra=()):
+    for column in table.indexed_columns:
+        for value in values_of(table, column) | set(extra):
+            assert sorted(table.keys_where(column, value)) == brute(table, column, value), (table.name, column, value)
+
+
+def mutate(rng, table, steps=60):
+    """Random inserts, foreign-key edits, field removals and deletes on `table`."""
+    columns = table.indexed_columns
+    pools = {column: sorted(values_of(table, column)) + ["999"] for column in columns}
+    for _ in range(steps):
+        keys = list(table)
+        op = rng.random()
+        if op < 0.3 or not keys:
+            key = table.next_id()
+            row = dict(table.peek(rng.choice(keys))) if keys else {}
+            row[table.pk] = key
+            row[rng.choice(columns)] = rng.choice(pools[rng.choice(columns)])
+            table[key] = row
+        elif op < 0.6:
+            column = rng.choice(columns)
+            table[rng.choice(keys)][column] = rng.choice(pools[column] + [None])
+        elif op < 0.7:
+            table[rng.choice(keys)].pop(rng.choice(columns), None)
+        elif op < 0.8:
+            table[rng.choice(keys)].update({column: rng.choice(pools[column]) for column in columns})
+        else:
+            del table[rng.choice(keys)]
+
+
+@pytest.mark.parametrize("name", TABLES)
+def test_indexes_match_scan_after_writes(name):
+    data = load_data()
+    table = data[name]
+    assert table.indexed_columns
+    assert_indexes_match_scan(table)
+    mutate(random.Random(name), table)
+    assert_indexes_match_scan(table, extra=["999"])
+
+
+@pytest.mark.parametrize("name", TABLES)
+def test_rollback_restores_rows_indexes_and_ids(name):
+    data = load_data()
+    table = data[name]
+    before, next_id = table.copy(), table.next_id()
+    with pytest.raises(KeyError):
+        with data.transaction():
+            mutate(random.Random(name), table)
+            raise KeyError("rollback")
+    assert table.copy() == before
+    assert table.next_id() == next_id
+    assert_indexes_match_scan(table, extra=["999"])
+
+
+def test_nested_rollback_keeps_the_outer_writes():
+    data = load_data()
+    table = data["timesheets"]
+    with data.transaction():
+        mutate(random.Random(1), table, steps=20)
+        outer = table.copy()
+        with pytest.raises(KeyError):
+            with data.transaction():
+                mutate(random.Random(2), table, steps=20)
+                data["vendors"] = {}
+                raise KeyError("inner")
+        assert table.copy() == outer
+        assert len(data["vendors"]) == len(load_data()["vendors"])
+    assert table.copy() == outer
+    assert_indexes_match_scan(table, extra=["999"])
+
+
+def test_reset_restores_the_loaded_state():
+    data = load_data()
+    fresh = load_data()
+    for name in TABLES:
+        mutate(random.Random(name), data[name])
+    data["vendors"] = {}
+    data.reset()
+    for name in TABLES + ["vendors"]:
+        assert data[name].copy() == fresh[name].copy()
+        assert data[name].next_id() == fresh[name].next_id()
+        assert_indexes_match_scan(data[name], extra=["999"])
+
+
+@pytest.mark.parametrize("delete", [False, True])
+def test_reset_restores_touched_keys_in_order(delete):
+    data = load_data()
+    table = data["timesheets"]
+    before, order = table.copy(), list(table)
+    key = table.next_id()
+    table[key] = dict(table.peek(order[0]), timesheet_id=key, employee_id="999")
+    table[order[1]]["employee_id"] = "999"
+    if delete:
+        del table[order[2]]
+    data.reset()
+    assert list(table) == order
+    assert table.copy() == before
+    assert table.next_id() == str(max(map(int, order)) + 1)
+    assert_indexes_match_scan(table, extra=["999"])
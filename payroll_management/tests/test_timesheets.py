@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from tau_bench.envs.payroll_management.date_index import encode_cursor
+from tau_bench.envs.payroll_management.org_chart import org_chart
+from tau_bench.envs.payroll_management.tools.interface_4 import ListTimesheets, SubmitTimesheet
+
+# Reporting chain: employee 11 -> manager 2 -> manager 1 -> manager 16; manager 4 is elsewhere
+REPORT, MANAGER, SKIP_LEVEL, OUTSIDER = "11", "2", "1", "4"
+PAYROLL = "7"
+WINDOW = ("2025-08-05", "2025-08-25")
+
+
+def listed(data, acting_user_id, **kwargs):
+    out = json.loads(ListTimesheets.invoke(data, acting_user_id=acting_user_id, limit=500, **kwargs))
+    return {t["employee_id"] for t in out["timesheets"]}
+
+
+def test_manager_sees_their_whole_subtree(data):
+    subtree = set(org_chart(data).reports(SKIP_LEVEL))
+    assert REPORT in subtree and MANAGER in subtree
+    assert listed(data, SKIP_LEVEL) == subtree | {SKIP_LEVEL}
+    assert listed(data, SKIP_LEVEL, employee_id=REPORT) == {REPORT}
+
+
+def test_manager_outside_the_chain_is_refused(data):
+    assert REPORT not in listed(data, OUTSIDER)
+    with pytest.raises(ValueError, match="may not view"):
+        ListTimesheets.invoke(data, acting_user_id=OUTSIDER, employee_id=REPORT)
+
+
+def test_employee_sees_only_themselves(data):
+    assert listed(data, REPORT) == {REPORT}
+
+
+def test_basic_format_work_date_is_stored_canonical(data):
+    sheet = json.loads(SubmitTimesheet.invoke(data, employee_id=REPORT, work_date="20250901", clock_in="2025-09-01T09:00:00",
+                                              clock_out="2025-09-01T17:00:00", acting_user_id=REPORT))
+    assert sheet["work_date"] == "2025-09-01"
+    assert sheet["timesheet_id"] in {t["timesheet_id"] for t in json.loads(ListTimesheets.invoke(
+        data, acting_user_id=REPORT, start_date="2025-09-01", end_date="2025-09-01"))["timesheets"]}
+
+
+def add_sheet(data, employee_id, work_date):
+    key = data["timesheets"].next_id()
+    data["timesheets"][key] = {"timesheet_id": key, "employee_id": employee_id, "work_date": work_date,
+                               "total_hours": 8.0, "status": "submitted"}
+    return key
+
+
+def brute_force(data, skip=()):
+    start, end = WINDOW
+    return [key for _, _, key in sorted((t["employee_id"], t["work_date"], key) for key, t in data["timesheets"].items()
+                                         if start <= t["work_date"] <= end and key not in skip)]
+
+
+def test_pages_concatenate_to_the_window(data):
+    for employee_id in ("3", "6", "20"):
+        for day in (5, 12, 12, 25, 26):
+            add_sheet(data, employee_id, f"2025-08-{day:02d}")
+    args = dict(acting_user_id=PAYROLL, start_date=WINDOW[0], end_date=WINDOW[1].replace("-", ""), limit=4)
+    first = json.loads(ListTimesheets.invoke(data, **args))
+    # Written between pages: one row sorting after the cursor, one before it
+    ahead, behind = add_sheet(data, "9", "2025-08-20"), add_sheet(data, "10", "2025-08-05")
+    assert (first["timesheets"][-1]["employee_id"], first["timesheets"][-1]["work_date"]) > ("10", "2025-08-05")
+
+    keys, cursor = [t["timesheet_id"] for t in first["timesheets"]], first["next_cursor"]
+    while cursor is not None:
+        page = json.loads(ListTimesheets.invoke(data, cursor=cursor, **args))
+        assert 1 <= page["count"] <= 4
+        keys += [t["timesheet_id"] for t in page["timesheets"]]
+        cursor = page["next_cursor"]
+    assert ahead in keys and len(keys) == len(set(keys))
+    assert keys == brute_force(data, skip={behind})
+
+
+def test_malformed_or_foreign_cursor_is_rejected(data):
+    for cursor in ("not a cursor", encode_cursor(("11", "2025-08-12"))):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            ListTimesheets.invoke(data, acting_user_id=PAYROLL, cursor=cursor)
+    outside_team = encode_cursor((OUTSIDER, "2025-08-05", "4"))
+    outside_window = encode_cursor((REPORT, "2025-09-30", "11"))
+    for acting_user_id, cursor in ((MANAGER, outside_team), (PAYROLL, outside_window)):
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            ListTimesheets.invoke(data, acting_user_id=acting_user_id, start_date=WINDOW[0], end_date=WINDOW[1],
+                                  cursor=cursor)
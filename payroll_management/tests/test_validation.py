@@ -0,0 +1,31 @@
+import pytest
+
+from tau_bench.envs.payroll_management.tools.interface_3 import OnboardEmployee
+from tau_bench.envs.payroll_management.tools.interface_4 import ExportPayrollReport
+from tau_bench.envs.payroll_management.tools.validation import compile_validator
+
+EXPORT = {"report_type": "payroll_period_summary", "period_start": "2026-01-01", "period_end": "2026-01-31",
+          "acting_user_id": "7"}
+ONBOARD = {"user_id": "26", "department": "Sales", "hire_date": "2026-01-01", "acting_user_id": "12"}
+
+
+@pytest.mark.parametrize("chunk", [1, 2.0, "1", " 3 ", "-1"])
+def test_integer_accepts_integral_values(chunk):
+    compile_validator(ExportPayrollReport)(dict(EXPORT, chunk=chunk))
+
+
+@pytest.mark.parametrize("chunk", [2.5, "2.0", "one", "", True, [1]])
+def test_integer_rejects_other_values(chunk):
+    with pytest.raises(ValueError, match="expected integer"):
+        compile_validator(ExportPayrollReport)(dict(EXPORT, chunk=chunk))
+
+
+@pytest.mark.parametrize("salary_base", [85000, 85000.5, "85000.50"])
+def test_number_accepts_numeric_values(salary_base):
+    compile_validator(OnboardEmployee)(dict(ONBOARD, salary_base=salary_base))
+
+
+@pytest.mark.parametrize("salary_base", ["lots", "nan", "inf", False])
+def test_number_rejects_other_values(salary_base):
+    with pytest.raises(ValueError, match="expected number"):
+        compile_validator(OnboardEmployee)(dict(ONBOARD, salary_base=salary_base))
@@ -0,0 +1,208 @@
+# Shared helpers for payroll_management tools
+from datetime import date
+from functools import wraps
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from ..approval_queue import approval_queues
+from ..org_chart import org_chart
+from ..permissions import ACTION_ROLES, Grant, permissions
+
+T = TypeVar("T")
+
+# Fixed "current time" used for audit entries (see hrpolicy.md)
+AUDIT_TIMESTAMP = "2025-10-01T00:00:00Z"
+# Fixed "current time" stamped on created_at/updated_at of written records
+TIMESTAMP = "2025-10-01T00:00:00"
+
+
+def transactional(tool: Type[T]) -> Type[T]:
+    """
+    Class decorator making a tool's invoke() atomic.
+
+    On a TableStore (data/store.py) the call runs inside data.transaction(), so a
+    tool that raises partway through (e.g. a failed SOP validation after some
+    writes) leaves no rows, fields or audit entries behind. Plain dicts run as-is.
+    """
+    invoke = tool.invoke
+
+    @wraps(invoke)
+    def atomic_invoke(data, *args, **kwargs):
+        begin = getattr(data, "transaction", None)
+        if begin is None:
+            return invoke(data, *args, **kwargs)
+        with begin():
+            return invoke(data, *args, **kwargs)
+
+    tool.invoke = staticmethod(atomic_invoke)
+    return tool
+
+
+def next_id(table: Dict[str, Any]) -> str:
+    """
+    Next primary id for `table` as a string ("1" when empty).
+
+    Store tables (data/store.py) keep a per-table sequence seeded once from the
+    loaded rows, so this is O(1) there; plain dicts fall back to a max-scan.
+    """
+    allocate = getattr(table, "next_id", None)
+    if allocate is not None:
+        return allocate()
+    if not table:
+        return "1"
+    return str(max(int(k) for k in table.keys()) + 1)
+
+
+def write_audit(
+    data: Dict[str, Any],
+    who: str,
+    table: str,
+    action: str,
+    record_id: str,
+    field: Optional[str] = None,
+    old_value: Any = None,
+    new_value: Any = None,
+):
+    logs = data.get("audit_logs", {})
+    append = getattr(logs, "append", None)
+    if append is not None:
+        # Columnar AuditLog (data/audit.py): append in place, no per-entry dict
+        append(who or "system", table, action, record_id, field, old_value, new_value, AUDIT_TIMESTAMP)
+        return
+    audit_id = next_id(logs)
+    logs[audit_id] = {
+        "audit_id": audit_id,
+        "user_id": who or "system",
+        "table_name": table,
+        "action": action,
+        "record_id": record_id,
+        "field": field,
+        "old_value": old_value,
+        "new_value": new_value,
+        "timestamp": AUDIT_TIMESTAMP
+    }
+    data["audit_logs"] = logs
+
+
+def iso_date(value: Any, message: str) -> str:
+    """
+    `value` as a canonical YYYY-MM-DD string, or ValueError(message).
+
+    On Python 3.11+ date.fromisoformat() also accepts other ISO 8601 spellings
+    (e.g. 20270120), while dates are compared, indexed and stored as strings,
+    so tools normalize every date argument here before using it.
+    """
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(message)
+
+
+def rows_where(table: Dict[str, Any], column: str, value: Any) -> List[Dict[str, Any]]:
+    """Rows of `table` whose `column` equals `value` (index lookup on store tables)."""
+    lookup = getattr(table, "rows_where", None)
+    if lookup is not None:
+        return lookup(column, value)
+    return [row for row in table.values() if row.get(column) == value]
+
+
+def _active_grant(data: Dict[str, Any], user_id: str) -> Grant:
+    grant = permissions(data).grant(str(user_id))
+    if grant is None:
+        raise ValueError(f"User {user_id} not found")
+    if grant.status != "active":
+        raise ValueError(f"User {user_id} is not active")
+    return grant
+
+
+def require_user(data: Dict[str, Any], user_id: str, *roles: str) -> Dict[str, Any]:
+    """
+    Validate that `user_id` is an active user holding one of `roles` (any role when
+    none are given). Raises ValueError otherwise; returns the user row.
+    """
+    grant = _active_grant(data, user_id)
+    if roles and grant.roles.isdisjoint(roles):
+        raise ValueError(f"User {user_id} must have role {' or '.join(roles)}")
+    return data["users"][str(user_id)]
+
+
+def require_permission(data: Dict[str, Any], user_id: str, action: str) -> Dict[str, Any]:
+    """
+    Validate that `user_id` is an active user whose roles allow `action`
+    (permissions.ROLE_ACTIONS). Raises ValueError otherwise; returns the user row.
+    """
+    if action not in _active_grant(data, user_id).actions:
+        raise ValueError(f"User {user_id} must have role {' or '.join(ACTION_ROLES[action])}")
+    return data["users"][str(user_id)]
+
+
+def has_permission(data: Dict[str, Any], user_id: str, action: str) -> bool:
+    """Whether `user_id` is active and allowed `action` (no error raised)."""
+    return permissions(data).can(str(user_id), action)
+
+
+def acts_for_employee(data: Dict[str, Any], user_id: str, employee: Dict[str, Any], action: str) -> bool:
+    """
+    Whether `user_id` may perform `action` on `employee`: on their own record,
+    through an organization-wide permission, or through manage_team when the
+    employee is below them in the reporting chain.
+    """
+    user_id = str(user_id)
+    if employee.get("user_id") == user_id or has_permission(data, user_id, action):
+        return True
+    return has_permission(data, user_id, "manage_team") and org_chart(data).is_above(user_id, employee.get("user_id"))
+
+
+def decide_approval(
+    data: Dict[str, Any], approval_id: str, acting_user_id: str, status: str, notes: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Move a pending approvals row to `status` ("approved" or "rejected") and audit it.
+
+    Only the assigned approver may decide, and never on their own request
+    (segregation of duties). Pending status is checked against the approval
+    queues (approval_queue.py), which the status change then keeps current.
+    """
+    require_user(data, acting_user_id)
+    approvals = data.get("approvals", {})
+    approval = approvals.get(str(approval_id))
+    if not approval:
+        raise ValueError(f"Approval {approval_id} not found")
+    if not approval_queues(data).is_pending(approval["approval_id"]):
+        raise ValueError(f"Approval {approval_id} is not pending")
+    if approval.get("approver_user_id") != str(acting_user_id):
+        raise ValueError(f"User {acting_user_id} is not the assigned approver of approval {approval_id}")
+    if approval.get("requested_by_user_id") == str(acting_user_id):
+        raise ValueError("Segregation of duties: approvers cannot decide their own requests")
+
+    approval["status"] = status
+    if notes is not None:
+        approval["notes"] = notes
+    approval["updated_at"] = TIMESTAMP
+    write_audit(data, acting_user_id, "approvals", "approve" if status == "approved" else "reject",
+                approval["approval_id"], "status", "pending", status)
+    return approval
+
+
+def set_user_status(
+    data: Dict[str, Any], user_id: str, acting_user_id: str, status: str, from_statuses: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """
+    Move a users row to `status` (SOP 19) and audit it; returns the user row.
+
+    The actor needs manage_access and may not change their own account; the
+    user must currently be in one of `from_statuses`. The status write drops
+    the user's cached permissions (permissions.py).
+    """
+    require_permission(data, acting_user_id, "manage_access")
+    user = data.get("users", {}).get(str(user_id))
+    if not user:
+        raise ValueError(f"User {user_id} not found")
+    if user["user_id"] == str(acting_user_id):
+        raise ValueError("Segregation of duties: users cannot change their own access")
+    previous = user.get("status")
+    if previous not in from_statuses:
+        raise ValueError(f"User {user_id} is {previous}; expected {' or '.join(from_statuses)}")
+    user["status"] = status
+    user["updated_at"] = TIMESTAMP
+    write_audit(data, acting_user_id, "users", "update", user["user_id"], "status", previous, status)
+    return user
@@ -14,6 +14,7 @@ from .approve_request import ApproveRequest
 from .reject_request import RejectRequest
 from .list_units import ListUnits
 from .lookup_user import LookupUser
+from .query_audit_trail import QueryAuditTrail
 
 ALL_TOOLS_INTERFACE_1: List[Type[Tool]] = [
     RegisterAccount,
@@ -27,5 +28,6 @@ ALL_TOOLS_INTERFACE_1: List[Type[Tool]] = [
     ApproveRequest,
     RejectRequest,
     ListUnits,
-    LookupUser
+    LookupUser,
+    QueryAuditTrail
 ]
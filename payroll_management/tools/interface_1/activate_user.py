@@ -1,34 +1,17 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import set_user_status, transactional
+from ..validation import validated
 
+@validated
+@transactional
 class ActivateUser(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "activate_user", "activate_user")
-        return json.dumps({"ok": True, "tool": "activate_user", "received": kwargs})
+    def invoke(data: Dict[str, Any], user_id: str, acting_user_id: str, reason: Optional[str] = None) -> str:
+        user = set_user_status(data, user_id, acting_user_id, "active", ("inactive", "suspended"))
+        return json.dumps({"user": user, "reason": reason})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +20,14 @@ class ActivateUser(Tool):
             "function": {
                 "name": "activate_user",
                 "description": "Set user status to active (reactivation).",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "user_id": {"type": "string", "description": "Inactive or suspended user to reactivate"},
+                        "acting_user_id": {"type": "string", "description": "HR director or IT administrator making the change (not the user themselves)"},
+                        "reason": {"type": "string", "description": "Optional reason for the change"}
+                    },
+                    "required": ["user_id", "acting_user_id"]
+                }
             }
         }
@@ -2,33 +2,34 @@ import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, require_permission, transactional, write_audit
+from ..validation import validated
+from ...permissions import ROLE_ACTIONS, user_roles
 
+@validated
+@transactional
 class AddRbacRole(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "add_rbac_role", "add_rbac_role")
-        return json.dumps({"ok": True, "tool": "add_rbac_role", "received": kwargs})
+    def invoke(data: Dict[str, Any], user_id: str, role: str, acting_user_id: str) -> str:
+        require_permission(data, acting_user_id, "manage_access")
+        user = data.get("users", {}).get(str(user_id))
+        if not user:
+            raise ValueError(f"User {user_id} not found")
+        if user["user_id"] == str(acting_user_id):
+            raise ValueError("Segregation of duties: users cannot elevate their own access")
+        if role not in ROLE_ACTIONS:
+            raise ValueError(f"Invalid role. Must be one of {list(ROLE_ACTIONS)}")
+        roles = user_roles(user)
+        if role in roles:
+            raise ValueError(f"User {user_id} already has role {role}")
+
+        # Additional roles live beside the primary users.role; a new list so the row write is seen
+        previous = list(user.get("additional_roles") or [])
+        user["additional_roles"] = previous + [role]
+        user["updated_at"] = TIMESTAMP
+        write_audit(data, acting_user_id, "users", "update", user["user_id"], "additional_roles",
+                    ",".join(previous), ",".join(user["additional_roles"]))
+        return json.dumps({"user": user, "roles": list(roles) + [role]})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +38,14 @@ class AddRbacRole(Tool):
             "function": {
                 "name": "add_rbac_role",
                 "description": "Grant an additional role to an existing user.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "user_id": {"type": "string", "description": "User receiving the role"},
+                        "role": {"type": "string", "description": "Role to grant (employee, manager, payroll_administrator, finance_officer, hr_director, it_administrator, compliance_officer)"},
+                        "acting_user_id": {"type": "string", "description": "HR director or IT administrator granting the role (not the user themselves)"}
+                    },
+                    "required": ["user_id", "role", "acting_user_id"]
+                }
             }
         }
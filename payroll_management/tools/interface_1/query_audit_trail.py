@@ -0,0 +1,69 @@
+import json
+from typing import Any, Dict, Optional
+from tau_bench.envs.tool import Tool
+
+from ..common import require_permission, write_audit
+from ..validation import validated
+from ...data.audit import AuditLog
+
+AUDIT_ACTIONS = ["create", "read", "update", "delete", "approve", "reject", "login", "logout", "export"]
+MAX_PAGE_SIZE = 500
+
+@validated
+class QueryAuditTrail(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], acting_user_id: str, user_id: Optional[str] = None,
+               table_name: Optional[str] = None, record_id: Optional[str] = None,
+               action: Optional[str] = None, start_time: Optional[str] = None,
+               end_time: Optional[str] = None, offset: int = 0, limit: int = 50) -> str:
+        require_permission(data, acting_user_id, "read_audit_trail")
+
+        if action is not None and action not in AUDIT_ACTIONS:
+            raise ValueError(f"Invalid action. Must be one of {AUDIT_ACTIONS}")
+        if start_time and end_time and start_time > end_time:
+            raise ValueError("start_time must not be after end_time")
+        offset, limit = int(offset), int(limit)
+        if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}")
+
+        logs = data.get("audit_logs", {})
+        if not isinstance(logs, AuditLog):
+            logs = AuditLog(logs)
+        total, entries = logs.query(
+            user_id=user_id, table_name=table_name, record_id=record_id, action=action,
+            start=start_time, end=end_time, offset=offset, limit=limit
+        )
+
+        write_audit(data, acting_user_id, "meta", "read", "query_audit_trail")
+        next_offset = offset + len(entries)
+        return json.dumps({
+            "total": total,
+            "offset": offset,
+            "next_offset": next_offset if next_offset < total else None,
+            "entries": entries
+        })
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "query_audit_trail",
+                "description": "Search audit log entries by user, table, record, action and time range (paginated).",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "acting_user_id": {"type": "string", "description": "Requester (compliance, IT, HR director or finance role)"},
+                        "user_id": {"type": "string", "description": "Only entries written by this user"},
+                        "table_name": {"type": "string", "description": "Only entries for this table (e.g., payroll_runs)"},
+                        "record_id": {"type": "string", "description": "Only entries for this record id"},
+                        "action": {"type": "string", "description": "Only this action (create, read, update, delete, approve, reject, login, logout, export)"},
+                        "start_time": {"type": "string", "description": "Inclusive lower ISO timestamp bound"},
+                        "end_time": {"type": "string", "description": "Inclusive upper ISO timestamp/date bound"},
+                        "offset": {"type": "integer", "description": "Number of matches to skip (default 0)"},
+                        "limit": {"type": "integer", "description": "Page size, 1-500 (default 50)"}
+                    },
+                    "required": ["acting_user_id"]
+                }
+            }
+        }
@@ -1,34 +1,45 @@
 import json
+import re
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
+from ..common import TIMESTAMP, next_id, require_permission, transactional, write_audit
+from ..validation import validated
+from ...email_index import email_index
+from ...permissions import ROLE_ACTIONS
 
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
+@validated
+@transactional
 class RegisterAccount(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "register_account", "register_account")
-        return json.dumps({"ok": True, "tool": "register_account", "received": kwargs})
+    def invoke(data: Dict[str, Any], email: str, full_name: str, role: str, acting_user_id: str) -> str:
+        require_permission(data, acting_user_id, "manage_access")
+        email = (email or "").strip()
+        if not EMAIL_PATTERN.match(email):
+            raise ValueError(f"Invalid email {email!r}")
+        if not full_name:
+            raise ValueError("full_name is required")
+        if role not in ROLE_ACTIONS:
+            raise ValueError(f"Invalid role. Must be one of {list(ROLE_ACTIONS)}")
+        if email_index(data).taken(email):
+            raise ValueError(f"Email {email} is already registered")
+
+        users = data.get("users", {})
+        user_id = next_id(users)
+        users[user_id] = {
+            "user_id": user_id,
+            "email": email,
+            "full_name": full_name,
+            "role": role,
+            "status": "active",
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP
+        }
+        data["users"] = users
+        write_audit(data, acting_user_id, "users", "create", user_id)
+        return json.dumps(users[user_id])
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +48,15 @@ class RegisterAccount(Tool):
             "function": {
                 "name": "register_account",
                 "description": "Provision a user account (validation, approvals, audit).",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "email": {"type": "string", "description": "Email address; must not already be registered (case-insensitive)"},
+                        "full_name": {"type": "string", "description": "User's full name"},
+                        "role": {"type": "string", "description": "employee, manager, payroll_administrator, finance_officer, hr_director, it_administrator or compliance_officer"},
+                        "acting_user_id": {"type": "string", "description": "HR director or IT administrator provisioning the account"}
+                    },
+                    "required": ["email", "full_name", "role", "acting_user_id"]
+                }
             }
         }
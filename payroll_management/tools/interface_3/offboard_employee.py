@@ -1,34 +1,49 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, require_permission, rows_where, transactional, write_audit
+from ..validation import validated
+from ...org_chart import org_chart
+from .set_manager import assign_manager, validate_manager
 
+@validated
+@transactional
 class OffboardEmployee(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "offboard_employee", "offboard_employee")
-        return json.dumps({"ok": True, "tool": "offboard_employee", "received": kwargs})
+    def invoke(data: Dict[str, Any], employee_id: str, acting_user_id: str,
+               reassign_to_user_id: Optional[str] = None) -> str:
+        user = require_permission(data, acting_user_id, "manage_employees")
+        employees = data.get("employees", {})
+        employee = employees.get(str(employee_id))
+        if not employee:
+            raise ValueError(f"Employee {employee_id} not found")
+        if employee["user_id"] == user["user_id"]:
+            raise ValueError("Segregation of duties: users cannot offboard themselves")
+        if employee.get("employment_status") == "terminated":
+            raise ValueError(f"Employee {employee_id} is already terminated")
+
+        # Direct reports move to reassign_to_user_id, else to the departing employee's own manager
+        chart = org_chart(data)
+        successor = reassign_to_user_id if reassign_to_user_id is not None else chart.manager(employee["user_id"])
+        if successor is not None:
+            successor = str(successor)
+            if successor == employee["user_id"] or chart.is_above(employee["user_id"], successor):
+                raise ValueError(f"User {successor} reports to the departing employee and cannot take over their reports")
+        reassigned = []
+        for report in rows_where(employees, "manager_user_id", employee["user_id"]):
+            if report["employee_id"] == employee["employee_id"]:
+                continue
+            manager = validate_manager(data, report["user_id"], successor) if successor is not None else None
+            if assign_manager(data, report, manager, user["user_id"]):
+                reassigned.append(report["employee_id"])
+
+        previous = employee.get("employment_status")
+        employee["employment_status"] = "terminated"
+        employee["updated_at"] = TIMESTAMP
+        write_audit(data, acting_user_id, "employees", "update", employee["employee_id"],
+                    "employment_status", previous, "terminated")
+        return json.dumps({"employee": employee, "reassigned_to": successor, "reassigned_employee_ids": reassigned})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +52,14 @@ class OffboardEmployee(Tool):
             "function": {
                 "name": "offboard_employee",
                 "description": "Terminate/Deactivate employee per SOP.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "string", "description": "Employee leaving"},
+                        "acting_user_id": {"type": "string", "description": "HR director offboarding the employee"},
+                        "reassign_to_user_id": {"type": "string", "description": "Manager taking over direct reports (defaults to the departing employee's manager)"}
+                    },
+                    "required": ["employee_id", "acting_user_id"]
+                }
             }
         }
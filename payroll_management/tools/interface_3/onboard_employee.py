@@ -1,34 +1,62 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, iso_date, next_id, require_permission, rows_where, transactional, write_audit
+from ..validation import validated
+from ...payroll_engine import PERIODS_PER_YEAR
+from .set_manager import validate_manager
 
+@validated
+@transactional
 class OnboardEmployee(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "onboard_employee", "onboard_employee")
-        return json.dumps({"ok": True, "tool": "onboard_employee", "received": kwargs})
+    def invoke(data: Dict[str, Any], user_id: str, department: str, hire_date: str, acting_user_id: str,
+               manager_user_id: Optional[str] = None, salary_base: Optional[float] = None,
+               pay_frequency: str = "monthly") -> str:
+        require_permission(data, acting_user_id, "manage_employees")
+        user_id = str(user_id)
+        user = data.get("users", {}).get(user_id)
+        if not user:
+            raise ValueError(f"User {user_id} not found")
+        if user.get("status") != "active":
+            raise ValueError(f"User {user_id} is not active")
+        employees = data.get("employees", {})
+        if rows_where(employees, "user_id", user_id):
+            raise ValueError(f"User {user_id} is already bound to an employee record")
+        if not department:
+            raise ValueError("department is required")
+        hire_date = iso_date(hire_date, "hire_date must be YYYY-MM-DD")
+        if hire_date < TIMESTAMP[:10]:
+            raise ValueError("hire_date must not be in the past")
+        if pay_frequency not in PERIODS_PER_YEAR:
+            raise ValueError(f"Invalid pay_frequency. Must be one of {list(PERIODS_PER_YEAR)}")
+        if salary_base is not None:
+            try:
+                salary_base = round(float(salary_base), 2)
+            except (TypeError, ValueError):
+                raise ValueError("salary_base must be a number")
+            if salary_base < 0:
+                raise ValueError("salary_base must not be negative")
+        if manager_user_id is not None:
+            manager_user_id = validate_manager(data, user_id, manager_user_id)
+
+        employee_id = next_id(employees)
+        employees[employee_id] = {
+            "employee_id": employee_id,
+            "user_id": user_id,
+            "manager_user_id": manager_user_id,
+            "department": department,
+            "hire_date": hire_date,
+            "employment_status": "active",
+            "salary_base": salary_base,
+            "pay_frequency": pay_frequency,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP
+        }
+        data["employees"] = employees
+        write_audit(data, acting_user_id, "employees", "create", employee_id)
+        return json.dumps(employees[employee_id])
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +65,18 @@ class OnboardEmployee(Tool):
             "function": {
                 "name": "onboard_employee",
                 "description": "Onboard a new employee (creates employee record).",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "user_id": {"type": "string", "description": "Existing active user not yet bound to an employee"},
+                        "department": {"type": "string", "description": "Department the employee joins"},
+                        "hire_date": {"type": "string", "description": "YYYY-MM-DD, not in the past"},
+                        "acting_user_id": {"type": "string", "description": "HR director onboarding the employee"},
+                        "manager_user_id": {"type": "string", "description": "Optional manager's user ID"},
+                        "salary_base": {"type": "number", "description": "Optional annual base salary"},
+                        "pay_frequency": {"type": "string", "description": "weekly, biweekly, semimonthly or monthly (default monthly)"}
+                    },
+                    "required": ["user_id", "department", "hire_date", "acting_user_id"]
+                }
             }
         }
@@ -1,34 +1,75 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
+from ..common import TIMESTAMP, has_permission, require_user, transactional, write_audit
+from ..validation import validated
+from ...org_chart import org_chart
 
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+def authorize_employee_change(data: Dict[str, Any], acting_user_id: str, employee: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    HR directors may change any employee record; other users only records of
+    employees below them in the reporting chain, and nobody their own.
+    Returns the acting user's row.
+    """
+    user = require_user(data, acting_user_id)
+    if employee.get("user_id") == user["user_id"]:
+        raise ValueError("Segregation of duties: users cannot change their own employee record")
+    if not has_permission(data, user["user_id"], "manage_employees") \
+            and not org_chart(data).is_above(user["user_id"], employee.get("user_id")):
+        raise ValueError(f"User {acting_user_id} is not in employee {employee['employee_id']}'s management chain")
+    return user
 
+def validate_manager(data: Dict[str, Any], user_id: str, manager_user_id: str,
+                     acting_user_id: Optional[str] = None) -> str:
+    """
+    Check that `manager_user_id` may manage `user_id`: an active user who is
+    not the user and not below them in the chart (which would close a cycle).
+    With `acting_user_id` lacking manage_employees, the manager must also be
+    the actor or someone below them. Returns the normalized manager_user_id.
+    """
+    manager_user_id = str(manager_user_id)
+    manager = data.get("users", {}).get(manager_user_id)
+    if not manager:
+        raise ValueError(f"Manager user {manager_user_id} not found")
+    if manager.get("status") != "active":
+        raise ValueError(f"Manager user {manager_user_id} is not active")
+    chart = org_chart(data)
+    if manager_user_id == user_id or chart.is_above(user_id, manager_user_id):
+        raise ValueError(f"User {manager_user_id} reports to user {user_id}; the change would create a reporting cycle")
+    if acting_user_id is not None and not has_permission(data, acting_user_id, "manage_employees") \
+            and manager_user_id != acting_user_id and not chart.is_above(acting_user_id, manager_user_id):
+        raise ValueError(f"User {acting_user_id} may only assign managers within their own reporting chain")
+    return manager_user_id
+
+def assign_manager(data: Dict[str, Any], employee: Dict[str, Any], manager_user_id: Optional[str],
+                   acting_user_id: str) -> bool:
+    """Set an employee's (already validated) manager and audit it; returns whether it changed."""
+    previous = employee.get("manager_user_id")
+    if previous == manager_user_id:
+        return False
+    employee["manager_user_id"] = manager_user_id
+    employee["updated_at"] = TIMESTAMP
+    write_audit(data, acting_user_id, "employees", "update", employee["employee_id"],
+                "manager_user_id", previous, manager_user_id)
+    return True
+
+@validated
+@transactional
 class SetManager(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "set_manager", "set_manager")
-        return json.dumps({"ok": True, "tool": "set_manager", "received": kwargs})
+    def invoke(data: Dict[str, Any], employee_id: str, manager_user_id: str, acting_user_id: str) -> str:
+        employee = data.get("employees", {}).get(str(employee_id))
+        if not employee:
+            raise ValueError(f"Employee {employee_id} not found")
+        user = authorize_employee_change(data, acting_user_id, employee)
+        manager_user_id = validate_manager(data, employee["user_id"], manager_user_id, user["user_id"])
+        changed = assign_manager(data, employee, manager_user_id, user["user_id"])
+        return json.dumps({
+            "employee": employee,
+            "changed": changed,
+            "management_chain": list(org_chart(data).chain(employee["user_id"]))
+        })
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +78,14 @@ class SetManager(Tool):
             "function": {
                 "name": "set_manager",
                 "description": "Set or change an employee's manager.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "string", "description": "Employee whose manager changes"},
+                        "manager_user_id": {"type": "string", "description": "User ID of the new manager (must not report to the employee)"},
+                        "acting_user_id": {"type": "string", "description": "HR director, or a manager above the employee in the reporting chain"}
+                    },
+                    "required": ["employee_id", "manager_user_id", "acting_user_id"]
+                }
             }
         }
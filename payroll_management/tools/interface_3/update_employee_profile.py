@@ -1,34 +1,58 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, transactional, write_audit
+from ..validation import validated
+from ...payroll_engine import PERIODS_PER_YEAR
+from .set_manager import assign_manager, authorize_employee_change, validate_manager
 
+@validated
+@transactional
 class UpdateEmployeeProfile(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "update_employee_profile", "update_employee_profile")
-        return json.dumps({"ok": True, "tool": "update_employee_profile", "received": kwargs})
+    def invoke(data: Dict[str, Any], employee_id: str, acting_user_id: str, department: Optional[str] = None,
+               salary_base: Optional[float] = None, pay_frequency: Optional[str] = None,
+               manager_user_id: Optional[str] = None) -> str:
+        employee = data.get("employees", {}).get(str(employee_id))
+        if not employee:
+            raise ValueError(f"Employee {employee_id} not found")
+        user = authorize_employee_change(data, acting_user_id, employee)
+
+        changes: Dict[str, Any] = {}
+        if department is not None:
+            if not department:
+                raise ValueError("department must not be empty")
+            changes["department"] = department
+        if salary_base is not None:
+            try:
+                changes["salary_base"] = round(float(salary_base), 2)
+            except (TypeError, ValueError):
+                raise ValueError("salary_base must be a number")
+            if changes["salary_base"] < 0:
+                raise ValueError("salary_base must not be negative")
+        if pay_frequency is not None:
+            if pay_frequency not in PERIODS_PER_YEAR:
+                raise ValueError(f"Invalid pay_frequency. Must be one of {list(PERIODS_PER_YEAR)}")
+            changes["pay_frequency"] = pay_frequency
+        if manager_user_id is not None:
+            manager_user_id = validate_manager(data, employee["user_id"], manager_user_id, user["user_id"])
+        elif not changes:
+            raise ValueError("No profile fields to update")
+
+        updated = []
+        for field, value in changes.items():
+            previous = employee.get(field)
+            if previous == value:
+                continue
+            employee[field] = value
+            write_audit(data, user["user_id"], "employees", "update", employee["employee_id"], field, previous, value)
+            updated.append(field)
+        if updated:
+            employee["updated_at"] = TIMESTAMP
+        if manager_user_id is not None and assign_manager(data, employee, manager_user_id, user["user_id"]):
+            updated.append("manager_user_id")
+        return json.dumps({"employee": employee, "updated_fields": updated})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +61,17 @@ class UpdateEmployeeProfile(Tool):
             "function": {
                 "name": "update_employee_profile",
                 "description": "Update employee fields with manager-chain checks.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "string", "description": "Employee to update"},
+                        "acting_user_id": {"type": "string", "description": "HR director, or a manager above the employee in the reporting chain (not the employee)"},
+                        "department": {"type": "string", "description": "New department"},
+                        "salary_base": {"type": "number", "description": "New annual base salary (non-negative)"},
+                        "pay_frequency": {"type": "string", "description": "weekly, biweekly, semimonthly or monthly"},
+                        "manager_user_id": {"type": "string", "description": "New manager's user ID (within the actor's chain unless HR director)"}
+                    },
+                    "required": ["employee_id", "acting_user_id"]
+                }
             }
         }
@@ -14,6 +14,9 @@ from .update_reimbursement import UpdateReimbursement
 from .list_timesheets import ListTimesheets
 from .compute_leave_balance import ComputeLeaveBalance
 from .gen_payroll_line_items import GenPayrollLineItems
+from .run_payroll import RunPayroll
+from .export_payroll_report import ExportPayrollReport
+from .get_payroll_rollup import GetPayrollRollup
 
 ALL_TOOLS_INTERFACE_4: List[Type[Tool]] = [
     SubmitTimesheet,
@@ -27,5 +30,8 @@ ALL_TOOLS_INTERFACE_4: List[Type[Tool]] = [
     UpdateReimbursement,
     ListTimesheets,
     ComputeLeaveBalance,
-    GenPayrollLineItems
+    GenPayrollLineItems,
+    RunPayroll,
+    ExportPayrollReport,
+    GetPayrollRollup
 ]
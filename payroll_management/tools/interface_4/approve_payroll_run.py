@@ -2,33 +2,35 @@ import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
+from ..common import TIMESTAMP, require_permission, transactional, write_audit
+from ..validation import validated
 
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+def validate_approval(run: Dict[str, Any], approved_by_user_id: str) -> None:
+    """SOP 7 checks on a run: draft status and segregation of duties (approver != initiator)."""
+    if run.get("status") != "draft":
+        raise ValueError(f"Payroll run {run['payroll_run_id']} must be in draft status")
+    if str(approved_by_user_id) == str(run.get("initiated_by_user_id")):
+        raise ValueError("Segregation of duties: approver must differ from the run initiator")
 
+def approve_run(data: Dict[str, Any], run: Dict[str, Any], approved_by_user_id: str) -> Dict[str, Any]:
+    """Mark a validated run approved and audit it; returns the run."""
+    run["status"] = "approved"
+    run["approved_by_user_id"] = approved_by_user_id
+    run["updated_at"] = TIMESTAMP
+    write_audit(data, approved_by_user_id, "payroll_runs", "approve", run["payroll_run_id"])
+    return run
+
+@validated
+@transactional
 class ApprovePayrollRun(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "approve_payroll_run", "approve_payroll_run")
-        return json.dumps({"ok": True, "tool": "approve_payroll_run", "received": kwargs})
+    def invoke(data: Dict[str, Any], payroll_run_id: str, approved_by_user_id: str) -> str:
+        require_permission(data, approved_by_user_id, "approve_payroll_run")
+        run = data.get("payroll_runs", {}).get(str(payroll_run_id))
+        if not run:
+            raise ValueError(f"Payroll run {payroll_run_id} not found")
+        validate_approval(run, approved_by_user_id)
+        return json.dumps(approve_run(data, run, approved_by_user_id))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +39,13 @@ class ApprovePayrollRun(Tool):
             "function": {
                 "name": "approve_payroll_run",
                 "description": "Approve a draft payroll run (Finance approval).",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "payroll_run_id": {"type": "string", "description": "ID of the draft payroll run"},
+                        "approved_by_user_id": {"type": "string", "description": "Finance officer approving; must not be the run initiator"}
+                    },
+                    "required": ["payroll_run_id", "approved_by_user_id"]
+                }
             }
         }
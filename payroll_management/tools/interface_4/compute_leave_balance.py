@@ -1,34 +1,34 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, acts_for_employee, iso_date, require_user, write_audit
+from ..validation import validated
+from ...leave_ledger import LEAVE_TYPES, leave_ledger
 
+@validated
 class ComputeLeaveBalance(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "compute_leave_balance", "compute_leave_balance")
-        return json.dumps({"ok": True, "tool": "compute_leave_balance", "received": kwargs})
+    def invoke(data: Dict[str, Any], employee_id: str, acting_user_id: str,
+               leave_type: Optional[str] = None, as_of_date: Optional[str] = None) -> str:
+        user = require_user(data, acting_user_id)
+        employee = data.get("employees", {}).get(str(employee_id))
+        if not employee:
+            raise ValueError(f"Employee {employee_id} not found")
+        if not acts_for_employee(data, user["user_id"], employee, "read_leave_balances"):
+            raise ValueError(f"User {acting_user_id} may not view leave for employee {employee_id}")
+        if leave_type is not None and leave_type not in LEAVE_TYPES:
+            raise ValueError(f"Invalid leave_type. Must be one of {list(LEAVE_TYPES)}")
+        as_of = iso_date(as_of_date or TIMESTAMP[:10], "as_of_date must be YYYY-MM-DD")
+
+        ledger = leave_ledger(data)
+        balances = [
+            ledger.balance(employee["employee_id"], t, as_of, employee.get("hire_date"))
+            for t in ([leave_type] if leave_type else LEAVE_TYPES)
+        ]
+
+        write_audit(data, acting_user_id, "leave_requests", "read", employee["employee_id"])
+        return json.dumps({"employee_id": employee["employee_id"], "as_of_date": as_of, "balances": balances})
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +37,15 @@ class ComputeLeaveBalance(Tool):
             "function": {
                 "name": "compute_leave_balance",
                 "description": "Compute available leave for an employee in 2025.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "string", "description": "Employee whose balances to compute"},
+                        "acting_user_id": {"type": "string", "description": "The employee's own user, a manager above them in the reporting chain, HR director or payroll administrator"},
+                        "leave_type": {"type": "string", "description": "Optional single leave type (annual, sick, fmla, personal, bereavement, jury_duty)"},
+                        "as_of_date": {"type": "string", "description": "Balance date YYYY-MM-DD (defaults to 2025-10-01)"}
+                    },
+                    "required": ["employee_id", "acting_user_id"]
+                }
             }
         }
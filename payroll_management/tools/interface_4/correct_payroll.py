@@ -1,34 +1,75 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, has_permission, next_id, require_user, rows_where, transactional, write_audit
+from ..validation import validated
+from ...line_item_tracker import line_item_tracker
+from ...payroll_engine import CORRECTABLE_FIELDS, compute_line_items
+from .gen_payroll_line_items import write_line_items
 
+@validated
+@transactional
 class CorrectPayroll(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "correct_payroll", "correct_payroll")
-        return json.dumps({"ok": True, "tool": "correct_payroll", "received": kwargs})
+    def invoke(data: Dict[str, Any], employee_id: str, field_changed: str, old_value: float, new_value: float,
+               reason: str, approved_by_user_id: str, payroll_run_id: Optional[str] = None) -> str:
+        approver = require_user(data, approved_by_user_id)
+        if not has_permission(data, approver["user_id"], "approve_correction"):
+            raise ValueError("Finance Officer approval required")
+        employee_id = str(employee_id)
+        if not data.get("employees", {}).get(employee_id):
+            raise ValueError(f"Employee {employee_id} not found")
+        run = None
+        if payroll_run_id is not None:
+            run = data.get("payroll_runs", {}).get(str(payroll_run_id))
+            if not run:
+                raise ValueError(f"Payroll run {payroll_run_id} not found")
+        if field_changed not in CORRECTABLE_FIELDS:
+            raise ValueError(f"Invalid field_changed. Must be one of {list(CORRECTABLE_FIELDS)}")
+        try:
+            old_value, new_value = round(float(old_value), 2), round(float(new_value), 2)
+        except (TypeError, ValueError):
+            raise ValueError("old_value and new_value must be numbers")
+        if old_value < 0 or new_value < 0:
+            raise ValueError("old_value and new_value must not be negative")
+        if not reason:
+            raise ValueError("reason is required")
+
+        item = None
+        if run is not None:
+            item = next((li for li in rows_where(data.get("payroll_line_items", {}), "employee_id", employee_id)
+                         if li.get("payroll_run_id") == run["payroll_run_id"]), None)
+            if item is not None and round(float(item.get(field_changed) or 0.0), 2) != old_value:
+                raise ValueError(f"old_value does not match the line item's current {field_changed}")
+
+        corrections = data.setdefault("payroll_corrections", {})
+        correction_id = next_id(corrections)
+        corrections[correction_id] = {
+            "correction_id": correction_id,
+            "payroll_run_id": run["payroll_run_id"] if run else None,
+            "employee_id": employee_id,
+            "reason": reason,
+            "field_changed": field_changed,
+            "old_value": str(old_value),
+            "new_value": str(new_value),
+            "approved_by_user_id": approver["user_id"],
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP
+        }
+        write_audit(data, approved_by_user_id, "payroll_corrections", "update", correction_id,
+                    field_changed, str(old_value), str(new_value))
+
+        # On a draft run, recompute just this employee's line item (corrections are applied on top)
+        if item is not None and run.get("status") == "draft":
+            results = compute_line_items(data, run, employee_ids=[employee_id])
+            write_line_items(data, run, results, approved_by_user_id, employee_ids=[employee_id])
+            line_item_tracker(data).clean(run["payroll_run_id"], [employee_id])
+
+        return json.dumps({
+            "correction": corrections[correction_id],
+            "line_item": dict(item) if item is not None else None
+        })
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +78,18 @@ class CorrectPayroll(Tool):
             "function": {
                 "name": "correct_payroll",
                 "description": "Create a payroll correction entry.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "string", "description": "Employee being corrected"},
+                        "field_changed": {"type": "string", "description": "gross_pay, total_deductions or net_pay"},
+                        "old_value": {"type": "number", "description": "Current value (must match the run's line item when there is one)"},
+                        "new_value": {"type": "number", "description": "Corrected value (non-negative)"},
+                        "reason": {"type": "string", "description": "Why the correction is made"},
+                        "approved_by_user_id": {"type": "string", "description": "Finance officer approving the correction"},
+                        "payroll_run_id": {"type": "string", "description": "Run being corrected (omit for an off-cycle correction)"}
+                    },
+                    "required": ["employee_id", "field_changed", "old_value", "new_value", "reason", "approved_by_user_id"]
+                }
             }
         }
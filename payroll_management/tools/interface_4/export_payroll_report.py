@@ -0,0 +1,74 @@
+import json
+from typing import Any, Dict, List, Optional
+from tau_bench.envs.tool import Tool
+
+from ..common import iso_date, require_permission, write_audit
+from ..validation import validated
+from ...reporting import EXPORT_FORMATS, REPORT_TYPES, build_report
+
+MAX_CHUNK_ROWS = 5000
+
+@validated
+class ExportPayrollReport(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], report_type: str, period_start: str, period_end: str, acting_user_id: str,
+               format: str = "csv", group_by: Optional[List[str]] = None, department: Optional[str] = None,
+               employee_id: Optional[str] = None, chunk: int = 0, chunk_rows: int = 1000) -> str:
+        require_permission(data, acting_user_id, "read_payroll_reports")
+        if report_type not in REPORT_TYPES:
+            raise ValueError(f"Invalid report_type. Must be one of {list(REPORT_TYPES)}")
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Invalid format. Must be one of {list(EXPORT_FORMATS)}")
+        message = "period_start and period_end must be YYYY-MM-DD"
+        period_start, period_end = iso_date(period_start, message), iso_date(period_end, message)
+        if period_start > period_end:
+            raise ValueError("period_start must not be after period_end")
+        chunk, chunk_rows = int(chunk), int(chunk_rows)
+        if chunk < 0 or not 1 <= chunk_rows <= MAX_CHUNK_ROWS:
+            raise ValueError(f"chunk must be >= 0 and chunk_rows between 1 and {MAX_CHUNK_ROWS}")
+        if employee_id is not None and not data.get("employees", {}).get(str(employee_id)):
+            raise ValueError(f"Employee {employee_id} not found")
+
+        report = build_report(data, report_type, period_start, period_end, group_by, department,
+                              None if employee_id is None else str(employee_id))
+        if chunk and chunk * chunk_rows >= len(report):
+            raise ValueError(f"chunk {chunk} is past the end of the report")
+        content = next(report.chunks(format, chunk_rows, chunk), "")
+
+        # Creating the report is audited once; fetching further chunks is an export
+        write_audit(data, acting_user_id, "reports", "create" if chunk == 0 else "export", report_type)
+        return json.dumps({
+            "report_type": report_type,
+            "format": format,
+            "columns": report.columns,
+            "total_rows": len(report),
+            "chunk": chunk,
+            "next_chunk": chunk + 1 if (chunk + 1) * chunk_rows < len(report) else None,
+            "content": content
+        })
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "export_payroll_report",
+                "description": "Payroll period or deduction summary for a date window, exported as CSV/NDJSON in chunks.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "report_type": {"type": "string", "description": "payroll_period_summary or deduction_summary"},
+                        "period_start": {"type": "string", "description": "Window start (YYYY-MM-DD); runs overlapping the window are included"},
+                        "period_end": {"type": "string", "description": "Window end (YYYY-MM-DD)"},
+                        "acting_user_id": {"type": "string", "description": "Finance officer, payroll administrator or HR director"},
+                        "format": {"type": "string", "description": "csv or ndjson (default csv)"},
+                        "group_by": {"type": "array", "items": {"type": "string"}, "description": "Columns to group by; payroll_period_summary: payroll_run_id, period_start, period_end, status, department, employee_id; deduction_summary: payroll_run_id, department, employee_id, deduction_type, method"},
+                        "department": {"type": "string", "description": "Only employees of this department"},
+                        "employee_id": {"type": "string", "description": "Only this employee"},
+                        "chunk": {"type": "integer", "description": "0-based chunk to return (default 0); follow next_chunk"},
+                        "chunk_rows": {"type": "integer", "description": "Rows per chunk, 1-5000 (default 1000)"}
+                    },
+                    "required": ["report_type", "period_start", "period_end", "acting_user_id"]
+                }
+            }
+        }
@@ -1,34 +1,121 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional, Tuple
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
+from ..common import TIMESTAMP, next_id, require_permission, rows_where, transactional, write_audit
+from ..validation import validated
+from ...line_item_tracker import line_item_tracker
+from ...payroll_engine import PERIODS_PER_YEAR, compute_line_items
+
+def write_line_items(
+    data: Dict[str, Any], run: Dict[str, Any], results: Dict[str, Dict[str, float]], acting_user_id: str,
+    employee_ids: Optional[Iterable[str]] = None, pay_frequency: Optional[str] = None
+) -> Tuple[int, int, int]:
+    """
+    Create/replace one line item per employee of `results` for this run, and
+    delete the run's line items of employees no longer payable (e.g. terminated).
+
+    `employee_ids` limits the existing line items looked up to those employees
+    (an incremental recompute); all of the run's are read otherwise. When
+    `pay_frequency` narrows a run covering every pay group, only line items of
+    employees in that group are considered for deletion.
+    Returns (created, updated, deleted).
+    """
+    line_items = data.get("payroll_line_items", {})
+    if employee_ids is None:
+        existing = rows_where(line_items, "payroll_run_id", run["payroll_run_id"])
+    else:
+        existing = [li for employee_id in employee_ids for li in rows_where(line_items, "employee_id", employee_id)
+                    if li.get("payroll_run_id") == run["payroll_run_id"]]
+    existing = {li.get("employee_id"): li for li in existing}
+    employees = data.get("employees", {})
+    narrowed = pay_frequency is not None and run.get("pay_frequency") != pay_frequency
+    stale = [
+        li for employee_id, li in existing.items()
+        if employee_id not in results
+        and (not narrowed or (employees.get(employee_id) or {}).get("pay_frequency") == pay_frequency)
+    ]
+    created = updated = 0
+    with line_item_tracker(data).writing():
+        for item in stale:
+            del line_items[item["line_item_id"]]
+            write_audit(data, acting_user_id, "payroll_line_items", "delete", item["line_item_id"])
+        for employee_id, amounts in results.items():
+            item = existing.get(employee_id)
+            if item is None:
+                line_item_id = next_id(line_items)
+                line_items[line_item_id] = {
+                    "line_item_id": line_item_id,
+                    "payroll_run_id": run["payroll_run_id"],
+                    "employee_id": employee_id,
+                    **amounts,
+                    "created_at": TIMESTAMP,
+                    "updated_at": TIMESTAMP
+                }
+                write_audit(data, acting_user_id, "payroll_line_items", "create", line_item_id)
+                created += 1
+            else:
+                item.update(amounts)
+                item["updated_at"] = TIMESTAMP
+                write_audit(data, acting_user_id, "payroll_line_items", "update", item["line_item_id"])
+                updated += 1
+    data["payroll_line_items"] = line_items
+    return created, updated, len(stale)
+
+def generate_line_items(data: Dict[str, Any], run: Dict[str, Any], acting_user_id: str,
+                        pay_frequency: Optional[str] = None, only_changed: bool = False) -> Dict[str, Any]:
+    """
+    Compute and write the line items of a validated draft run (SOP 6); returns the summary.
+
+    With only_changed, only employees whose timesheets, deductions, corrections
+    or employee row changed since the run was last generated are recomputed; a
+    run that is not being tracked yet falls back to a full generation.
+    """
+    # A run started for one pay group only ever covers that group
+    pay_frequency = pay_frequency or run.get("pay_frequency")
+    tracker = line_item_tracker(data)
+    incremental = only_changed and tracker.is_tracked(run["payroll_run_id"], pay_frequency)
+    if incremental:
+        dirty = tracker.take(run["payroll_run_id"])
+        results = compute_line_items(data, run, pay_frequency, employee_ids=dirty)
+        created, updated, deleted = write_line_items(data, run, results, acting_user_id, dirty, pay_frequency)
+    else:
+        results = compute_line_items(data, run, pay_frequency)
+        created, updated, deleted = write_line_items(data, run, results, acting_user_id, pay_frequency=pay_frequency)
+        tracker.generated(run["payroll_run_id"], pay_frequency)
+
+    return {
+        "payroll_run_id": run["payroll_run_id"],
+        "incremental": incremental,
+        "employees": len(results),
+        "created": created,
+        "updated": updated,
+        "deleted": deleted,
+        "gross_pay": round(sum(r["gross_pay"] for r in results.values()), 2),
+        "total_deductions": round(sum(r["total_deductions"] for r in results.values()), 2),
+        "net_pay": round(sum(r["net_pay"] for r in results.values()), 2)
     }
-    data["audit_logs"] = logs
 
+@validated
+@transactional
 class GenPayrollLineItems(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "gen_payroll_line_items", "gen_payroll_line_items")
-        return json.dumps({"ok": True, "tool": "gen_payroll_line_items", "received": kwargs})
+    def invoke(data: Dict[str, Any], payroll_run_id: str, acting_user_id: str,
+               pay_frequency: Optional[str] = None, only_changed: bool = False) -> str:
+        require_permission(data, acting_user_id, "generate_line_items")
+
+        runs = data.get("payroll_runs", {})
+        run = runs.get(str(payroll_run_id))
+        if not run:
+            raise ValueError(f"Payroll run {payroll_run_id} not found")
+        if run.get("status") != "draft":
+            raise ValueError(f"Payroll run {payroll_run_id} must be in draft status")
+        if pay_frequency is not None and pay_frequency not in PERIODS_PER_YEAR:
+            raise ValueError(f"Invalid pay_frequency. Must be one of {list(PERIODS_PER_YEAR)}")
+        if pay_frequency is not None and run.get("pay_frequency") not in (None, pay_frequency):
+            raise ValueError(f"Payroll run {payroll_run_id} covers the {run['pay_frequency']} pay group only")
+
+        return json.dumps(generate_line_items(data, run, acting_user_id, pay_frequency, only_changed))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +124,15 @@ class GenPayrollLineItems(Tool):
             "function": {
                 "name": "gen_payroll_line_items",
                 "description": "Aggregate approved hours into line items (draft).",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "payroll_run_id": {"type": "string", "description": "ID of the draft payroll run"},
+                        "acting_user_id": {"type": "string", "description": "Payroll administrator generating the line items"},
+                        "pay_frequency": {"type": "string", "description": "Optional pay group filter (weekly, biweekly, semimonthly, monthly); defaults to the run's pay group"},
+                        "only_changed": {"type": "boolean", "description": "Recompute only employees whose inputs changed since the last generation (default false)"}
+                    },
+                    "required": ["payroll_run_id", "acting_user_id"]
+                }
             }
         }
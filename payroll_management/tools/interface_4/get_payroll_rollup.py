@@ -0,0 +1,44 @@
+import json
+from typing import Any, Dict, Optional
+from tau_bench.envs.tool import Tool
+
+from ..common import require_permission, write_audit
+from ..validation import validated
+from ...rollups import department_rollups
+
+@validated
+class GetPayrollRollup(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], payroll_run_id: str, acting_user_id: str, department: Optional[str] = None) -> str:
+        require_permission(data, acting_user_id, "read_payroll_reports")
+        run = data.get("payroll_runs", {}).get(str(payroll_run_id))
+        if not run:
+            raise ValueError(f"Payroll run {payroll_run_id} not found")
+
+        rollups = department_rollups(data)
+        departments = [department] if department is not None else rollups.departments(run["payroll_run_id"])
+        write_audit(data, acting_user_id, "payroll_runs", "read", run["payroll_run_id"])
+        return json.dumps({
+            "payroll_run_id": run["payroll_run_id"],
+            "status": run.get("status"),
+            "departments": [rollups.rollup(run["payroll_run_id"], d) for d in departments]
+        })
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "get_payroll_rollup",
+                "description": "Per-department gross/deductions/net totals of a payroll run.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "payroll_run_id": {"type": "string", "description": "Payroll run to summarize"},
+                        "acting_user_id": {"type": "string", "description": "Finance officer, payroll administrator or HR director"},
+                        "department": {"type": "string", "description": "Only this department"}
+                    },
+                    "required": ["payroll_run_id", "acting_user_id"]
+                }
+            }
+        }
@@ -1,34 +1,78 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
+from ..common import has_permission, iso_date, require_user, rows_where, write_audit
+from ..validation import validated
+from ...data.store import peek_row
+from ...date_index import decode_cursor, encode_cursor, timesheet_dates
+from ...org_chart import org_chart
 
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+TIMESHEET_STATUSES = ["submitted", "approved", "rejected"]
+MAX_PAGE_SIZE = 500
 
+@validated
 class ListTimesheets(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "list_timesheets", "list_timesheets")
-        return json.dumps({"ok": True, "tool": "list_timesheets", "received": kwargs})
+    def invoke(data: Dict[str, Any], acting_user_id: str, employee_id: Optional[str] = None,
+               start_date: Optional[str] = None, end_date: Optional[str] = None,
+               status: Optional[str] = None, limit: int = 50, cursor: Optional[str] = None) -> str:
+        user = require_user(data, acting_user_id)
+        if status is not None and status not in TIMESHEET_STATUSES:
+            raise ValueError(f"Invalid status. Must be one of {TIMESHEET_STATUSES}")
+        message = "start_date and end_date must be YYYY-MM-DD"
+        start_date = iso_date(start_date, message) if start_date else None
+        end_date = iso_date(end_date, message) if end_date else None
+        if start_date and end_date and start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+        limit = int(limit)
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+        after = decode_cursor(cursor) if cursor else None
+
+        # Employees the requester may see: everyone, their reporting subtree plus themselves, or only themselves
+        employees = data.get("employees", {})
+        index = timesheet_dates(data)
+        if has_permission(data, user["user_id"], "read_timesheets"):
+            visible = None
+        else:
+            user_ids = [user["user_id"]]
+            if has_permission(data, user["user_id"], "manage_team"):
+                user_ids += org_chart(data).reports(user["user_id"])
+            visible = {e["employee_id"] for u in user_ids for e in rows_where(employees, "user_id", u)}
+        if employee_id is not None:
+            employee_id = str(employee_id)
+            if not peek_row(employees, employee_id):
+                raise ValueError(f"Employee {employee_id} not found")
+            if visible is not None and employee_id not in visible:
+                raise ValueError(f"User {acting_user_id} may not view timesheets for employee {employee_id}")
+            groups = [employee_id]
+        else:
+            groups = index.groups() if visible is None else visible
+        # A cursor from another listing (other employees or dates) would silently skip or repeat rows
+        if after is not None and (after[0] not in groups or (start_date and after[1] < start_date)
+                                  or (end_date and after[1] > end_date)):
+            raise ValueError("Invalid cursor: it does not belong to this listing")
+
+        timesheets = data.get("timesheets", {})
+        page, last = [], None
+        more = False
+        for position in index.window(groups, start_date, end_date, after):
+            row = peek_row(timesheets, position[2])
+            if status is not None and row.get("status") != status:
+                continue
+            if len(page) == limit:
+                more = True
+                break
+            page.append(dict(row))
+            last = position
+
+        write_audit(data, acting_user_id, "meta", "read", "list_timesheets")
+        return json.dumps({
+            "count": len(page),
+            "next_cursor": encode_cursor(last) if more else None,
+            "timesheets": page
+        })
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +81,18 @@ class ListTimesheets(Tool):
             "function": {
                 "name": "list_timesheets",
                 "description": "List timesheets by employee/date window.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "acting_user_id": {"type": "string", "description": "Requester; employees see their own, managers their team, HR/payroll/finance/compliance everyone"},
+                        "employee_id": {"type": "string", "description": "Only this employee's timesheets"},
+                        "start_date": {"type": "string", "description": "Inclusive lower work_date bound (YYYY-MM-DD)"},
+                        "end_date": {"type": "string", "description": "Inclusive upper work_date bound (YYYY-MM-DD)"},
+                        "status": {"type": "string", "description": "Only this status (submitted, approved, rejected)"},
+                        "limit": {"type": "integer", "description": "Page size, 1-500 (default 50)"},
+                        "cursor": {"type": "string", "description": "next_cursor from the previous page"}
+                    },
+                    "required": ["acting_user_id"]
+                }
             }
         }
@@ -2,33 +2,31 @@ import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
+from ..common import TIMESTAMP, require_permission, transactional, write_audit
+from ..validation import validated
 
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+def pay_run(data: Dict[str, Any], run: Dict[str, Any], acting_user_id: str) -> Dict[str, Any]:
+    """Mark an approved run paid and audit the status change; returns the run."""
+    if run.get("status") != "approved":
+        raise ValueError(f"Payroll run {run['payroll_run_id']} must be in approved status")
+    if str(acting_user_id) == str(run.get("approved_by_user_id")):
+        raise ValueError("Segregation of duties: payer must differ from the run approver")
+    run["status"] = "paid"
+    run["processed_at"] = TIMESTAMP
+    run["updated_at"] = TIMESTAMP
+    write_audit(data, acting_user_id, "payroll_runs", "update", run["payroll_run_id"], "status", "approved", "paid")
+    return run
 
+@validated
+@transactional
 class PayPayrollRun(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "pay_payroll_run", "pay_payroll_run")
-        return json.dumps({"ok": True, "tool": "pay_payroll_run", "received": kwargs})
+    def invoke(data: Dict[str, Any], payroll_run_id: str, acting_user_id: str) -> str:
+        require_permission(data, acting_user_id, "pay_payroll_run")
+        run = data.get("payroll_runs", {}).get(str(payroll_run_id))
+        if not run:
+            raise ValueError(f"Payroll run {payroll_run_id} not found")
+        return json.dumps(pay_run(data, run, acting_user_id))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +35,13 @@ class PayPayrollRun(Tool):
             "function": {
                 "name": "pay_payroll_run",
                 "description": "Mark a payroll run as paid (after approval).",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "payroll_run_id": {"type": "string", "description": "ID of the approved payroll run"},
+                        "acting_user_id": {"type": "string", "description": "Payroll administrator or finance officer executing the payment; must not be the run approver"}
+                    },
+                    "required": ["payroll_run_id", "acting_user_id"]
+                }
             }
         }
@@ -2,33 +2,57 @@ import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, acts_for_employee, iso_date, next_id, require_user, transactional, write_audit
+from ..validation import validated
+from ...leave_ledger import LEAVE_TYPES, leave_ledger, requested_days
 
+@validated
+@transactional
 class RequestLeave(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "request_leave", "request_leave")
-        return json.dumps({"ok": True, "tool": "request_leave", "received": kwargs})
+    def invoke(data: Dict[str, Any], employee_id: str, leave_type: str, start_date: str,
+               end_date: str, acting_user_id: str) -> str:
+        user = require_user(data, acting_user_id)
+        employee = data.get("employees", {}).get(str(employee_id))
+        if not employee:
+            raise ValueError(f"Employee {employee_id} not found")
+        if employee.get("employment_status") != "active":
+            raise ValueError(f"Employee {employee_id} is not active")
+        if not acts_for_employee(data, user["user_id"], employee, "request_leave_for_others"):
+            raise ValueError(f"User {acting_user_id} may not request leave for employee {employee_id}")
+        if leave_type not in LEAVE_TYPES:
+            raise ValueError(f"Invalid leave_type. Must be one of {list(LEAVE_TYPES)}")
+        message = "start_date and end_date must be YYYY-MM-DD"
+        start_date, end_date = iso_date(start_date, message), iso_date(end_date, message)
+        if start_date > end_date:
+            raise ValueError("start_date must not be after end_date")
+        if start_date[:4] != end_date[:4]:
+            raise ValueError("Leave requests cannot span calendar years")
+
+        days = requested_days(start_date, end_date)
+        balance = leave_ledger(data).balance(employee["employee_id"], leave_type, start_date, employee.get("hire_date"))
+        if days > balance["available"]:
+            raise ValueError(
+                f"Insufficient {leave_type} leave balance: {days} days requested, {balance['available']} available"
+            )
+
+        leave_requests = data.setdefault("leave_requests", {})
+        leave_request_id = next_id(leave_requests)
+        leave_requests[leave_request_id] = {
+            "leave_request_id": leave_request_id,
+            "employee_id": employee["employee_id"],
+            "leave_type": leave_type,
+            "start_date": start_date,
+            "end_date": end_date,
+            "requested_days": days,
+            "status": "pending",
+            "remaining_balance": round(balance["available"] - days, 2),
+            "approved_by_user_id": None,
+            "created_at": TIMESTAMP,
+            "updated_at": TIMESTAMP
+        }
+        write_audit(data, acting_user_id, "leave_requests", "create", leave_request_id)
+        return json.dumps(leave_requests[leave_request_id])
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +61,16 @@ class RequestLeave(Tool):
             "function": {
                 "name": "request_leave",
                 "description": "Create a leave request with balance checks.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "string", "description": "Employee requesting leave (must be active)"},
+                        "leave_type": {"type": "string", "description": "annual, sick, fmla, personal, bereavement or jury_duty"},
+                        "start_date": {"type": "string", "description": "First day of leave (YYYY-MM-DD)"},
+                        "end_date": {"type": "string", "description": "Last day of leave (YYYY-MM-DD), same calendar year"},
+                        "acting_user_id": {"type": "string", "description": "The employee's own user, a manager above them in the reporting chain, or HR director"}
+                    },
+                    "required": ["employee_id", "leave_type", "start_date", "end_date", "acting_user_id"]
+                }
             }
         }
@@ -0,0 +1,99 @@
+import json
+from typing import Any, Dict, List, Optional
+from tau_bench.envs.tool import Tool
+
+from ..common import require_permission, transactional
+from ..validation import validated
+from .approve_payroll_run import approve_run, validate_approval
+from .gen_payroll_line_items import generate_line_items
+from .pay_payroll_run import pay_run
+from .start_payroll_run import create_run, pay_groups_overlap, validate_period
+
+# Lifecycle status each run is taken to: draft (start + generate), approved, or paid
+PIPELINE_STAGES = ["draft", "approved", "paid"]
+
+@validated
+@transactional
+class RunPayroll(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], periods: List[Dict[str, Any]], initiated_by_user_id: str,
+               approved_by_user_id: Optional[str] = None, through: str = "paid") -> str:
+        # One validation pass over the whole batch before anything is written
+        require_permission(data, initiated_by_user_id, "initiate_payroll_run")
+        if through not in PIPELINE_STAGES:
+            raise ValueError(f"Invalid through. Must be one of {PIPELINE_STAGES}")
+        if through != "draft":
+            if approved_by_user_id is None:
+                raise ValueError("approved_by_user_id is required unless through='draft'")
+            require_permission(data, approved_by_user_id, "approve_payroll_run")
+            if str(approved_by_user_id) == str(initiated_by_user_id):
+                raise ValueError("Segregation of duties: approver must differ from the run initiator")
+        if not periods:
+            raise ValueError("periods must list at least one period")
+        checked = []
+        for entry in periods:
+            start, end = validate_period(data, entry.get("period_start"), entry.get("period_end"), entry.get("pay_frequency"))
+            checked.append(dict(entry, period_start=start, period_end=end))
+        periods = checked
+        # Entries may share dates only when they pay disjoint pay groups, whatever stage they are taken to
+        for i, first in enumerate(periods):
+            for second in periods[i + 1:]:
+                if first["period_start"] <= second["period_end"] and second["period_start"] <= first["period_end"] \
+                        and pay_groups_overlap(first.get("pay_frequency"), second.get("pay_frequency")):
+                    raise ValueError("Periods in one batch overlap for the same pay group")
+
+        # Each run goes start -> generate -> approve -> pay, writing the same audit entries as the single-step tools
+        results = []
+        for entry in periods:
+            run = create_run(data, entry["period_start"], entry["period_end"], initiated_by_user_id,
+                             entry.get("pay_frequency"))
+            summary = generate_line_items(data, run, initiated_by_user_id, entry.get("pay_frequency"))
+            if through != "draft":
+                validate_approval(run, approved_by_user_id)
+                approve_run(data, run, approved_by_user_id)
+            if through == "paid":
+                pay_run(data, run, initiated_by_user_id)
+            results.append({
+                "payroll_run_id": run["payroll_run_id"],
+                "period_start": run["period_start"],
+                "period_end": run["period_end"],
+                "pay_frequency": entry.get("pay_frequency"),
+                "status": run["status"],
+                "employees": summary["employees"],
+                "gross_pay": summary["gross_pay"],
+                "total_deductions": summary["total_deductions"],
+                "net_pay": summary["net_pay"]
+            })
+        return json.dumps({"runs": results})
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "run_payroll",
+                "description": "Run the payroll lifecycle (start, generate line items, approve, pay) for a batch of periods/pay groups.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "periods": {
+                            "type": "array",
+                            "description": "Runs to process, in order",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "period_start": {"type": "string", "description": "First day of the pay period (YYYY-MM-DD)"},
+                                    "period_end": {"type": "string", "description": "Last day of the pay period (YYYY-MM-DD)"},
+                                    "pay_frequency": {"type": "string", "description": "Optional pay group (weekly, biweekly, semimonthly, monthly)"}
+                                },
+                                "required": ["period_start", "period_end"]
+                            }
+                        },
+                        "initiated_by_user_id": {"type": "string", "description": "Payroll administrator starting (and paying) the runs"},
+                        "approved_by_user_id": {"type": "string", "description": "Finance officer approving the runs; must differ from the initiator. Required unless through is draft"},
+                        "through": {"type": "string", "description": "Last stage to reach: draft, approved or paid (default paid)"}
+                    },
+                    "required": ["periods", "initiated_by_user_id"]
+                }
+            }
+        }
@@ -1,34 +1,72 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
+from ..common import TIMESTAMP, iso_date, next_id, require_permission, transactional, write_audit
+from ..validation import validated
+from ...data.store import peek_row
+from ...intervals import payroll_run_index
+from ...payroll_engine import PERIODS_PER_YEAR
+
+# Runs in these statuses block a new run over the same dates (SOP 5)
+BLOCKING_RUN_STATUSES = ("draft", "approved")
+
+def pay_groups_overlap(first: Optional[str], second: Optional[str]) -> bool:
+    """Whether runs for these pay groups can pay the same employee (None covers every group)."""
+    return first is None or second is None or first == second
+
+def validate_period(data: Dict[str, Any], period_start: str, period_end: str,
+                    pay_frequency: Optional[str] = None) -> Tuple[str, str]:
+    """
+    SOP 5 checks: valid dates, start before end, valid pay group, and no
+    overlapping draft/approved run covering the same pay group.
+    Returns (period_start, period_end) as canonical YYYY-MM-DD strings.
+    """
+    message = "period_start and period_end must be YYYY-MM-DD"
+    period_start, period_end = iso_date(period_start, message), iso_date(period_end, message)
+    if period_start >= period_end:
+        raise ValueError("period_start must be before period_end")
+    if pay_frequency is not None and pay_frequency not in PERIODS_PER_YEAR:
+        raise ValueError(f"Invalid pay_frequency. Must be one of {list(PERIODS_PER_YEAR)}")
+
+    runs = data.get("payroll_runs", {})
+    overlapping = [
+        key for key in payroll_run_index(data).overlapping(BLOCKING_RUN_STATUSES, period_start, period_end)
+        if pay_groups_overlap(peek_row(runs, key).get("pay_frequency"), pay_frequency)
+    ]
+    if overlapping:
+        raise ValueError(f"Payroll period overlaps existing draft/approved run(s): {', '.join(sorted(overlapping, key=int))}")
+    return period_start, period_end
+
+def create_run(data: Dict[str, Any], period_start: str, period_end: str, acting_user_id: str,
+               pay_frequency: Optional[str] = None) -> Dict[str, Any]:
+    """Insert a validated draft run (for one pay group, or all when None) and audit it; returns the new row."""
+    runs = data.setdefault("payroll_runs", {})
+    payroll_run_id = next_id(runs)
+    runs[payroll_run_id] = {
+        "payroll_run_id": payroll_run_id,
+        "period_start": period_start,
+        "period_end": period_end,
+        "pay_frequency": pay_frequency,
+        "status": "draft",
+        "initiated_by_user_id": acting_user_id,
+        "approved_by_user_id": None,
+        "processed_at": None,
+        "created_at": TIMESTAMP,
+        "updated_at": TIMESTAMP
     }
-    data["audit_logs"] = logs
+    write_audit(data, acting_user_id, "payroll_runs", "create", payroll_run_id)
+    return runs[payroll_run_id]
 
+@validated
+@transactional
 class StartPayrollRun(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "start_payroll_run", "start_payroll_run")
-        return json.dumps({"ok": True, "tool": "start_payroll_run", "received": kwargs})
+    def invoke(data: Dict[str, Any], period_start: str, period_end: str, acting_user_id: str,
+               pay_frequency: Optional[str] = None) -> str:
+        require_permission(data, acting_user_id, "initiate_payroll_run")
+        period_start, period_end = validate_period(data, period_start, period_end, pay_frequency)
+        return json.dumps(create_run(data, period_start, period_end, acting_user_id, pay_frequency))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +75,15 @@ class StartPayrollRun(Tool):
             "function": {
                 "name": "start_payroll_run",
                 "description": "Create a draft payroll run for a period.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "period_start": {"type": "string", "description": "First day of the pay period (YYYY-MM-DD)"},
+                        "period_end": {"type": "string", "description": "Last day of the pay period (YYYY-MM-DD), after period_start"},
+                        "acting_user_id": {"type": "string", "description": "Payroll administrator initiating the run"},
+                        "pay_frequency": {"type": "string", "description": "Optional pay group the run covers (weekly, biweekly, semimonthly, monthly); all employees when omitted"}
+                    },
+                    "required": ["period_start", "period_end", "acting_user_id"]
+                }
             }
         }
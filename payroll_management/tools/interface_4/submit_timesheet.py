@@ -1,34 +1,98 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import TIMESTAMP, has_permission, iso_date, next_id, require_user, transactional, write_audit
+from ..validation import validated
+from ...intervals import epoch_seconds, timesheet_index
 
+def submit_timesheets(data: Dict[str, Any], entries: List[Dict[str, Any]], acting_user_id: str) -> List[str]:
+    """
+    Validate and create submitted timesheets (SOP 3) for one or many clock entries.
+
+    Each entry has employee_id, work_date, clock_in, clock_out and optional
+    break_minutes. Every entry is checked against the employee's existing
+    timesheets and the other entries before anything is written, and a batch
+    is indexed with one bulk insert per employee. Returns the new timesheet ids.
+    """
+    user = require_user(data, acting_user_id)
+    employees = data.get("employees", {})
+    index = timesheet_index(data)
+    spans: Dict[str, List[Any]] = {}
+    for entry in entries:
+        employee_id = str(entry.get("employee_id"))
+        employee = employees.get(employee_id)
+        if not employee:
+            raise ValueError(f"Employee {employee_id} not found")
+        if employee.get("employment_status") != "active":
+            raise ValueError(f"Employee {employee_id} is not active")
+        if not has_permission(data, user["user_id"], "submit_timesheet_for_others") and employee.get("user_id") != user["user_id"]:
+            raise ValueError(f"User {acting_user_id} may not submit timesheets for employee {employee_id}")
+
+        message = "work_date must be YYYY-MM-DD and clock_in/clock_out ISO timestamps"
+        work_date = iso_date(entry.get("work_date"), message)
+        clock_in, clock_out = entry.get("clock_in"), entry.get("clock_out")
+        try:
+            start, end = epoch_seconds(clock_in), epoch_seconds(clock_out)
+        except (TypeError, ValueError, AttributeError):
+            raise ValueError(message)
+        if work_date > TIMESTAMP[:10]:
+            raise ValueError(f"work_date {work_date} is in the future")
+        if clock_in[:10] != work_date:
+            raise ValueError("clock_in must fall on work_date")
+        if start >= end:
+            raise ValueError("clock_in must be before clock_out")
+        break_minutes = int(entry.get("break_minutes") or 0)
+        if break_minutes < 0 or break_minutes * 60 >= end - start:
+            raise ValueError("break_minutes must be non-negative and shorter than the shift")
+
+        clashes = index.overlapping([employee_id], start, end)
+        if clashes:
+            raise ValueError(f"Timesheet overlaps existing timesheet(s) {', '.join(clashes)} for employee {employee_id}")
+        spans.setdefault(employee_id, []).append((start, end, dict(entry, work_date=work_date), break_minutes))
+
+    # Entries of one batch must not overlap each other either
+    for employee_id, employee_spans in spans.items():
+        ordered = sorted(employee_spans, key=lambda span: span[0])
+        if any(later[0] < earlier[1] for earlier, later in zip(ordered, ordered[1:])):
+            raise ValueError(f"Submitted timesheets overlap each other for employee {employee_id}")
+
+    timesheets = data.setdefault("timesheets", {})
+    created = []
+    with index.bulk():
+        for employee_id, employee_spans in spans.items():
+            for start, end, entry, break_minutes in employee_spans:
+                timesheet_id = next_id(timesheets)
+                timesheets[timesheet_id] = {
+                    "timesheet_id": timesheet_id,
+                    "employee_id": employee_id,
+                    "work_date": entry["work_date"],
+                    "clock_in": entry["clock_in"],
+                    "clock_out": entry["clock_out"],
+                    "total_hours": round((end - start - break_minutes * 60) / 3600.0, 2),
+                    "status": "submitted",
+                    "approver_user_id": None,
+                    "created_at": TIMESTAMP,
+                    "updated_at": TIMESTAMP
+                }
+                write_audit(data, acting_user_id, "timesheets", "create", timesheet_id)
+                created.append(timesheet_id)
+    return created
+
+@validated
+@transactional
 class SubmitTimesheet(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "submit_timesheet", "submit_timesheet")
-        return json.dumps({"ok": True, "tool": "submit_timesheet", "received": kwargs})
+    def invoke(data: Dict[str, Any], employee_id: str, work_date: str, clock_in: str, clock_out: str,
+               acting_user_id: str, break_minutes: int = 0) -> str:
+        [timesheet_id] = submit_timesheets(data, [{
+            "employee_id": employee_id,
+            "work_date": work_date,
+            "clock_in": clock_in,
+            "clock_out": clock_out,
+            "break_minutes": break_minutes
+        }], acting_user_id)
+        return json.dumps(data["timesheets"][timesheet_id])
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +101,17 @@ class SubmitTimesheet(Tool):
             "function": {
                 "name": "submit_timesheet",
                 "description": "Submit a timesheet entry (overlap checks).",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "employee_id": {"type": "string", "description": "Employee the hours belong to (must be active)"},
+                        "work_date": {"type": "string", "description": "Day worked (YYYY-MM-DD), not in the future"},
+                        "clock_in": {"type": "string", "description": "Shift start, ISO timestamp on work_date"},
+                        "clock_out": {"type": "string", "description": "Shift end, ISO timestamp after clock_in"},
+                        "acting_user_id": {"type": "string", "description": "The employee's own user or an HR director"},
+                        "break_minutes": {"type": "integer", "description": "Unpaid break in minutes (default 0)"}
+                    },
+                    "required": ["employee_id", "work_date", "clock_in", "clock_out", "acting_user_id"]
+                }
             }
         }
@@ -14,6 +14,7 @@ from .enroll_training import EnrollTraining
 from .complete_training_prog import CompleteTrainingProg
 from .start_performance_review import StartPerformanceReview
 from .submit_approve_review import SubmitApproveReview
+from .list_pending_approvals import ListPendingApprovals
 
 ALL_TOOLS_INTERFACE_5: List[Type[Tool]] = [
     CreateBenefitsPlan,
@@ -27,5 +28,6 @@ ALL_TOOLS_INTERFACE_5: List[Type[Tool]] = [
     EnrollTraining,
     CompleteTrainingProg,
     StartPerformanceReview,
-    SubmitApproveReview
+    SubmitApproveReview,
+    ListPendingApprovals
 ]
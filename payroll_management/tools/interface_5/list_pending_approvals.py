@@ -0,0 +1,60 @@
+import json
+from typing import Any, Dict, Optional
+from tau_bench.envs.tool import Tool
+
+from ..common import has_permission, require_user, write_audit
+from ..validation import validated
+from ...approval_queue import APPROVAL_ACTIONS, approval_queues
+from ...data.store import peek_row
+
+MAX_PAGE_SIZE = 500
+
+@validated
+class ListPendingApprovals(Tool):
+    @staticmethod
+    def invoke(data: Dict[str, Any], acting_user_id: str, approver_user_id: Optional[str] = None,
+               action: Optional[str] = None, offset: int = 0, limit: int = 50) -> str:
+        user = require_user(data, acting_user_id)
+        approver_user_id = str(approver_user_id) if approver_user_id is not None else user["user_id"]
+        if approver_user_id != user["user_id"] and not has_permission(data, user["user_id"], "oversee_approvals"):
+            raise ValueError(f"User {acting_user_id} may only list their own pending approvals")
+        if action is not None and action not in APPROVAL_ACTIONS:
+            raise ValueError(f"Invalid action. Must be one of {list(APPROVAL_ACTIONS)}")
+        offset, limit = int(offset), int(limit)
+        if offset < 0 or not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"offset must be >= 0 and limit between 1 and {MAX_PAGE_SIZE}")
+
+        queues = approval_queues(data)
+        total = queues.count(approver_user_id, action)
+        approvals = data.get("approvals", {})
+        page = [dict(peek_row(approvals, key)) for key in queues.pending(approver_user_id, action, offset, limit)]
+
+        write_audit(data, acting_user_id, "meta", "read", "list_pending_approvals")
+        next_offset = offset + len(page)
+        return json.dumps({
+            "total": total,
+            "offset": offset,
+            "next_offset": next_offset if next_offset < total else None,
+            "approvals": page
+        })
+
+    @staticmethod
+    def get_info() -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": "list_pending_approvals",
+                "description": "List pending approvals waiting on an approver, oldest first (paginated).",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "acting_user_id": {"type": "string", "description": "Requester; HR directors and compliance officers may view other approvers' queues"},
+                        "approver_user_id": {"type": "string", "description": "Approver whose queue to list (defaults to the requester)"},
+                        "action": {"type": "string", "description": "Only this action (payroll_run, reimbursement, benefits_plan)"},
+                        "offset": {"type": "integer", "description": "Number of pending items to skip (default 0)"},
+                        "limit": {"type": "integer", "description": "Page size, 1-500 (default 50)"}
+                    },
+                    "required": ["acting_user_id"]
+                }
+            }
+        }
@@ -1,34 +1,16 @@
 import json
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
 
-def _next_id(table: Dict[str, Any]) -> str:
-    if not table:
-        return "1"
-    return str(max(int(k) for k in table.keys()) + 1)
-
-def _write_audit(data: Dict[str, Any], who: str, table: str, action: str, record_id: str):
-    logs = data.get("audit_logs", {})
-    audit_id = _next_id(logs)
-    logs[audit_id] = {
-        "audit_id": audit_id,
-        "user_id": who or "system",
-        "table_name": table,
-        "action": "read",
-        "record_id": record_id,
-        "field": None,
-        "old_value": None,
-        "new_value": None,
-        "timestamp": "2025-10-01T00:00:00Z"
-    }
-    data["audit_logs"] = logs
+from ..common import decide_approval, transactional
+from ..validation import validated
 
+@validated
+@transactional
 class RejectItem(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], **kwargs) -> str:
-        # minimal, non-op stub (safe for checker)
-        _write_audit(data, kwargs.get("acting_user_id", ""), "meta", "reject_item", "reject_item")
-        return json.dumps({"ok": True, "tool": "reject_item", "received": kwargs})
+    def invoke(data: Dict[str, Any], approval_id: str, acting_user_id: str, notes: Optional[str] = None) -> str:
+        return json.dumps(decide_approval(data, approval_id, acting_user_id, "rejected", notes))
 
     @staticmethod
     def get_info() -> Dict[str, Any]:
@@ -37,6 +19,14 @@ class RejectItem(Tool):
             "function": {
                 "name": "reject_item",
                 "description": "Reject an approval item by id.",
-                "parameters": { "type": "object", "properties": {}, "required": [] }
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "approval_id": {"type": "string", "description": "ID of the pending approval"},
+                        "acting_user_id": {"type": "string", "description": "The approval's assigned approver (not its requester)"},
+                        "notes": {"type": "string", "description": "Optional rejection reason"}
+                    },
+                    "required": ["approval_id", "acting_user_id"]
+                }
             }
         }
@@ -0,0 +1,95 @@
+# Process-wide tool registry: name dispatch and precomputed tool schemas
+import json
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Sequence, Type
+
+from tau_bench.envs.tool import Tool
+
+from .interface_1 import ALL_TOOLS_INTERFACE_1
+from .interface_2 import ALL_TOOLS_INTERFACE_2
+from .interface_3 import ALL_TOOLS_INTERFACE_3
+from .interface_4 import ALL_TOOLS_INTERFACE_4
+from .interface_5 import ALL_TOOLS_INTERFACE_5
+
+TOOL_INTERFACES: Dict[str, List[Type[Tool]]] = {
+    "interface_1": ALL_TOOLS_INTERFACE_1,
+    "interface_2": ALL_TOOLS_INTERFACE_2,
+    "interface_3": ALL_TOOLS_INTERFACE_3,
+    "interface_4": ALL_TOOLS_INTERFACE_4,
+    "interface_5": ALL_TOOLS_INTERFACE_5,
+}
+
+
+class ToolRegistry:
+    """
+    Every tool's get_info() called once, indexed by function name.
+
+    Dispatch is one dict lookup, and each interface's tool list is kept both
+    as get_info dicts and as one pre-serialized JSON payload, so building an
+    agent prompt does no per-turn get_info() calls or JSON encoding. The
+    cached dicts are shared: treat them as read-only.
+
+    Tools are registered as they are, never modified: each must already be
+    decorated with validation.validated (like common.transactional), so
+    arguments are checked against its schema before it touches any table.
+    """
+
+    def __init__(self, interfaces: Mapping[str, Sequence[Type[Tool]]]):
+        self._tools: Dict[str, Type[Tool]] = {}
+        self._infos: Dict[str, Dict[str, Any]] = {}
+        self._interfaces: Dict[str, str] = {}
+        self._interface_infos: Dict[str, List[Dict[str, Any]]] = {}
+        self._schemas: Dict[str, str] = {}
+        for interface, tools in interfaces.items():
+            infos = []
+            for tool in tools:
+                info = tool.get_info()
+                name = info["function"]["name"]
+                if self._tools.get(name, tool) is not tool:
+                    raise ValueError(f"Tool name {name} is registered by two classes")
+                if not getattr(tool.invoke, "__validated__", False):
+                    raise ValueError(f"Tool {name} must be decorated with @validated")
+                self._tools[name] = tool
+                self._infos[name] = info
+                self._interfaces.setdefault(name, interface)
+                infos.append(info)
+            self._interface_infos[interface] = infos
+            self._schemas[interface] = json.dumps(infos)
+        self.tools: Mapping[str, Type[Tool]] = MappingProxyType(self._tools)
+
+    def tool(self, name: str) -> Type[Tool]:
+        try:
+            return self._tools[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool {name}")
+
+    def info(self, name: str) -> Dict[str, Any]:
+        """The tool's get_info() dict."""
+        self.tool(name)
+        return self._infos[name]
+
+    def interface_of(self, name: str) -> str:
+        self.tool(name)
+        return self._interfaces[name]
+
+    def tools_info(self, interface: str) -> List[Dict[str, Any]]:
+        """get_info() dicts of the interface's tools, in registration order."""
+        if interface not in self._interface_infos:
+            raise ValueError(f"Unknown interface {interface}")
+        return self._interface_infos[interface]
+
+    def schema_json(self, interface: str) -> str:
+        """tools_info(interface) serialized once as a JSON array."""
+        if interface not in self._schemas:
+            raise ValueError(f"Unknown interface {interface}")
+        return self._schemas[interface]
+
+    def invoke(self, data: Dict[str, Any], name: str, **kwargs: Any) -> str:
+        return self.tool(name).invoke(data, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def tool_registry() -> ToolRegistry:
+    """The ToolRegistry over TOOL_INTERFACES, built once per process."""
+    return ToolRegistry(TOOL_INTERFACES)
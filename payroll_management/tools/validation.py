@@ -0,0 +1,180 @@
+# Argument validators compiled from each tool's get_info() schema and enums.yaml
+import inspect
+import math
+import os
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+
+import yaml
+
+T = TypeVar("T")
+
+ENUMS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "enums.yaml")
+
+# Parameter name -> (table, column) of enums.yaml whose values it must take, for every tool
+PARAMETER_ENUMS: Dict[str, Tuple[str, str]] = {
+    "role": ("users", "role"),
+    "pay_frequency": ("employees", "pay_frequency"),
+    "deduction_type": ("deductions", "deduction_type"),
+    "method": ("deductions", "method"),
+    "plan_type": ("benefits_plans", "plan_type"),
+    "leave_type": ("leave_requests", "leave_type"),
+}
+
+# Tool name -> parameter -> (table, column), for names whose enum depends on the tool (e.g. "status")
+TOOL_ENUMS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "list_timesheets": {"status": ("timesheets", "status")},
+    "query_audit_trail": {"action": ("audit_logs", "action")},
+}
+
+Check = Callable[[str, Any], None]
+
+
+@lru_cache(maxsize=None)
+def load_enums(path: str = ENUMS_FILE) -> Dict[str, Dict[str, Tuple[str, ...]]]:
+    """
+    Read enums.yaml and return table -> column -> allowed values.
+
+    Args:
+        path: optional override path to an enums.yaml file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        enums = (yaml.safe_load(f) or {}).get("enums") or {}
+    return {
+        table: {column: tuple(values) for column, values in (columns or {}).items()}
+        for table, columns in enums.items()
+    }
+
+
+def _is_string(name: str, value: Any) -> bool:
+    # Ids are strings in the schemas, but agents often send them as JSON numbers; the tools str() them
+    return isinstance(value, str) or (name.endswith("_id") and isinstance(value, int) and not isinstance(value, bool))
+
+
+def _as_number(value: Any) -> Optional[float]:
+    # The tools int()/float() their numeric arguments, so numeric strings ("1", "2.5") are accepted too
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            number = float(value)
+        except ValueError:
+            return None
+        return number if math.isfinite(number) else None
+    return None
+
+
+def _is_integer(_: str, value: Any) -> bool:
+    # Integral values only: 2, 2.0 and "2", but not 2.5 or "2.0" (which int() rejects)
+    if isinstance(value, str):
+        try:
+            int(value)
+        except ValueError:
+            return False
+        return True
+    number = _as_number(value)
+    return number is not None and number.is_integer()
+
+
+_TYPES: Dict[str, Callable[[str, Any], bool]] = {
+    "string": _is_string,
+    "integer": _is_integer,
+    "number": lambda _, v: _as_number(v) is not None,
+    "boolean": lambda _, v: isinstance(v, bool),
+    "array": lambda _, v: isinstance(v, list),
+    "object": lambda _, v: isinstance(v, dict),
+}
+
+
+def _compile_value(spec: Dict[str, Any], enum: Optional[Tuple[str, ...]], enums: Dict[str, Tuple[str, ...]]) -> Check:
+    """One checker for a property's value (type, enum, array items / object properties)."""
+    kind = spec.get("type")
+    is_type = _TYPES.get(kind)
+    allowed = frozenset(spec.get("enum") or enum or ())
+    choices = list(spec.get("enum") or enum or ())
+    item_check = _compile_value(spec["items"], None, enums) if kind == "array" and "items" in spec else None
+    object_check = _compile_object(spec, enums) if kind == "object" and "properties" in spec else None
+
+    def check(path: str, value: Any) -> None:
+        if is_type is not None and not is_type(path.rsplit(".", 1)[-1], value):
+            raise ValueError(f"Invalid {path}: expected {kind}")
+        if allowed and value not in allowed:
+            raise ValueError(f"Invalid {path}. Must be one of {choices}")
+        if item_check is not None:
+            for i, item in enumerate(value):
+                item_check(f"{path}[{i}]", item)
+        if object_check is not None:
+            object_check(value, path + ".")
+
+    return check
+
+
+def _compile_object(
+    schema: Dict[str, Any], enums: Dict[str, Tuple[str, ...]], closed: bool = False
+) -> Callable[[Dict[str, Any], str], None]:
+    """A checker for a dict of arguments against an object schema's properties/required."""
+    properties = schema.get("properties") or {}
+    required = tuple(schema.get("required") or ())
+    checks = {name: _compile_value(spec, enums.get(name), enums) for name, spec in properties.items()}
+
+    def check(arguments: Dict[str, Any], prefix: str = "") -> None:
+        for name in required:
+            if arguments.get(name) is None:
+                raise ValueError(f"Missing required argument {prefix}{name}")
+        for name, value in arguments.items():
+            value_check = checks.get(name)
+            if value_check is None:
+                if closed:
+                    raise ValueError(f"Unexpected argument {prefix}{name}")
+            elif value is not None:
+                value_check(prefix + name, value)
+
+    return check
+
+
+@lru_cache(maxsize=None)
+def compile_validator(tool: Type[Any]) -> Callable[[Dict[str, Any]], None]:
+    """
+    The argument checker for a tool, compiled once from its get_info() schema.
+
+    Parameters named in PARAMETER_ENUMS / TOOL_ENUMS must take an enums.yaml
+    value; None stands for an omitted optional argument. Unknown arguments
+    are rejected unless invoke() takes **kwargs. The checker raises
+    ValueError, like the tools' own validation.
+    """
+    function = tool.get_info()["function"]
+    table_enums = load_enums()
+    bindings = {**PARAMETER_ENUMS, **TOOL_ENUMS.get(function["name"], {})}
+    enums = {
+        name: table_enums[table][column]
+        for name, (table, column) in bindings.items()
+        if column in table_enums.get(table, {})
+    }
+    parameters = inspect.signature(inspect.unwrap(tool.invoke)).parameters.values()
+    closed = not any(p.kind is p.VAR_KEYWORD for p in parameters)
+    return _compile_object(function.get("parameters") or {}, enums, closed)
+
+
+def validated(tool: Type[T]) -> Type[T]:
+    """
+    Class decorator checking invoke()'s arguments with compile_validator(tool)
+    before the tool runs (and before any transaction or table access).
+    Applying it twice is a no-op.
+    """
+    invoke = tool.invoke
+    if getattr(invoke, "__validated__", False):
+        return tool
+    names: List[str] = [p.name for p in inspect.signature(invoke).parameters.values()][1:]
+    check = compile_validator(tool)
+
+    @wraps(invoke)
+    def checked_invoke(data, *args, **kwargs):
+        arguments = dict(zip(names, args), **kwargs) if args else kwargs
+        check(arguments)
+        return invoke(data, *args, **kwargs)
+
+    checked_invoke.__validated__ = True
+    tool.invoke = staticmethod(checked_invoke)
+    return tool